@@ -9,13 +9,22 @@ from fortest.metrics.metrics import brier_score, accuracy
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class EnvironmentManager:
-    def __init__(self, loader_strategy: str = "load_all", eval_strategy: str = "recent", **loader_kwargs):
+    def __init__(
+        self,
+        loader_strategy: str = "load_all",
+        eval_strategy: str = "recent",
+        compact: bool = False,
+        **loader_kwargs
+    ):
         self.loader = ProblemLoader()
         self.search_core = SearchCore()
         self.eval_strategy = eval_strategy # "recent" or "best"
         
-        # Load problems
-        self.problems = self.loader.load(loader_strategy, **loader_kwargs)
+        # Load problems; compact=True stores them column-wise in a read-only ProblemTable
+        if compact:
+            self.problems = self.loader.load_table(loader_strategy, **loader_kwargs)
+        else:
+            self.problems = self.loader.load(loader_strategy, **loader_kwargs)
         
         # submissions[problem_id] = [ {prediction, timestamp} ]
         self.submissions: Dict[str, List[Dict]] = {pid: [] for pid in self.problems}
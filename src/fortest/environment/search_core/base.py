@@ -1,25 +1,22 @@
 import os
 import importlib
-import pkgutil
-from typing import Dict, List, Callable, Any
+from typing import Dict, List, Callable, Any, Optional
+
+from fortest.registry import scan_registrations
 
 class SearchCore:
     _registry: Dict[str, Callable] = {}
+    # function name -> module defining it, built once per process
+    _manifest: Optional[Dict[str, str]] = None
 
     def __init__(self):
         self._load_registry()
 
     def _load_registry(self):
-        """Automatically register search functions from the search_core directory."""
-        import fortest.environment.search_core as search_core_pkg
-        path = search_core_pkg.__path__
-        for loader, name, ispkg in pkgutil.iter_modules(path):
-            if name == "base": continue
-            module = importlib.import_module(f"fortest.environment.search_core.{name}")
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if callable(attr) and hasattr(attr, "_is_search_func"):
-                    self._registry[attr._search_name] = attr
+        """Record search functions in the search_core directory without importing them (once per process)."""
+        if SearchCore._manifest is None:
+            import fortest.environment.search_core as search_core_pkg
+            SearchCore._manifest = scan_registrations(search_core_pkg, "SearchCore", skip=("base",))
 
     @classmethod
     def register(cls, name: str):
@@ -27,15 +24,24 @@ class SearchCore:
         def decorator(func):
             func._is_search_func = True
             func._search_name = name
+            cls._registry[name] = func
             return func
         return decorator
 
+    def _resolve(self, function_name: str) -> Callable:
+        """Return the search function, importing its module on first use."""
+        if function_name not in self._registry and function_name in self._manifest:
+            importlib.import_module(self._manifest[function_name])
+        if function_name not in self._registry:
+            raise ValueError(f"Search function '{function_name}' not found. Available: {self.list_available_functions()}")
+        return self._registry[function_name]
+
     def list_available_functions(self) -> List[str]:
         """Returns a list of available search functions."""
-        return list(self._registry.keys())
+        names = list(self._manifest)
+        names.extend(n for n in self._registry if n not in self._manifest)
+        return names
 
     async def execute(self, function_name: str, query: str, testing_time: str, **kwargs) -> Any:
         """Executes a search function with optional parameters like k."""
-        if function_name not in self._registry:
-            raise ValueError(f"Search function '{function_name}' not found. Available: {self.list_available_functions()}")
-        return await self._registry[function_name](query, testing_time, **kwargs)
+        return await self._resolve(function_name)(query, testing_time, **kwargs)
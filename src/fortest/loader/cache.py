@@ -0,0 +1,70 @@
+"""
+Process-wide memoization of values derived from files on disk.
+
+Entries are keyed by a name plus the fingerprint (path, mtime, size) of every
+file they were built from, so an edited or replaced file is picked up on the
+next lookup without any explicit invalidation.
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+
+def file_fingerprint(path) -> Tuple[str, int, int]:
+    """Return (path, mtime_ns, size) for a file, or (path, -1, -1) if it is missing."""
+    path = os.fspath(path)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return (path, -1, -1)
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+def dataset_fingerprint(paths: Iterable) -> Fingerprint:
+    """Fingerprint of a group of files, in the order given."""
+    return tuple(file_fingerprint(p) for p in paths)
+
+
+class FileCache:
+    """Thread-safe memo of built values, invalidated when source files change."""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Fingerprint, Any]] = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: str, paths: Iterable, build: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for `key`, rebuilding it if any of `paths` changed.
+
+        Args:
+            key: Cache entry name
+            paths: Files the value is derived from
+            build: Zero-argument callable producing the value
+
+        Returns:
+            The cached or freshly built value
+        """
+        fingerprint = dataset_fingerprint(paths)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                return entry[1]
+            value = build()
+            self._entries[key] = (fingerprint, value)
+            return value
+
+    def fingerprint(self, key: str) -> Optional[Fingerprint]:
+        """Fingerprint the current entry for `key` was built from, if any."""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def invalidate(self, key: str = None):
+        """Drop one entry, or every entry when `key` is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
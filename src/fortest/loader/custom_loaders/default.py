@@ -1,20 +1,36 @@
-from fortest.loader.loader import ProblemLoader, base_process_problem
+from fortest.loader.loader import ProblemLoader, process_problems, to_problem_dict
+from fortest.loader.sharding import shard_filter
 from datetime import datetime
 import random
 
-@ProblemLoader.register("load_all")
+@ProblemLoader.register("load_all", streaming=True, shardable=True)
+def iter_all(problems, time_testing=None, time_now=None, shard_index=0, num_shards=1):
+    """Streams all problems from the database."""
+    return process_problems(shard_filter(problems, shard_index, num_shards), time_testing, time_now)
+
+@ProblemLoader.register("load_random", streaming=True, shardable=True)
+def iter_random(problems, count=1, time_testing=None, time_now=None, seed=None, shard_index=0, num_shards=1):
+    """Streams a random subset of problems. Sharded workers must share a `seed`."""
+    if num_shards > 1 and seed is None:
+        raise ValueError("load_random needs a seed shared by all shards when num_shards > 1")
+    rng = random if seed is None else random.Random(seed)
+    selected = rng.sample(problems, min(len(problems), count))
+    return process_problems(shard_filter(selected, shard_index, num_shards), time_testing, time_now)
+
+@ProblemLoader.register("load_by_source", streaming=True, shardable=True)
+def iter_by_source(problems, source, time_testing=None, time_now=None, shard_index=0, num_shards=1):
+    """Streams problems from a specific source."""
+    matching = (p for p in problems if p.get("metadata", {}).get("source") == source)
+    return process_problems(shard_filter(matching, shard_index, num_shards), time_testing, time_now)
+
 def load_all(problems, time_testing=None, time_now=None):
     """Loads all problems from the database."""
-    return {p["problem_id"]: base_process_problem(p, time_testing, time_now) for p in problems}
+    return to_problem_dict(iter_all(problems, time_testing, time_now))
 
-@ProblemLoader.register("load_random")
-def load_random(problems, count=1, time_testing=None, time_now=None):
+def load_random(problems, count=1, time_testing=None, time_now=None, seed=None):
     """Loads a random subset of problems."""
-    selected = random.sample(problems, min(len(problems), count))
-    return {p["problem_id"]: base_process_problem(p, time_testing, time_now) for p in selected}
+    return to_problem_dict(iter_random(problems, count, time_testing, time_now, seed))
 
-@ProblemLoader.register("load_by_source")
 def load_by_source(problems, source, time_testing=None, time_now=None):
     """Loads problems from a specific source."""
-    filtered = [p for p in problems if p.get("metadata", {}).get("source") == source]
-    return {p["problem_id"]: base_process_problem(p, time_testing, time_now) for p in filtered}
+    return to_problem_dict(iter_by_source(problems, source, time_testing, time_now))
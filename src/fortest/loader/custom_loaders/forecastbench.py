@@ -1,129 +1,578 @@
-
 import os
 import json
 import logging
-from typing import Dict, Any, List
-from fortest.loader.loader import ProblemLoader, base_process_problem
-from fortest.scripts.setup_datasets import ensure_forecastbench_data, TARGET_DIR
+from datetime import datetime
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Iterator, Optional, Set, Tuple
+
+import numpy as np
+
+from fortest.loader.loader import ProblemLoader, base_process_problem, to_problem_dict
+from fortest.loader.sharding import shard_filter
+from fortest.loader.snapshot import Snapshot, write_snapshot
+from fortest.scripts.setup_datasets import ensure_forecastbench_data, get_target_dir
 
 logger = logging.getLogger(__name__)
 
-@ProblemLoader.register("forecastbench")
-def load_forecastbench_dataset(raw_problems: List[Dict], dataset_name: str = None, limit: int = None, **kwargs) -> Dict[str, Any]:
+_WHITESPACE = " \t\n\r"
+
+# Consolidated snapshot of all question sets, inside the data directory
+SNAPSHOT_DIRNAME = "forecastbench.snapshot"
+
+# Problem fields stored as snapshot text columns: (column, top-level field or metadata key)
+_SNAPSHOT_FIELDS = (
+    ("original_id", "metadata"), ("question", None), ("time_start", None), ("time_end", None),
+    ("time_testing", None), ("choices", "metadata"), ("background", "metadata"),
+    ("resolution_criteria", "metadata"), ("url", "metadata"), ("resolution_status", None),
+)
+
+
+class _JsonStream:
+    """Minimal incremental JSON reader that decodes one value at a time from a file."""
+
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        chunk = self._f.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(f"Expected '{char}', found '{found}'", self._buf, self._pos)
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A value ending exactly at the buffer edge (e.g. a number) may be truncated
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+
+def _iter_json_array(path: str, key: str) -> Iterator[Any]:
     """
-    Loads problems from the ForecastBench dataset.
-    
+    Stream the elements of `key`'s array in a JSON object file (or of a top-level array).
+
+    Only the bytes up to the last element consumed are read, so stopping
+    early skips the rest of the file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _JsonStream(f)
+        if stream.peek() == "{":
+            stream.expect("{")
+            while True:
+                if stream.peek() == "}":
+                    return
+                name = stream.value()
+                stream.expect(":")
+                if name == key:
+                    break
+                stream.value()
+                if stream.peek() == ",":
+                    stream.expect(",")
+        stream.expect("[")
+        if stream.peek() == "]":
+            return
+        while True:
+            yield stream.value()
+            if stream.peek() == ",":
+                stream.expect(",")
+            else:
+                stream.expect("]")
+                return
+
+
+def _date_part(ds: str) -> str:
+    """Date prefix of a question set name, e.g. '2024-07-21' for '2024-07-21-llm'."""
+    return ds.split("-llm")[0].split("-human")[0]
+
+
+def _load_resolutions(r_path: str, wanted: Optional[Set[str]] = None) -> Dict[str, Dict]:
+    """
+    Map resolution ids to resolution records for one resolution set.
+
+    When `wanted` is given, reading stops as soon as all of those ids are found.
+    """
+    resolutions = {}
+    if not os.path.exists(r_path):
+        return resolutions
+    remaining = set(wanted) if wanted is not None else None
+    try:
+        for r in _iter_json_array(r_path, "resolutions"):
+            # Only map string IDs to avoid hashing issues with list IDs (combinations)
+            rid = r.get("id")
+            if not isinstance(rid, str):
+                continue
+            if remaining is None:
+                resolutions[rid] = r
+            elif rid in remaining:
+                resolutions[rid] = r
+                remaining.discard(rid)
+                if not remaining:
+                    break
+    except json.JSONDecodeError:
+        logger.warning(f"Failed to decode resolution JSON from {r_path}")
+    return resolutions
+
+
+def _problem_id(ds: str, q: Dict) -> str:
+    return f"fb_{ds}_{q.get('id')}"
+
+
+def _build_problem(ds: str, q: Dict, res_data: Dict, time_now: Optional[str] = None) -> Dict[str, Any]:
+    """Map a question set entry and its resolution to a processed problem, stamped with `time_now`."""
+    pid = str(q.get("id"))
+    problem = {
+        "problem_id": _problem_id(ds, q),
+        "question": q.get("question") or q.get("title"),
+        "time_start": q.get("market_info_open_datetime") or q.get("start_date") or q.get("publish_date"),
+        "time_end": q.get("market_info_close_datetime") or q.get("end_date") or q.get("close_date"),
+        "metadata": {
+            "source": "ForecastBench",
+            "dataset": ds,
+            "original_id": pid,
+            "choices": q.get("choices"),
+            "background": q.get("background"),
+            "resolution_criteria": q.get("resolution_criteria"),
+            "url": q.get("url")
+        }
+    }
+
+    # Handle resolution
+    if res_data and res_data.get("resolved"):
+        problem["resolved_flag"] = True
+        # 'resolved_to' seems to be the field for outcome (0.0 or 1.0 or value)
+        problem["resolution_status"] = res_data.get("resolved_to")
+    else:
+        problem["resolved_flag"] = False
+        problem["resolution_status"] = None
+
+    # Add time_testing from freeze_datetime if available
+    time_testing = q.get("freeze_datetime")
+
+    return base_process_problem(problem, time_testing=time_testing, time_now=time_now, copy=False)
+
+
+def _iter_questions(question_dir: str, ds: str) -> Iterator[Dict]:
+    """Stream the questions of one question set, logging (not raising) on bad files."""
+    q_path = os.path.join(question_dir, f"{ds}.json")
+    if not os.path.exists(q_path):
+        logger.warning(f"Dataset {ds} question file not found at {q_path}")
+        return
+    try:
+        yield from _iter_json_array(q_path, "questions")
+    except json.JSONDecodeError:
+        logger.error(f"Failed to decode JSON from {q_path}")
+
+
+def _resolution_path(resolution_dir: str, date: str) -> str:
+    # Question sets '{date}-llm' and '{date}-human' share '{date}_resolution_set.json'
+    return os.path.join(resolution_dir, f"{date}_resolution_set.json")
+
+
+def _shard_questions(ds: str, questions, shard_index: int, num_shards: int):
+    """Questions of `ds` in the given shard, selected before any problem is built."""
+    return shard_filter(questions, shard_index, num_shards, key=lambda q: _problem_id(ds, q))
+
+
+def _load_date_group(
+    question_dir: str,
+    resolution_dir: str,
+    date: str,
+    datasets: List[str],
+    shard_index: int = 0,
+    num_shards: int = 1,
+    time_now: Optional[str] = None,
+) -> List[Dict]:
+    """Load every question set for one date, parsing the shared resolution set once."""
+    resolutions = _load_resolutions(_resolution_path(resolution_dir, date))
+    problems = []
+    for ds in datasets:
+        for q in _shard_questions(ds, _iter_questions(question_dir, ds), shard_index, num_shards):
+            problems.append(_build_problem(ds, q, resolutions.get(str(q.get("id")), {}), time_now))
+    return problems
+
+
+def _iter_limited(
+    question_dir: str,
+    resolution_dir: str,
+    datasets: List[str],
+    limit: int,
+    shard_index: int = 0,
+    num_shards: int = 1,
+    time_now: Optional[str] = None,
+) -> Iterator[Dict]:
+    """
+    Stream up to `limit` problems, reading only as much of each file as needed.
+
+    The limit applies to the whole set, so shards split the same `limit` questions.
+    """
+    remaining = limit
+    for ds in datasets:
+        if remaining <= 0:
+            return
+        questions = list(islice(_iter_questions(question_dir, ds), remaining))
+        if not questions:
+            continue
+        remaining -= len(questions)
+        questions = list(_shard_questions(ds, questions, shard_index, num_shards))
+        if not questions:
+            continue
+        wanted = {str(q.get("id")) for q in questions}
+        resolutions = _load_resolutions(_resolution_path(resolution_dir, _date_part(ds)), wanted)
+        for q in questions:
+            yield _build_problem(ds, q, resolutions.get(str(q.get("id")), {}), time_now)
+
+
+@ProblemLoader.register("forecastbench", uses_raw_problems=False, streaming=True, shardable=True)
+def iter_forecastbench_dataset(
+    raw_problems: List[Dict],
+    dataset_name: str = None,
+    limit: int = None,
+    workers: int = None,
+    shard_index: int = 0,
+    num_shards: int = 1,
+    **kwargs
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streams problems from the ForecastBench dataset.
+
     Args:
         raw_problems: Ignored, as we load from files.
-        dataset_name: Name of the dataset to load (e.g., '2019', '2020', etc.). 
+        dataset_name: Name of the dataset to load (e.g., '2019', '2020', etc.).
                       If None, tries to load all available datasets.
-        limit: Max number of problems to return.
+        limit: Max number of problems to return. Files are read incrementally
+               and only up to the last question needed.
+        workers: Processes used to parse question sets when no limit is set
+                 (default: None, parse serially; pass a count > 1 for a pool).
+        shard_index: This worker's shard, 0-based
+        num_shards: Number of shards; other shards' questions are skipped
+                    before their problems are built.
+
+    Loads are served from the consolidated snapshot built by
+    `build_forecastbench_snapshot` (see `setup_datasets`) while it matches
+    the JSON files, and from the JSON files otherwise. Loads never build
+    the snapshot themselves, so a read-only data directory works.
+
+    JSON parsing is serial by default, so a full load from the JSON files
+    only scales with cores when `workers` is passed (e.g. `os.cpu_count()`).
     """
-    ensure_forecastbench_data()
-    
-    base_data_path = os.path.join(TARGET_DIR, "datasets")
+    ensure_forecastbench_data(preprocess=False)
+
+    target_dir = get_target_dir()
+    base_data_path = os.path.join(target_dir, "datasets")
+
+    # One time_now for the whole load, including problems built in worker processes
+    time_now = datetime.now().isoformat()
+
+    snapshot = _open_snapshot(target_dir)
+    if snapshot is not None:
+        datasets = [dataset_name] if dataset_name else snapshot.meta["datasets"]
+        if all(ds in snapshot.meta["dataset_rows"] for ds in datasets):
+            return _iter_snapshot(snapshot, datasets, limit, shard_index, num_shards, time_now)
+
+    return _iter_raw(base_data_path, dataset_name, limit, workers, shard_index, num_shards, time_now)
+
+
+def _list_datasets(question_dir: str) -> List[str]:
+    """Question set names present in the question dir, sorted."""
+    files = sorted(os.listdir(question_dir))
+    return [f.replace(".json", "") for f in files if f.endswith(".json")]
+
+
+def _iter_raw(
+    base_data_path: str,
+    dataset_name: Optional[str],
+    limit: Optional[int],
+    workers: Optional[int],
+    shard_index: int = 0,
+    num_shards: int = 1,
+    time_now: Optional[str] = None,
+) -> Iterator[Dict]:
+    """Stream problems by parsing the question and resolution set JSON files."""
     question_dir = os.path.join(base_data_path, "question_sets")
     resolution_dir = os.path.join(base_data_path, "resolution_sets")
-    
+
     # Identify datasets to load
     if dataset_name:
         datasets = [dataset_name]
     else:
         # Infer datasets from existing files in question dir
-        files = os.listdir(question_dir)
-        datasets = [f.replace(".json", "") for f in files if f.endswith(".json")]
-    
-    all_problems = {}
-    
+        datasets = _list_datasets(question_dir)
 
+    if limit:
+        return _iter_limited(question_dir, resolution_dir, datasets, limit, shard_index, num_shards, time_now)
+
+    # One task per date so each resolution set is parsed once for its -llm/-human variants
+    by_date: Dict[str, List[str]] = {}
     for ds in datasets:
-        q_path = os.path.join(question_dir, f"{ds}.json")
-        # The resolution file naming seems to be slightly different, often has "_resolution_set" suffix or similar
-        # Based on file listing, it is "{ds}_resolution_set.json" if ds is like "2024-07-21"
-        # Since ds came from "2024-07-21-human.json", the resolution file might be "2024-07-21_resolution_set.json"?
-        # Actually in the file list I saw "2024-07-21_resolution_set.json".
-        # The question file list has "2024-07-21-human.json", "2024-07-21-llm.json".
-        # The resolution file has "question_set": "2024-07-21-llm.json" inside.
-        # This implies a many-to-one or specific mapping. 
-        # For simplicity, we will try to find a resolution file that matches the pattern or just load all into a big dict if feasible, 
-        # but let's stick to trying to find the specific one.
-        # Given the complexity, let's try a heuristic: check if there's a file with the date prefix in resolution_sets.
-        
-        # Extract date part if possible.
-        date_part = ds.split("-llm")[0].split("-human")[0]
-        r_path_candidate = os.path.join(resolution_dir, f"{date_part}_resolution_set.json")
-        
-        if not os.path.exists(q_path):
-            logger.warning(f"Dataset {ds} question file not found at {q_path}")
-            continue
-            
-        try:
-            with open(q_path, "r") as f:
-                q_data = json.load(f)
-                questions = q_data.get("questions", [])
-        except json.JSONDecodeError:
-            logger.error(f"Failed to decode JSON from {q_path}")
+        by_date.setdefault(_date_part(ds), []).append(ds)
+    dates = list(by_date)
+
+    workers = workers or 1
+    if workers <= 1 or len(dates) <= 1:
+        groups = (
+            _load_date_group(question_dir, resolution_dir, d, by_date[d], shard_index, num_shards, time_now)
+            for d in dates
+        )
+        return (p for group in groups for p in group)
+    return _iter_pooled(
+        question_dir, resolution_dir, by_date, min(workers, len(dates)), shard_index, num_shards, time_now)
+
+
+def _iter_pooled(
+    question_dir: str,
+    resolution_dir: str,
+    by_date: Dict[str, List[str]],
+    workers: int,
+    shard_index: int = 0,
+    num_shards: int = 1,
+    time_now: Optional[str] = None,
+) -> Iterator[Dict]:
+    """Parse date groups in a process pool, yielding problems in date order."""
+    dates = list(by_date)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        groups = pool.map(
+            _load_date_group,
+            [question_dir] * len(dates),
+            [resolution_dir] * len(dates),
+            dates,
+            [by_date[d] for d in dates],
+            [shard_index] * len(dates),
+            [num_shards] * len(dates),
+            [time_now] * len(dates),
+        )
+        for group in groups:
+            yield from group
+
+
+def _tree_fingerprint(target_dir: str) -> List[List]:
+    """[relative path, mtime_ns, size] of every question/resolution set file (stat only)."""
+    base = os.path.join(target_dir, "datasets")
+    entries = []
+    for sub in ("question_sets", "resolution_sets"):
+        path = os.path.join(base, sub)
+        if not os.path.isdir(path):
             continue
-            
-        resolutions = {}
-        if os.path.exists(r_path_candidate):
-            try:
-                with open(r_path_candidate, "r") as f:
-                    r_data = json.load(f)
-                    # Support both list directly or dict with "resolutions" key
-                    r_list = r_data.get("resolutions", []) if isinstance(r_data, dict) else r_data
-                    
-                    # Create dict for O(1) lookup
-                    # Only map string IDs to avoid hashing issues with list IDs (combinations)
-                    for r in r_list:
-                        if isinstance(r.get("id"), str):
-                            resolutions[r["id"]] = r
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to decode resolution JSON from {r_path_candidate}")
-        
-        for q in questions:
-            pid = str(q.get("id"))
-            
-            res_data = resolutions.get(pid, {})
-            
-            # Map fields
-            problem = {
-                "problem_id": f"fb_{ds}_{pid}",
-                "question": q.get("question") or q.get("title"),
-                "time_start": q.get("market_info_open_datetime") or q.get("start_date") or q.get("publish_date"),
-                "time_end": q.get("market_info_close_datetime") or q.get("end_date") or q.get("close_date"),
-                "metadata": {
-                    "source": "ForecastBench",
-                    "dataset": ds,
-                    "original_id": pid,
-                    "choices": q.get("choices"), 
-                    "background": q.get("background"),
-                    "resolution_criteria": q.get("resolution_criteria"),
-                    "url": q.get("url")
-                }
-            }
-            
-            # Handle resolution
-            if res_data and res_data.get("resolved"):
-                problem["resolved_flag"] = True
-                # 'resolved_to' seems to be the field for outcome (0.0 or 1.0 or value)
-                problem["resolution_status"] = res_data.get("resolved_to")
-            else:
-                problem["resolved_flag"] = False
-                problem["resolution_status"] = None
-
-            # Add time_testing from freeze_datetime if available
-            time_testing = q.get("freeze_datetime")
-
-            processed = base_process_problem(problem, time_testing=time_testing)
-            all_problems[processed["problem_id"]] = processed
-            
-            if limit and len(all_problems) >= limit:
-                break
-        
-        if limit and len(all_problems) >= limit:
-            break
-            
-    return all_problems
-            
-    return all_problems
+        for entry in sorted(os.scandir(path), key=lambda e: e.name):
+            if entry.name.endswith(".json"):
+                st = entry.stat()
+                entries.append([f"{sub}/{entry.name}", st.st_mtime_ns, st.st_size])
+    return entries
+
+
+def _snapshot_path(target_dir: str) -> Path:
+    return Path(target_dir) / SNAPSHOT_DIRNAME
+
+
+def _open_snapshot(target_dir: str) -> Optional[Snapshot]:
+    """Open the snapshot if it exists and matches the JSON files (or they are absent)."""
+    path = _snapshot_path(target_dir)
+    if not Snapshot.exists(path):
+        return None
+    snapshot = Snapshot(path)
+    current = _tree_fingerprint(target_dir)
+    if not current or snapshot.meta.get("source_files") == current:
+        return snapshot
+    return None
+
+
+def _field_value(problem: Dict, column: str, where: Optional[str]):
+    return problem["metadata"][column] if where == "metadata" else problem[column]
+
+
+def build_forecastbench_snapshot(target_dir: str = None, workers: int = None) -> Path:
+    """
+    Consolidate every question and resolution set into one columnar snapshot.
+
+    Rows are grouped by question set, in listing order, with each set's row
+    range recorded in the snapshot metadata. Loads served from the snapshot
+    read only the columns of the requested rows and never open the JSON tree.
+
+    Args:
+        target_dir: ForecastBench data directory (default: `get_target_dir()`)
+        workers: Processes used to parse the question sets (default: serial)
+
+    Returns:
+        Path of the written snapshot
+    """
+    target_dir = target_dir or get_target_dir()
+    base_data_path = os.path.join(target_dir, "datasets")
+    fingerprint = _tree_fingerprint(target_dir)
+    datasets = _list_datasets(os.path.join(base_data_path, "question_sets"))
+    problems = list(_iter_raw(base_data_path, None, None, workers))
+
+    dataset_codes = {ds: i for i, ds in enumerate(datasets)}
+    dataset_code = np.array([dataset_codes[p["metadata"]["dataset"]] for p in problems], dtype=np.int32)
+    counts = np.bincount(dataset_code, minlength=len(datasets)).tolist()
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])).tolist() if datasets else []
+
+    texts, json_fields = {}, []
+    for column, where in _SNAPSHOT_FIELDS:
+        values = [_field_value(p, column, where) for p in problems]
+        if not all(v is None or isinstance(v, str) for v in values):
+            # Non-string values (lists, numbers) are stored as JSON text
+            values = [None if v is None else json.dumps(v) for v in values]
+            json_fields.append(column)
+        texts[column] = values
+
+    arrays = {
+        "dataset_code": dataset_code,
+        "resolved_flag": np.array([bool(p["resolved_flag"]) for p in problems], dtype=bool),
+    }
+    meta = {
+        "datasets": datasets,
+        "dataset_rows": {ds: [start, start + n] for ds, start, n in zip(datasets, starts, counts)},
+        "json_fields": json_fields,
+        "source_files": fingerprint,
+    }
+    return write_snapshot(_snapshot_path(target_dir), arrays, texts, meta)
+
+
+def _take(column, rows: List[int], whole: bool) -> List:
+    return column.tolist() if whole else [column[r] for r in rows]
+
+
+def _iter_snapshot(
+    snapshot: Snapshot,
+    datasets: List[str],
+    limit: Optional[int],
+    shard_index: int = 0,
+    num_shards: int = 1,
+    time_now: Optional[str] = None,
+) -> Iterator[Dict]:
+    """Stream problems of `datasets` from the consolidated snapshot."""
+    dataset_rows = snapshot.meta["dataset_rows"]
+    rows = [r for ds in datasets for r in range(*dataset_rows[ds])]
+    if limit:
+        rows = rows[:limit]
+    return _iter_snapshot_rows(snapshot, rows, shard_index, num_shards, time_now)
+
+
+def _iter_snapshot_rows(
+    snapshot: Snapshot,
+    rows: List[int],
+    shard_index: int = 0,
+    num_shards: int = 1,
+    time_now: Optional[str] = None,
+) -> Iterator[Dict]:
+    """Stream the problems of the given snapshot rows in this shard, decoding only those rows."""
+    names = snapshot.meta["datasets"]
+    dataset_code = snapshot.array("dataset_code")
+    original_id = snapshot.text("original_id")
+    rows = list(shard_filter(rows, shard_index, num_shards,
+                             key=lambda r: f"fb_{names[dataset_code[r]]}_{original_id[r]}"))
+    whole = len(rows) == snapshot.rows
+
+    json_fields = set(snapshot.meta["json_fields"])
+    columns = {}
+    for column, _ in _SNAPSHOT_FIELDS:
+        values = _take(snapshot.text(column), rows, whole)
+        if column in json_fields:
+            values = [None if v is None else json.loads(v) for v in values]
+        columns[column] = values
+    codes = dataset_code[rows].tolist()
+    resolved = snapshot.array("resolved_flag")[rows].tolist()
+
+    for i in range(len(rows)):
+        ds = names[codes[i]]
+        pid = columns["original_id"][i]
+        yield {
+            "problem_id": f"fb_{ds}_{pid}",
+            "question": columns["question"][i],
+            "time_start": columns["time_start"][i],
+            "time_end": columns["time_end"][i],
+            "metadata": {
+                "source": "ForecastBench",
+                "dataset": ds,
+                "original_id": pid,
+                "choices": columns["choices"][i],
+                "background": columns["background"][i],
+                "resolution_criteria": columns["resolution_criteria"][i],
+                "url": columns["url"][i],
+            },
+            "resolved_flag": resolved[i],
+            "resolution_status": columns["resolution_status"][i],
+            "time_now": time_now,
+            "time_testing": columns["time_testing"][i],
+        }
+
+
+def _iter_rows(
+    rows: List[int],
+    shard_index: int = 0,
+    num_shards: int = 1,
+    time_now: Optional[str] = None,
+) -> Iterator[Dict]:
+    """
+    Problems at the given (sorted) positions of a full load, in this shard.
+
+    Only those rows are built when the snapshot is current; otherwise the
+    JSON files are streamed and the other problems are dropped as they go.
+    """
+    time_now = time_now or datetime.now().isoformat()
+    target_dir = get_target_dir()
+    snapshot = _open_snapshot(target_dir)
+    if snapshot is not None:
+        return _iter_snapshot_rows(snapshot, rows, shard_index, num_shards, time_now)
+    wanted = set(rows)
+    problems = _iter_raw(os.path.join(target_dir, "datasets"), None, None, None, time_now=time_now)
+    return shard_filter((p for i, p in enumerate(problems) if i in wanted), shard_index, num_shards)
+
+
+def _text_columns(fields: List[str]) -> Tuple[Dict[str, List[Optional[str]]], int]:
+    """
+    Text of the given metadata or top-level fields for every problem of a full load, and the row count.
+
+    Read from the snapshot columns when it is current, else by streaming the JSON files.
+    """
+    target_dir = get_target_dir()
+    snapshot = _open_snapshot(target_dir)
+    if snapshot is not None:
+        return {field: snapshot.text(field).tolist() for field in fields}, snapshot.rows
+    columns = {field: [] for field in fields}
+    for p in _iter_raw(os.path.join(target_dir, "datasets"), None, None, None):
+        for field in fields:
+            columns[field].append(p[field] if field in p else p["metadata"].get(field))
+    return columns, len(next(iter(columns.values()), []))
+
+
+def load_forecastbench_dataset(raw_problems: List[Dict], dataset_name: str = None, limit: int = None, **kwargs) -> Dict[str, Any]:
+    """
+    Loads problems from the ForecastBench dataset.
+
+    Dict-returning form of `iter_forecastbench_dataset`.
+    """
+    return to_problem_dict(iter_forecastbench_dataset(raw_problems, dataset_name=dataset_name, limit=limit, **kwargs))
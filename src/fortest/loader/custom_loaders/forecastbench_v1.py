@@ -5,19 +5,33 @@ Provides flexible data loaders for the ForecastBench_v1 resolved dataset with:
 - Source-wise loading
 - Extensive (all sources) loading
 - Horizon grouping (short/near/medium/long/very-long/extended)
-- Stratified sampling with reproducibility
+- Quota-exact stratified sampling with reproducibility (see `fortest.loader.sampling`)
+- Process-wide memoization of the prepared dataset
+- Optional memory-mapped columnar snapshot (see `build_snapshot`)
+- Posting-list index over source/horizon/question_set
+- Integer day columns (start, end, freeze) for vectorized horizons and time windows
+- Sorted time_testing/time_end indexes for time-window loads (`forecastbench_v1_window`)
+- Near-duplicate question clusters (MinHash/LSH) to cap the sample per cluster
 """
 
 import os
 import json
-import random
 from enum import Enum
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Iterator, Iterable, NamedTuple
 from collections import defaultdict
 from pathlib import Path
 
-from fortest.loader.loader import ProblemLoader, base_process_problem
+import numpy as np
+
+from fortest.loader.loader import ProblemLoader, base_process_problem, materialize, to_problem_dict
+from fortest.loader.cache import FileCache, dataset_fingerprint
+from fortest.loader.dedup import near_duplicate_clusters
+from fortest.loader.snapshot import Snapshot, write_snapshot, META_FILE
+from fortest.loader.index import PostingIndex, SortedTimeIndex, TimeBound
+from fortest.loader.sampling import quota_sample
+from fortest.loader.sharding import check_shard, shard_filter
+from fortest.loader.timecols import NAT, bucketize, to_epoch_days, to_epoch_seconds
 
 
 class HorizonGroup(Enum):
@@ -50,53 +64,86 @@ class HorizonGroup(Enum):
         return cls.EXTENDED
 
 
+# Lower edges of the horizon groups, in enum order, for `bucketize`
+_HORIZON_EDGES = np.array([h.min_days for h in HorizonGroup], dtype=np.int64)
+_HORIZON_GROUP_LABELS = [h.label for h in HorizonGroup]
+
+
 # Sources categorization
 DATA_SOURCES = {'acled', 'dbnomics', 'fred', 'wikipedia', 'yfinance'}
 MARKET_SOURCES = {'manifold', 'metaculus', 'polymarket', 'infer'}
 ALL_SOURCES = DATA_SOURCES | MARKET_SOURCES
 
+# Prepared problems, shared by every loader call in the process
+_DATASET_CACHE = FileCache()
+
+# Directory (inside the data dir) holding the columnar snapshot
+SNAPSHOT_DIRNAME = "single_resolved.snapshot"
+
+# Text fields stored in the snapshot's offsets+blob columns
+_SNAPSHOT_TEXT_FIELDS = (
+    "original_id", "question", "time_start", "time_end", "time_testing",
+    "background", "resolution_criteria", "url", "freeze_datetime_value",
+)
+
+# Bumped when the snapshot's columns change; snapshots of another layout are ignored
+_SNAPSHOT_LAYOUT = 2
+
 
 def _get_data_dir() -> Path:
     """Get path to ForecastBench_v1 data directory."""
     return Path(__file__).parent.parent.parent / "problems" / "ForecastBench_v1"
 
 
+def _raw_data_paths() -> Tuple[Path, Path]:
+    """Paths of the X and y JSON files."""
+    data_dir = _get_data_dir()
+    return data_dir / "X_single_resolved.json", data_dir / "y_single_resolved.json"
+
+
 def _load_raw_data() -> Tuple[List[Dict], List[Dict]]:
     """Load X and y data from JSON files."""
-    data_dir = _get_data_dir()
+    x_path, y_path = _raw_data_paths()
     
-    with open(data_dir / "X_single_resolved.json") as f:
+    with open(x_path) as f:
         X_data = json.load(f)['questions']
-    with open(data_dir / "y_single_resolved.json") as f:
+    with open(y_path) as f:
         y_data = json.load(f)['resolutions']
     
     return X_data, y_data
 
 
 def _compute_horizon(question: Dict, resolution: Dict) -> Optional[int]:
-    """Compute horizon in days from start to resolution date."""
+    """Compute horizon in days from start to resolution date (dates parsed as in `to_epoch_days`)."""
     # Use start_date if available (templatized questions), else forecast_due_date
     start = question.get('start_date') or question.get('forecast_due_date')
     end = question.get('end_date') or resolution.get('resolution_date')
     
-    if not start or not end or start == 'N/A' or end == 'N/A':
-        return None
-    
-    try:
-        start_dt = datetime.strptime(start.split('T')[0], '%Y-%m-%d')
-        end_dt = datetime.strptime(end.split('T')[0], '%Y-%m-%d')
-        return (end_dt - start_dt).days
-    except ValueError:
+    start_day, end_day = to_epoch_days([start, end]).tolist()
+    if start_day == NAT or end_day == NAT:
         return None
+    return end_day - start_day
+
 
+def _build_problem(
+    question: Dict,
+    resolution: Dict,
+    horizon_days: Optional[int],
+    horizon: Optional[str] = None,
+    time_now: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Build a problem dict matching the expected interface.
 
-def _build_problem(question: Dict, resolution: Dict, horizon_days: Optional[int]) -> Dict[str, Any]:
-    """Build a problem dict matching the expected interface."""
+    `horizon` is derived from `horizon_days` if not given; batch callers
+    pass one shared `time_now`.
+    """
     qid = question.get('id')
     source = question.get('source', 'unknown')
     question_set = question.get('question_set', '')
     
-    horizon_group = HorizonGroup.from_days(horizon_days) if horizon_days else None
+    if horizon is None and horizon_days:
+        horizon = HorizonGroup.from_days(horizon_days).label
     
     problem = {
         "problem_id": f"fbv1_{source}_{qid}",
@@ -107,7 +154,7 @@ def _build_problem(question: Dict, resolution: Dict, horizon_days: Optional[int]
         "resolution_status": resolution.get('resolved_to'),
         "metadata": {
             "source": source,
-            "horizon": horizon_group.label if horizon_group else None,
+            "horizon": horizon,
             "horizon_days": horizon_days,
             "original_id": qid,
             "question_set": question_set,
@@ -120,11 +167,11 @@ def _build_problem(question: Dict, resolution: Dict, horizon_days: Optional[int]
     
     # Add time_testing from freeze_datetime
     time_testing = question.get('freeze_datetime')
-    return base_process_problem(problem, time_testing=time_testing)
+    return base_process_problem(problem, time_testing=time_testing, time_now=time_now, copy=False)
 
 
-def _load_and_prepare_all() -> List[Dict[str, Any]]:
-    """Load all data and prepare problem dicts with horizons."""
+def _prepare_from_json() -> Tuple[Dict[str, Any], ...]:
+    """Parse the JSON files and prepare problem dicts with horizons."""
     X_data, y_data = _load_raw_data()
     
     # Build lookup for resolutions
@@ -133,19 +180,461 @@ def _load_and_prepare_all() -> List[Dict[str, Any]]:
         key = (y.get('question_set'), y.get('id'))
         y_lookup[key] = y
     
+    matched = [y_lookup.get((q.get('question_set'), q.get('id')), {}) for q in X_data]
+    
+    # Horizons for all questions at once; only strict YYYY-MM-DD[T...] dates count, as in `_compute_horizon`
+    start_day = to_epoch_days([q.get('start_date') or q.get('forecast_due_date') for q in X_data])
+    end_day = to_epoch_days([q.get('end_date') or y.get('resolution_date') for q, y in zip(X_data, matched)])
+    horizon_days = np.where((start_day != NAT) & (end_day != NAT), end_day - start_day, 0)
+    keep = np.flatnonzero(horizon_days > 0)  # Skip questions without valid horizon
+    horizon_code = bucketize(horizon_days[keep], _HORIZON_EDGES)
+    
+    time_now = datetime.now().isoformat()
     problems = []
-    for q in X_data:
-        key = (q.get('question_set'), q.get('id'))
-        y = y_lookup.get(key, {})
-        
-        horizon = _compute_horizon(q, y)
-        if horizon is None or horizon <= 0:
-            continue  # Skip questions without valid horizon
-        
-        problem = _build_problem(q, y, horizon)
-        problems.append(problem)
+    for i, code, days in zip(keep.tolist(), horizon_code.tolist(), horizon_days[keep].tolist()):
+        problems.append(_build_problem(X_data[i], matched[i], days, _HORIZON_GROUP_LABELS[code], time_now))
     
-    return problems
+    return tuple(problems)
+
+
+def _snapshot_path() -> Path:
+    """Path of the columnar snapshot directory."""
+    return _get_data_dir() / SNAPSHOT_DIRNAME
+
+
+def _source_fingerprint() -> List[List]:
+    """[file name, mtime_ns, size] of the X/y JSON files, as recorded in snapshots."""
+    return [[Path(p).name, mtime, size] for p, mtime, size in dataset_fingerprint(_raw_data_paths())]
+
+
+def _parse_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def build_snapshot(path=None) -> Path:
+    """
+    Convert the X/y JSON files into a memory-mappable columnar snapshot.
+
+    Once a snapshot matching the current JSON files exists, cold starts read
+    it instead of parsing the JSON. The snapshot records the size and mtime
+    of the files it was built from and is ignored once they change.
+
+    Args:
+        path: Output directory (default: `SNAPSHOT_DIRNAME` in the data dir)
+
+    Returns:
+        Path of the written snapshot
+    """
+    problems = _prepare_from_json()
+    horizon_days = np.array([p['metadata']['horizon_days'] for p in problems], dtype=np.int32)
+    sources = sorted({p['metadata']['source'] for p in problems})
+    question_sets = sorted({p['metadata']['question_set'] for p in problems})
+    source_codes = {s: i for i, s in enumerate(sources)}
+    question_set_codes = {q: i for i, q in enumerate(question_sets)}
+
+    arrays = {
+        "source_code": np.array([source_codes[p['metadata']['source']] for p in problems], dtype=np.int16),
+        "question_set_code": np.array(
+            [question_set_codes[p['metadata']['question_set']] for p in problems], dtype=np.int16),
+        "horizon_days": horizon_days,
+        "horizon_code": bucketize(horizon_days, _HORIZON_EDGES).astype(np.int8),
+        "resolved_to": np.array([_parse_float(p['resolution_status']) for p in problems], dtype=np.float64),
+    }
+    arrays.update(zip(("start_day", "end_day", "freeze_day"), _time_columns(problems)))
+    arrays["testing_second"] = to_epoch_seconds([p['time_testing'] for p in problems])
+    arrays["end_second"] = to_epoch_seconds([p['time_end'] for p in problems])
+    texts = {}
+    for field in _SNAPSHOT_TEXT_FIELDS:
+        if field in ("question", "time_start", "time_end", "time_testing"):
+            texts[field] = [p[field] for p in problems]
+        else:
+            texts[field] = [p['metadata'][field] for p in problems]
+
+    meta = {
+        "layout": _SNAPSHOT_LAYOUT,
+        "sources": sources,
+        "question_sets": question_sets,
+        "source_files": _source_fingerprint(),
+    }
+    return write_snapshot(path or _snapshot_path(), arrays, texts, meta)
+
+
+def _open_snapshot() -> Optional[Snapshot]:
+    """Open the snapshot if it exists, has the current layout and matches the JSON files (or they are absent)."""
+    path = _snapshot_path()
+    if not Snapshot.exists(path):
+        return None
+    snapshot = Snapshot(path)
+    if snapshot.meta.get("layout") != _SNAPSHOT_LAYOUT:
+        return None
+    current = _source_fingerprint()
+    json_missing = all(size == -1 for _, _, size in current)
+    if json_missing or snapshot.meta.get("source_files") == current:
+        return snapshot
+    return None
+
+
+class _SnapshotRows(Sequence):
+    """
+    Prepared problems served from snapshot columns.
+
+    Text columns stay memory-mapped; a row's problem dict is built when
+    the row is read, so loads only decode the problems they return. The
+    sampling codes and time columns are read from the stored arrays rather
+    than parsed from the text columns.
+    """
+
+    def __init__(self, snapshot: Snapshot):
+        self._snapshot = snapshot
+        self._rows = len(snapshot)
+        self._sources = snapshot.meta["sources"]
+        self._question_sets = snapshot.meta["question_sets"]
+        self._source_code = snapshot.array("source_code")
+        self._question_set_code = snapshot.array("question_set_code")
+        self._horizon_days = snapshot.array("horizon_days")
+        self._horizon_code = snapshot.array("horizon_code")
+        self._resolved_to = snapshot.array("resolved_to")
+        self._text = {field: snapshot.text(field) for field in _SNAPSHOT_TEXT_FIELDS}
+        self._time_now = datetime.now().isoformat()
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._rows))]
+        if i < 0:
+            i += self._rows
+        if not 0 <= i < self._rows:
+            raise IndexError(f"Row {i} out of range")
+        text = self._text
+        source = self._sources[self._source_code[i]]
+        qid = text["original_id"][i]
+        resolution = self._resolved_to[i].item()
+        return {
+            "problem_id": f"fbv1_{source}_{qid}",
+            "question": text["question"][i],
+            "time_start": text["time_start"][i],
+            "time_end": text["time_end"][i],
+            "resolved_flag": True,
+            "resolution_status": None if resolution != resolution else resolution,
+            "metadata": {
+                "source": source,
+                "horizon": _HORIZON_GROUP_LABELS[self._horizon_code[i]],
+                "horizon_days": self._horizon_days[i].item(),
+                "original_id": qid,
+                "question_set": self._question_sets[self._question_set_code[i]],
+                "background": text["background"][i],
+                "resolution_criteria": text["resolution_criteria"][i],
+                "url": text["url"][i],
+                "freeze_datetime_value": text["freeze_datetime_value"][i],
+            },
+            "time_now": self._time_now,
+            "time_testing": text["time_testing"][i],
+        }
+
+    def problem_ids(self, rows: Iterable[int]) -> List[str]:
+        """problem_id of each row, built from the source codes and original ids alone."""
+        original_id = self._text["original_id"]
+        return [f"fbv1_{self._sources[self._source_code[i]]}_{original_id[i]}" for i in rows]
+
+    def column(self, key: str, metadata: bool = False) -> List[Any]:
+        """Values of one field (or metadata key) for every row, decoded column-wise."""
+        if key == "source" and metadata:
+            return [self._sources[c] for c in self._source_code.tolist()]
+        if key == "question_set" and metadata:
+            return [self._question_sets[c] for c in self._question_set_code.tolist()]
+        if key == "horizon" and metadata:
+            return [_HORIZON_GROUP_LABELS[c] for c in self._horizon_code.tolist()]
+        if key in self._text:
+            return self._text[key].tolist()
+        return [p['metadata'][key] if metadata else p[key] for p in self]
+
+    def strata(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Source vocabulary plus the stored per-row source and horizon codes."""
+        return self._sources, np.asarray(self._source_code), np.asarray(self._horizon_code)
+
+    def time_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Stored start, end and freeze epoch days per row."""
+        return tuple(np.asarray(self._snapshot.array(name)) for name in ("start_day", "end_day", "freeze_day"))
+
+    def time_indexes(self) -> Tuple[SortedTimeIndex, SortedTimeIndex]:
+        """Sorted time_testing and time_end indexes over the stored epoch seconds."""
+        return (
+            SortedTimeIndex(self._snapshot.array("testing_second")),
+            SortedTimeIndex(self._snapshot.array("end_second")),
+        )
+
+
+def _column(problems: Sequence[Dict[str, Any]], key: str, metadata: bool = False) -> List[Any]:
+    """Values of one field (or metadata key) of every prepared problem."""
+    if isinstance(problems, _SnapshotRows):
+        return problems.column(key, metadata)
+    return [p['metadata'][key] if metadata else p[key] for p in problems]
+
+
+def _problem_ids(problems: Sequence[Dict[str, Any]], rows: Iterable[int]) -> List[str]:
+    """problem_id of each given row, without building snapshot rows' problem dicts."""
+    if isinstance(problems, _SnapshotRows):
+        return problems.problem_ids(rows)
+    return [problems[i]['problem_id'] for i in rows]
+
+
+def _prepare_from_snapshot(snapshot: Snapshot) -> _SnapshotRows:
+    """Prepared problems backed by the snapshot's columns."""
+    return _SnapshotRows(snapshot)
+
+
+class _Dataset(NamedTuple):
+    """Prepared problems plus the secondary index, sampling codes and time columns over their row ids."""
+    problems: Sequence[Dict[str, Any]]
+    index: PostingIndex
+    sources: List[str]
+    source_code: np.ndarray
+    horizon_code: np.ndarray
+    # int64 days since the epoch of time_start, time_end and time_testing (`NAT` if missing)
+    start_day: np.ndarray
+    end_day: np.ndarray
+    freeze_day: np.ndarray
+    # Rows sorted by epoch seconds of time_testing and time_end
+    testing_index: SortedTimeIndex
+    end_index: SortedTimeIndex
+
+
+# Horizon codes used by the sampler; problems without a horizon get the last code
+_HORIZON_LABELS = [h.label for h in HorizonGroup] + [None]
+
+
+def _encode_strata(problems) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Source vocabulary plus per-row source and horizon codes."""
+    if isinstance(problems, _SnapshotRows):
+        return problems.strata()
+    row_sources = _column(problems, 'source', metadata=True)
+    sources = sorted(set(row_sources))
+    source_codes = {s: i for i, s in enumerate(sources)}
+    horizon_codes = {h: i for i, h in enumerate(_HORIZON_LABELS)}
+    source_code = np.fromiter((source_codes[s] for s in row_sources), dtype=np.int16, count=len(problems))
+    horizon_code = np.fromiter((horizon_codes[h] for h in _column(problems, 'horizon', metadata=True)),
+                               dtype=np.int8, count=len(problems))
+    return sources, source_code, horizon_code
+
+
+def _build_index(problems: Sequence[Dict[str, Any]]) -> PostingIndex:
+    """Index rows by source, horizon group and question_set."""
+    return PostingIndex.build({
+        field: _column(problems, field, metadata=True) for field in ("source", "horizon", "question_set")
+    })
+
+
+def _time_columns(problems) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Start, end and freeze (time_testing) epoch days per row."""
+    if isinstance(problems, _SnapshotRows):
+        return problems.time_columns()
+    return (
+        to_epoch_days(_column(problems, 'time_start')),
+        to_epoch_days(_column(problems, 'time_end')),
+        to_epoch_days(_column(problems, 'time_testing')),
+    )
+
+
+def _time_indexes(problems) -> Tuple[SortedTimeIndex, SortedTimeIndex]:
+    """Sorted time_testing and time_end indexes over the rows."""
+    if isinstance(problems, _SnapshotRows):
+        return problems.time_indexes()
+    return (
+        SortedTimeIndex.from_strings(_column(problems, 'time_testing')),
+        SortedTimeIndex.from_strings(_column(problems, 'time_end')),
+    )
+
+
+def _make_dataset(problems: Sequence[Dict[str, Any]]) -> _Dataset:
+    """Index prepared problems and derive their sampling codes and time columns."""
+    return _Dataset(problems, _build_index(problems), *_encode_strata(problems),
+                    *_time_columns(problems), *_time_indexes(problems))
+
+
+def _prepare_all() -> _Dataset:
+    """Prepare problems from the snapshot when it is current, else from JSON, and index them."""
+    snapshot = _open_snapshot()
+    if snapshot is not None:
+        problems = _prepare_from_snapshot(snapshot)
+    else:
+        problems = _prepare_from_json()
+    return _make_dataset(problems)
+
+
+def _dataset_paths() -> List[Path]:
+    """Files the prepared dataset is derived from."""
+    return [*_raw_data_paths(), _snapshot_path() / META_FILE]
+
+
+def _load_dataset() -> _Dataset:
+    """Prepared problems and their index, memoized per process."""
+    return _DATASET_CACHE.get("forecastbench_v1", _dataset_paths(), _prepare_all)
+
+
+def _load_clusters() -> np.ndarray:
+    """Near-duplicate cluster label per dataset row, memoized per process like the dataset."""
+    return _DATASET_CACHE.get(
+        "forecastbench_v1_clusters", _dataset_paths(),
+        lambda: near_duplicate_clusters(_column(_load_dataset().problems, 'question')))
+
+
+def _cluster_labels(per_cluster: Optional[int]) -> Optional[np.ndarray]:
+    """Cluster labels of the dataset rows when a per-cluster cap is requested."""
+    return None if per_cluster is None else _load_clusters()
+
+
+def _load_and_prepare_all() -> Sequence[Dict[str, Any]]:
+    """
+    Prepared problems for the whole dataset, memoized per process.
+
+    The cache is keyed by the X/y file paths and the snapshot metadata plus
+    their mtime and size, so edits to the data files are picked up
+    automatically. The returned rows
+    are shared between callers and must not be mutated; loaders hand out
+    copies through `materialize`.
+    """
+    return _load_dataset().problems
+
+
+def _select_rows(
+    sources: Optional[List[str]] = None,
+    horizons: Optional[List[str]] = None,
+    question_sets: Optional[List[str]] = None,
+    freeze_start: Optional[str] = None,
+    freeze_end: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Row ids of prepared problems matching the filters, via the index.
+
+    Args:
+        sources: Sources to include (None = all)
+        horizons: Horizon groups to include (None = all)
+        question_sets: Question set files to include (None = all)
+        freeze_start: Earliest freeze date, inclusive (YYYY-MM-DD)
+        freeze_end: Latest freeze date, exclusive (YYYY-MM-DD)
+    """
+    dataset = _load_dataset()
+    rows = dataset.index.select(
+        source=sources or None,
+        horizon=horizons or None,
+        question_set=question_sets or None,
+    )
+    if freeze_start is None and freeze_end is None:
+        return rows
+    return rows[_in_window(dataset.freeze_day[rows], freeze_start, freeze_end)]
+
+
+def _in_window(days: np.ndarray, start: Optional[str], end: Optional[str]) -> np.ndarray:
+    """Mask of `days` in [start, end); None leaves a side open and missing days never match."""
+    mask = days != NAT
+    if start is not None:
+        mask &= days >= to_epoch_days([start])[0]
+    if end is not None:
+        mask &= days < to_epoch_days([end])[0]
+    return mask
+
+
+def _window_rows(
+    dataset: _Dataset,
+    testing_start: TimeBound = None,
+    testing_end: TimeBound = None,
+    end_start: TimeBound = None,
+    end_end: TimeBound = None,
+    sources: Optional[List[str]] = None,
+    horizons: Optional[List[str]] = None,
+    question_sets: Optional[List[str]] = None,
+) -> np.ndarray:
+    """
+    Row ids with time_testing in [testing_start, testing_end) and time_end in
+    [end_start, end_end), in time_testing order.
+
+    The time_testing window is a slice of the sorted index; the other
+    filters only narrow that slice, row by row, so the cost is
+    O(log n + k) for a window of k rows. Rows without a parseable
+    time_testing (or time_end, when it is bounded) never match.
+    """
+    rows = dataset.testing_index.window(testing_start, testing_end)
+    if end_start is not None or end_end is not None:
+        rows = rows[dataset.end_index.mask(rows, end_start, end_end)]
+    for field, values in (('source', sources), ('horizon', horizons), ('question_set', question_sets)):
+        if values:
+            rows = rows[dataset.index.mask(rows, field, values)]
+    return rows
+
+
+def invalidate_cache():
+    """Drop the memoized dataset so the next load re-reads the files."""
+    _DATASET_CACHE.invalidate()
+
+
+def _sample_rows(
+    sources: List[str],
+    source_code: np.ndarray,
+    horizon_code: np.ndarray,
+    rows: np.ndarray,
+    max_quest: int,
+    seed: int,
+    cluster: Optional[np.ndarray] = None,
+    per_cluster: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Row ids of a stratified sample of `rows`, stratifying market sources by horizon.
+
+    The codes and `cluster` labels cover every row, not only `rows`.
+    """
+    stratify = np.array([s in MARKET_SOURCES for s in sources], dtype=bool)
+    positions = quota_sample(source_code[rows], horizon_code[rows], stratify, max_quest, seed,
+                             None if cluster is None else cluster[rows], per_cluster)
+    return rows[positions]
+
+
+def _sample_dataset(
+    dataset: _Dataset,
+    rows: np.ndarray,
+    max_quest: int,
+    seed: int,
+    cluster: Optional[np.ndarray] = None,
+    per_cluster: Optional[int] = None,
+) -> np.ndarray:
+    """Row ids of a stratified sample of the given dataset rows; `cluster` labels every dataset row."""
+    return _sample_rows(dataset.sources, dataset.source_code, dataset.horizon_code, rows, max_quest, seed,
+                        cluster, per_cluster)
+
+
+def _shard_rows(dataset: _Dataset, rows: np.ndarray, shard_index: int, num_shards: int) -> Iterator[Dict[str, Any]]:
+    """
+    Problems (shared, not copied) of the given rows that fall in this shard.
+
+    Shards are assigned from the rows' problem ids, so only this shard's
+    problems are built.
+    """
+    check_shard(shard_index, num_shards)
+    rows = rows.tolist()
+    if num_shards > 1:
+        owned = shard_filter(zip(rows, _problem_ids(dataset.problems, rows)), shard_index, num_shards,
+                             key=lambda row: row[1])
+        rows = [i for i, _ in owned]
+    return (dataset.problems[i] for i in rows)
+
+
+def _sample_shard(
+    dataset: _Dataset,
+    rows: np.ndarray,
+    max_quest: int,
+    seed: int,
+    shard_index: int,
+    num_shards: int,
+    cluster: Optional[np.ndarray] = None,
+    per_cluster: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """This shard's part of the global sample; every shard draws the same sample first."""
+    return _shard_rows(dataset, _sample_dataset(dataset, rows, max_quest, seed, cluster, per_cluster),
+                       shard_index, num_shards)
 
 
 def _stratified_sample(
@@ -154,133 +643,49 @@ def _stratified_sample(
     seed: int,
     sources: Optional[List[str]] = None,
     horizons: Optional[List[str]] = None,
+    rows: Optional[np.ndarray] = None,
+    per_cluster: Optional[int] = None,
 ) -> Dict[str, Dict]:
     """
-    Stratified sampling across sources and horizons.
-    
-    For data sources: uniform sampling across horizons
-    For market sources: stratified sampling from horizon groups
-    
-    Redistributes unused quota from limited sources to larger ones.
+    Stratified sampling across sources and horizons, over a list of problems.
+
+    Samples through `_sample_rows`, as the loaders do: `max_quest` is split
+    equally across sources, market sources are stratified by horizon, and
+    the result depends only on the inputs and `seed`. When `rows` (sorted
+    row ids, e.g. from `_select_rows`) is given, only those problems are
+    considered. With `per_cluster`, near-duplicate clusters are computed
+    over all of `problems`, as the loaders compute them over the dataset.
     """
-    random.seed(seed)
-    
-    # Group by source and horizon
-    by_source_horizon = defaultdict(lambda: defaultdict(list))
-    by_source_all = defaultdict(list)
-    
-    for p in problems:
-        src = p['metadata']['source']
-        h = p['metadata']['horizon']
-        
-        # Filter by sources if specified
-        if sources and src not in sources:
-            continue
-        # Filter by horizons if specified
-        if horizons and h not in horizons:
-            continue
-            
-        by_source_horizon[src][h].append(p)
-        by_source_all[src].append(p)
-    
-    if not by_source_horizon:
+    if rows is None:
+        rows = np.array([
+            i for i, p in enumerate(problems)
+            if (not sources or p['metadata']['source'] in sources)
+            and (not horizons or p['metadata']['horizon'] in horizons)
+        ], dtype=np.int64)
+    if not len(rows):
         return {}
-    
-    # Calculate initial questions per source
-    active_sources = list(by_source_horizon.keys())
-    per_source = max(1, max_quest // len(active_sources))
-    
-    selected = {}
-    
-    # First pass: sample up to per_source from each source
-    source_counts = {}
-    for src in active_sources:
-        all_src = by_source_all[src][:]
-        random.shuffle(all_src)
-        
-        if src in MARKET_SOURCES:
-            # Market sources: try stratified sampling from horizon groups
-            src_problems = by_source_horizon[src]
-            horizon_groups = list(src_problems.keys())
-            if horizon_groups:
-                per_horizon = max(1, per_source // len(horizon_groups))
-                src_selected = []
-                for h in horizon_groups:
-                    h_list = src_problems[h][:]
-                    random.shuffle(h_list)
-                    src_selected.extend(h_list[:per_horizon])
-                
-                # Fill remainder
-                remaining_ids = {p['problem_id'] for p in src_selected}
-                for p in all_src:
-                    if len(src_selected) >= per_source:
-                        break
-                    if p['problem_id'] not in remaining_ids:
-                        src_selected.append(p)
-                
-                for p in src_selected[:per_source]:
-                    selected[p['problem_id']] = p
-                source_counts[src] = min(len(src_selected), per_source)
-            else:
-                source_counts[src] = 0
-        else:
-            # Data sources: uniform sampling
-            for p in all_src[:per_source]:
-                selected[p['problem_id']] = p
-            source_counts[src] = min(len(all_src), per_source)
-    
-    # Second pass: redistribute unused quota to sources with more data
-    total_selected = len(selected)
-    remaining_quota = max_quest - total_selected
-    
-    if remaining_quota > 0:
-        # Sort sources by available remaining questions (descending)
-        sources_with_capacity = []
-        for src in active_sources:
-            already_taken = source_counts.get(src, 0)
-            available = len(by_source_all[src]) - already_taken
-            if available > 0:
-                sources_with_capacity.append((src, available))
-        
-        sources_with_capacity.sort(key=lambda x: -x[1])
-        
-        for src, available in sources_with_capacity:
-            if remaining_quota <= 0:
-                break
-            
-            # Get questions not yet selected from this source
-            selected_ids = set(selected.keys())
-            additional = []
-            for p in by_source_all[src]:
-                if p['problem_id'] not in selected_ids:
-                    additional.append(p)
-            
-            random.shuffle(additional)
-            to_add = min(len(additional), remaining_quota)
-            for p in additional[:to_add]:
-                selected[p['problem_id']] = p
-                remaining_quota -= 1
-    
-    # Final trim if somehow exceeded
-    if len(selected) > max_quest:
-        all_selected = list(selected.values())
-        random.shuffle(all_selected)
-        selected = {p['problem_id']: p for p in all_selected[:max_quest]}
-    
-    return selected
+    cluster = None if per_cluster is None else near_duplicate_clusters(_column(problems, 'question'))
+    selected = _sample_rows(*_encode_strata(problems), rows, max_quest, seed, cluster, per_cluster)
+    return {problems[i]['problem_id']: problems[i] for i in selected.tolist()}
 
 
-@ProblemLoader.register("forecastbench_v1")
-def load_forecastbench_v1(
+@ProblemLoader.register("forecastbench_v1", uses_raw_problems=False, streaming=True, shardable=True)
+def iter_forecastbench_v1(
     raw_problems: List[Dict],
     max_quest: int = 200,
     seed: int = 42,
     sources: Optional[List[str]] = None,
     horizons: Optional[List[str]] = None,
+    question_sets: Optional[List[str]] = None,
+    freeze_start: Optional[str] = None,
+    freeze_end: Optional[str] = None,
+    per_cluster: Optional[int] = None,
+    shard_index: int = 0,
+    num_shards: int = 1,
     **kwargs
-) -> Dict[str, Any]:
+) -> Iterator[Dict[str, Any]]:
     """
-    Load ForecastBench v1 resolved questions with flexible filtering.
+    Stream ForecastBench v1 resolved questions with flexible filtering.
     
     Args:
         raw_problems: Ignored (loads from ForecastBench_v1 files)
@@ -288,25 +693,35 @@ def load_forecastbench_v1(
         seed: Random seed for reproducibility
         sources: List of sources to include (None = all)
         horizons: List of horizon groups to include (None = all)
+        question_sets: List of question set files to include (None = all)
+        freeze_start: Only questions frozen on/after this date (YYYY-MM-DD)
+        freeze_end: Only questions frozen before this date (YYYY-MM-DD)
+        per_cluster: Draw at most this many near-duplicate questions per cluster
+        shard_index: This worker's shard of the sample, 0-based
+        num_shards: Number of shards the sample is split into
     
     Returns:
-        Dict mapping problem_id to problem dict
+        Iterator over problem dicts
     """
-    problems = _load_and_prepare_all()
-    return _stratified_sample(problems, max_quest, seed, sources, horizons)
+    rows = _select_rows(sources, horizons, question_sets, freeze_start, freeze_end)
+    return materialize(_sample_shard(
+        _load_dataset(), rows, max_quest, seed, shard_index, num_shards, _cluster_labels(per_cluster), per_cluster))
 
 
-@ProblemLoader.register("forecastbench_v1_source")
-def load_by_source(
+@ProblemLoader.register("forecastbench_v1_source", uses_raw_problems=False, streaming=True, shardable=True)
+def iter_by_source(
     raw_problems: List[Dict],
     source: str,
     max_quest: int = 200,
     seed: int = 42,
     horizons: Optional[List[str]] = None,
+    per_cluster: Optional[int] = None,
+    shard_index: int = 0,
+    num_shards: int = 1,
     **kwargs
-) -> Dict[str, Any]:
+) -> Iterator[Dict[str, Any]]:
     """
-    Load ForecastBench v1 questions from a single source.
+    Stream ForecastBench v1 questions from a single source.
     
     Args:
         raw_problems: Ignored
@@ -314,37 +729,122 @@ def load_by_source(
         max_quest: Maximum questions to return
         seed: Random seed
         horizons: List of horizon groups to include
+        per_cluster: Draw at most this many near-duplicate questions per cluster
+        shard_index: This worker's shard of the sample, 0-based
+        num_shards: Number of shards the sample is split into
     
     Returns:
-        Dict mapping problem_id to problem dict
+        Iterator over problem dicts
     """
     if source not in ALL_SOURCES:
         raise ValueError(f"Unknown source: {source}. Available: {ALL_SOURCES}")
     
-    problems = _load_and_prepare_all()
-    return _stratified_sample(problems, max_quest, seed, sources=[source], horizons=horizons)
+    rows = _select_rows(sources=[source], horizons=horizons)
+    return materialize(_sample_shard(
+        _load_dataset(), rows, max_quest, seed, shard_index, num_shards, _cluster_labels(per_cluster), per_cluster))
 
 
-@ProblemLoader.register("forecastbench_v1_extensive")
-def load_extensive(
+@ProblemLoader.register("forecastbench_v1_extensive", uses_raw_problems=False, streaming=True, shardable=True)
+def iter_extensive(
     raw_problems: List[Dict],
     max_quest: int = 200,
     seed: int = 42,
+    per_cluster: Optional[int] = None,
+    shard_index: int = 0,
+    num_shards: int = 1,
     **kwargs
-) -> Dict[str, Any]:
+) -> Iterator[Dict[str, Any]]:
     """
-    Load ForecastBench v1 questions with equal distribution across all sources.
+    Stream ForecastBench v1 questions with equal distribution across all sources.
     
     Args:
         raw_problems: Ignored
         max_quest: Maximum questions to return
         seed: Random seed
+        per_cluster: Draw at most this many near-duplicate questions per cluster
+        shard_index: This worker's shard of the sample, 0-based
+        num_shards: Number of shards the sample is split into
     
     Returns:
-        Dict mapping problem_id to problem dict
+        Iterator over problem dicts
+    """
+    rows = _select_rows(sources=list(ALL_SOURCES))
+    return materialize(_sample_shard(
+        _load_dataset(), rows, max_quest, seed, shard_index, num_shards, _cluster_labels(per_cluster), per_cluster))
+
+
+@ProblemLoader.register("forecastbench_v1_window", uses_raw_problems=False, streaming=True, shardable=True)
+def iter_time_window(
+    raw_problems: List[Dict],
+    testing_start: TimeBound = None,
+    testing_end: TimeBound = None,
+    end_start: TimeBound = None,
+    end_end: TimeBound = None,
+    max_quest: Optional[int] = None,
+    seed: int = 42,
+    sources: Optional[List[str]] = None,
+    horizons: Optional[List[str]] = None,
+    question_sets: Optional[List[str]] = None,
+    per_cluster: Optional[int] = None,
+    shard_index: int = 0,
+    num_shards: int = 1,
+    **kwargs
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream ForecastBench v1 questions whose time_testing (and time_end) fall in a window.
+
+    Windows are half-open, [start, end), with None leaving a side open, and
+    are answered from sorted indexes built once per prepared dataset, so
+    many windows over one dataset cost a binary search each rather than a
+    full load. "Frozen before X" is `testing_end=X`.
+
+    Args:
+        raw_problems: Ignored
+        testing_start: Earliest time_testing, inclusive (ISO date/datetime or epoch seconds)
+        testing_end: Latest time_testing, exclusive
+        end_start: Earliest time_end (resolution date), inclusive
+        end_end: Latest time_end, exclusive
+        max_quest: Stratified sample size (None = every question in the window)
+        seed: Random seed for the sample
+        sources: List of sources to include (None = all)
+        horizons: List of horizon groups to include (None = all)
+        question_sets: List of question set files to include (None = all)
+        per_cluster: With `max_quest`, draw at most this many near-duplicate questions per cluster
+        shard_index: This worker's shard of the result, 0-based
+        num_shards: Number of shards the result is split into
+
+    Returns:
+        Iterator over problem dicts; in time_testing order when not sampled
     """
-    problems = _load_and_prepare_all()
-    return _stratified_sample(problems, max_quest, seed, sources=list(ALL_SOURCES))
+    dataset = _load_dataset()
+    rows = _window_rows(dataset, testing_start, testing_end, end_start, end_end,
+                        sources, horizons, question_sets)
+    if max_quest is None:
+        selected = _shard_rows(dataset, rows, shard_index, num_shards)
+    else:
+        selected = _sample_shard(dataset, np.sort(rows), max_quest, seed, shard_index, num_shards,
+                                 _cluster_labels(per_cluster), per_cluster)
+    return materialize(selected)
+
+
+def load_forecastbench_v1(raw_problems: List[Dict], **kwargs) -> Dict[str, Any]:
+    """Dict-returning form of `iter_forecastbench_v1`."""
+    return to_problem_dict(iter_forecastbench_v1(raw_problems, **kwargs))
+
+
+def load_by_source(raw_problems: List[Dict], source: str, **kwargs) -> Dict[str, Any]:
+    """Dict-returning form of `iter_by_source`."""
+    return to_problem_dict(iter_by_source(raw_problems, source, **kwargs))
+
+
+def load_extensive(raw_problems: List[Dict], **kwargs) -> Dict[str, Any]:
+    """Dict-returning form of `iter_extensive`."""
+    return to_problem_dict(iter_extensive(raw_problems, **kwargs))
+
+
+def load_time_window(raw_problems: List[Dict], **kwargs) -> Dict[str, Any]:
+    """Dict-returning form of `iter_time_window`."""
+    return to_problem_dict(iter_time_window(raw_problems, **kwargs))
 
 
 def get_horizon_summary(problems: Dict[str, Dict]) -> Dict[str, Dict[str, int]]:
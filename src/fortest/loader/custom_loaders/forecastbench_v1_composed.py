@@ -0,0 +1,276 @@
+"""
+ForecastBench v1 Composed-Question Loader
+
+Composed questions ask for the probability that two single questions from
+the same question set both resolve in a given direction. Their
+resolutions live in `y_compose_resolved.json`, with a compound id made of
+the two component ids joined by '_'. Components are found with a binary
+search over the sorted (question set, id) keys of the prepared single
+questions. Component ids may themselves contain '_', so every split point
+of the compound id is tried. Both components must come from the same
+source, so a composed row is sampled in its source's stratum exactly like
+a single question.
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+
+import numpy as np
+
+from fortest.loader.loader import ProblemLoader, materialize, to_problem_dict
+from fortest.loader.dedup import near_duplicate_clusters
+from fortest.loader.snapshot import META_FILE
+from fortest.loader.timecols import NAT, bucketize, to_epoch_days
+from fortest.loader.custom_loaders.forecastbench_v1 import (
+    _DATASET_CACHE,
+    _Dataset,
+    _HORIZON_EDGES,
+    _HORIZON_GROUP_LABELS,
+    _column,
+    _load_dataset,
+    _make_dataset,
+    _raw_data_paths,
+    _sample_shard,
+    _snapshot_path,
+)
+
+logger = logging.getLogger(__name__)
+
+_COMPOSED_QUESTION = (
+    "We are presenting you with two probability questions. "
+    "Please predict the probability that both of the following are true:\n"
+    "1. {first}\n"
+    "2. {second}"
+)
+
+
+def _composed_paths():
+    """Paths of the composed X (optional) and y JSON files."""
+    data_dir = _raw_data_paths()[0].parent
+    return data_dir / "X_compose_resolved.json", data_dir / "y_compose_resolved.json"
+
+
+def _load_composed_raw() -> Tuple[Dict[str, Dict], List[Dict]]:
+    """Composed question texts by id (empty if X_compose is absent) and composed resolutions."""
+    x_path, y_path = _composed_paths()
+    with open(y_path) as f:
+        y_data = json.load(f)['resolutions']
+    questions = {}
+    if x_path.exists():
+        with open(x_path) as f:
+            questions = {q['id']: q for q in json.load(f).get('questions', []) if isinstance(q.get('id'), str)}
+    return questions, y_data
+
+
+# Joins question set and id into one sortable key; never part of either
+_KEY_SEP = "\x1f"
+
+
+def _row_lookup(keys: np.ndarray):
+    """Vectorized `key -> row id` over non-empty `keys` (-1 if absent); the last row wins for repeated keys."""
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    def lookup(wanted: np.ndarray) -> np.ndarray:
+        pos = np.maximum(np.searchsorted(sorted_keys, wanted, side="right") - 1, 0)
+        return np.where(sorted_keys[pos] == wanted, order[pos], -1)
+
+    return lookup
+
+
+def _match_components(
+    single_sets: np.ndarray,
+    single_ids: np.ndarray,
+    composed_sets: np.ndarray,
+    composed_ids: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Row ids of the two components of each composed id (-1 where either is unknown).
+
+    Split points are tried left to right, one vectorized lookup per split
+    depth over the ids not matched yet; the first split where both sides
+    are single questions of the same set wins.
+    """
+    lookup = _row_lookup(np.strings.add(np.strings.add(single_sets, _KEY_SEP), single_ids))
+    left_row = np.full(len(composed_ids), -1, dtype=np.int64)
+    right_row = np.full(len(composed_ids), -1, dtype=np.int64)
+
+    prefix = np.strings.add(composed_sets, _KEY_SEP)
+    head, sep, rest = np.strings.partition(composed_ids, "_")
+    pending = np.flatnonzero(sep != "")
+    prefix, head, rest = prefix[pending], head[pending], rest[pending]
+    while len(pending):
+        left = lookup(np.strings.add(prefix, head))
+        right = lookup(np.strings.add(prefix, rest))
+        hit = (left >= 0) & (right >= 0)
+        left_row[pending[hit]] = left[hit]
+        right_row[pending[hit]] = right[hit]
+        # Move the split point one '_' to the right for the rest
+        part, sep, rest = np.strings.partition(rest, "_")
+        more = ~hit & (sep != "")
+        pending, prefix, rest = pending[more], prefix[more], rest[more]
+        head = np.strings.add(np.strings.add(head[more], "_"), part[more])
+    return left_row, right_row
+
+
+def _render_part(question: str, direction: int) -> str:
+    answer = "Yes" if direction == 1 else "No"
+    return f"The answer to \"{question}\" is {answer}."
+
+
+def _prepare_composed() -> Tuple[Dict[str, Any], ...]:
+    """Join composed resolutions to their component single questions."""
+    dataset = _load_dataset()
+    singles = dataset.problems
+    x_compose, y_compose = _load_composed_raw()
+
+    records = [r for r in y_compose
+               if isinstance(r.get('id'), str) and r.get('direction') and len(r['direction']) == 2]
+    if not singles or not records:
+        return ()
+    original_ids = _column(singles, 'original_id', metadata=True)
+    left, right = _match_components(
+        np.array([str(qs) for qs in _column(singles, 'question_set', metadata=True)], dtype=str),
+        np.array([str(i) for i in original_ids], dtype=str),
+        np.array([str(r.get('question_set')) for r in records], dtype=str),
+        np.array([r['id'] for r in records], dtype=str),
+    )
+    found = np.flatnonzero(left >= 0)
+    if len(found) < len(y_compose):
+        logger.info(f"Skipped {len(y_compose) - len(found)} composed questions without resolved components")
+    # A pair spanning two sources has no single-loader stratum to sample it in
+    same_source = dataset.source_code[left[found]] == dataset.source_code[right[found]]
+    if not same_source.all():
+        logger.info(f"Skipped {int((~same_source).sum())} composed questions whose components differ in source")
+    found = found[same_source]
+    if not len(found):
+        return ()
+    matched = [records[k] for k in found.tolist()]
+    left, right = left[found], right[found]
+
+    # Column-wise date arithmetic over all matched rows at once; a missing
+    # or unparseable start or resolution date gives no horizon
+    single_start = dataset.start_day
+    start_days = np.minimum(single_start[left], single_start[right])
+    end_days = to_epoch_days([r.get('resolution_date') for r in matched])
+    valid = (start_days != NAT) & (end_days != NAT)
+    horizon_days = np.where(valid, end_days - start_days, 0)
+    horizon_code = bucketize(horizon_days, _HORIZON_EDGES)
+    keep = np.flatnonzero(horizon_days > 0)
+    left, right = left[keep], right[keep]
+    start_left = single_start[left] <= single_start[right]
+    # Earliest freeze of the two, by epoch seconds, so neither component leaks
+    # later information; a missing freeze never wins over a present one
+    testing = dataset.testing_index.times
+    testing_left = (testing[right] == NAT) | ((testing[left] != NAT) & (testing[left] <= testing[right]))
+
+    # Component fields gathered from the single-question columns
+    source_names = np.array(dataset.sources, dtype=object)[dataset.source_code]
+    original_ids = np.array(original_ids, dtype=object)
+    questions = np.array(_column(singles, 'question'), dtype=object)
+    time_start = np.array(_column(singles, 'time_start'), dtype=object)
+    time_testing = np.array(_column(singles, 'time_testing'), dtype=object)
+    src_a = source_names[left]
+    id_a, id_b = original_ids[left], original_ids[right]
+    q_a, q_b = questions[left], questions[right]
+    starts = np.where(start_left, time_start[left], time_start[right])
+    freezes = np.where(testing_left, time_testing[left], time_testing[right])
+    labels = _HORIZON_GROUP_LABELS
+    time_now = datetime.now().isoformat()
+
+    problems = []
+    for j, k in enumerate(keep.tolist()):
+        r = matched[k]
+        source = src_a[j]
+        d1, d2 = r['direction']
+        composed_q = x_compose.get(r['id'], {})
+        question = composed_q.get('question') or _COMPOSED_QUESTION.format(
+            first=_render_part(q_a[j], d1), second=_render_part(q_b[j], d2))
+        # Tuples, so problems handed out by `materialize` share nothing mutable with the cache
+        problems.append({
+            "problem_id": f"fbv1c_{source}_{r['id']}",
+            "question": question,
+            "time_start": starts[j],
+            "time_end": r['resolution_date'],
+            "resolved_flag": True,
+            "resolution_status": r.get('resolved_to'),
+            "metadata": {
+                "source": source,
+                "horizon": labels[horizon_code[k]],
+                "horizon_days": int(horizon_days[k]),
+                "original_id": r['id'],
+                "question_set": r['question_set'],
+                "direction": (d1, d2),
+                "component_ids": (id_a[j], id_b[j]),
+                "component_problem_ids": (f"fbv1_{source}_{id_a[j]}", f"fbv1_{source}_{id_b[j]}"),
+                "sub_questions": (q_a[j], q_b[j]),
+            },
+            "time_now": time_now,
+            "time_testing": freezes[j],
+        })
+    return tuple(problems)
+
+
+def _composed_dataset_paths() -> List:
+    """Files the composed dataset is derived from."""
+    return [*_raw_data_paths(), _snapshot_path() / META_FILE, *_composed_paths()]
+
+
+def _load_composed_dataset() -> _Dataset:
+    """Composed problems with their index and sampling codes, memoized per process."""
+
+    def build() -> _Dataset:
+        problems = _prepare_composed()
+        return _make_dataset(problems)
+
+    return _DATASET_CACHE.get("forecastbench_v1_composed", _composed_dataset_paths(), build)
+
+
+def _composed_cluster_labels(per_cluster: Optional[int]) -> Optional[np.ndarray]:
+    """Near-duplicate cluster label per composed row when a per-cluster cap is requested."""
+    if per_cluster is None:
+        return None
+    return _DATASET_CACHE.get(
+        "forecastbench_v1_composed_clusters", _composed_dataset_paths(),
+        lambda: near_duplicate_clusters(_column(_load_composed_dataset().problems, 'question')))
+
+
+@ProblemLoader.register("forecastbench_v1_composed", uses_raw_problems=False, streaming=True, shardable=True)
+def iter_composed(
+    raw_problems: List[Dict],
+    max_quest: int = 200,
+    seed: int = 42,
+    sources: Optional[List[str]] = None,
+    horizons: Optional[List[str]] = None,
+    per_cluster: Optional[int] = None,
+    shard_index: int = 0,
+    num_shards: int = 1,
+    **kwargs
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream ForecastBench v1 composed (two-question) resolved problems.
+
+    Args:
+        raw_problems: Ignored (loads from ForecastBench_v1 files)
+        max_quest: Maximum questions to return (default 200)
+        seed: Random seed for reproducibility
+        sources: List of sources to include (None = all)
+        horizons: List of horizon groups to include (None = all)
+        per_cluster: Draw at most this many near-duplicate questions per cluster
+        shard_index: This worker's shard of the sample, 0-based
+        num_shards: Number of shards the sample is split into
+
+    Returns:
+        Iterator over problem dicts
+    """
+    dataset = _load_composed_dataset()
+    rows = dataset.index.select(source=sources or None, horizon=horizons or None)
+    return materialize(_sample_shard(
+        dataset, rows, max_quest, seed, shard_index, num_shards, _composed_cluster_labels(per_cluster), per_cluster))
+
+
+def load_composed(raw_problems: List[Dict], **kwargs) -> Dict[str, Any]:
+    """Dict-returning form of `iter_composed`."""
+    return to_problem_dict(iter_composed(raw_problems, **kwargs))
@@ -0,0 +1,180 @@
+"""
+Keyword-filtered loading over question text.
+
+`load_by_keywords` answers boolean keyword queries (see
+`fortest.loader.textindex`) against the question, background and
+resolution criteria of one corpus:
+
+- `forecastbench_v1`: the ForecastBench_v1 resolved single questions
+  (templatized data-source questions and market questions)
+- `forecastbench`: the legacy ForecastBench question sets
+- `templatized`: the ForecastBench templatized catalogue (question
+  template, background and resolution criteria); matching templates are
+  turned into rolling-origin backtest problems (see `templatized_backtest`)
+- `problems`: the problems database handed to every loader
+
+Each corpus keeps one inverted index per fingerprint of its source
+files, saved next to its data, so a query only decodes the posting lists
+of its keywords and builds the matching problems.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Iterator, Sequence, Tuple, Union
+
+import numpy as np
+
+from fortest.loader.loader import ProblemLoader, materialize, process_problems, to_problem_dict
+from fortest.loader.sharding import shard_filter
+from fortest.loader.snapshot import META_FILE
+from fortest.loader.textindex import KeywordIndex, cached_keyword_index
+from fortest.loader.custom_loaders import forecastbench, forecastbench_v1, templatized_backtest
+from fortest.problems.ForecastBenchTemplatized.resolver import DEFAULT_TEMPLATES_PATH, TemplateLoader
+
+# File name suffix of a persisted keyword index, next to the corpus it covers
+INDEX_SUFFIX = ".keywords.npz"
+
+# Indexed text fields; the first is the question text of the corpus
+_TEXT_FIELDS = ("question", "background", "resolution_criteria")
+_TEMPLATE_TEXT_FIELDS = ("question_template", "background", "resolution_criteria")
+
+
+def _text_columns(problems: Iterable[Dict]) -> Dict[str, List[Optional[str]]]:
+    """Indexed text fields of problems, in row order, read in one pass."""
+    columns = {field: [] for field in _TEXT_FIELDS}
+    for p in problems:
+        metadata = p.get("metadata") or {}
+        columns["question"].append(p.get("question"))
+        columns["background"].append(metadata.get("background"))
+        columns["resolution_criteria"].append(metadata.get("resolution_criteria"))
+    return columns
+
+
+def _v1_index() -> Tuple[forecastbench_v1._Dataset, KeywordIndex]:
+    """Prepared v1 dataset and its keyword index."""
+    dataset = forecastbench_v1._load_dataset()
+    paths = [*forecastbench_v1._raw_data_paths(), forecastbench_v1._snapshot_path() / META_FILE]
+    index_path = forecastbench_v1._get_data_dir() / f"single_resolved{INDEX_SUFFIX}"
+    index = cached_keyword_index(
+        "forecastbench_v1", paths, index_path, lambda: _text_columns(dataset.problems), len(dataset.problems))
+    return dataset, index
+
+
+def _legacy_paths() -> List[str]:
+    """Question/resolution set files and snapshot metadata the legacy problems come from."""
+    target = forecastbench.get_target_dir()
+    paths = [os.path.join(target, "datasets", rel) for rel, _, _ in forecastbench._tree_fingerprint(target)]
+    return [*paths, str(forecastbench._snapshot_path(target) / META_FILE)]
+
+
+def _legacy_index() -> KeywordIndex:
+    """Keyword index over every legacy ForecastBench problem, in load order."""
+    forecastbench.ensure_forecastbench_data(preprocess=False)
+    paths = _legacy_paths()
+    index_path = Path(forecastbench.get_target_dir()) / f"forecastbench{INDEX_SUFFIX}"
+    return cached_keyword_index(
+        "forecastbench", paths, index_path, lambda: forecastbench._text_columns(list(_TEXT_FIELDS))[0])
+
+
+def _templatized_index(templates_path: Path) -> KeywordIndex:
+    """Keyword index over the templates of a catalogue, by catalogue position."""
+
+    def texts() -> Dict[str, List[str]]:
+        templates = TemplateLoader(str(templates_path)).templates
+        return {field: [getattr(t, field) for t in templates] for field in _TEMPLATE_TEXT_FIELDS}
+
+    index_path = templates_path.with_suffix(INDEX_SUFFIX)
+    return cached_keyword_index(str(templates_path), [templates_path], index_path, texts)
+
+
+def _db_index(raw_problems) -> KeywordIndex:
+    """Keyword index over the problems database."""
+    db_path = raw_problems.db_path
+    index_path = Path(db_path).with_suffix(INDEX_SUFFIX)
+    return cached_keyword_index(db_path, [db_path], index_path, lambda: _text_columns(raw_problems), len(raw_problems))
+
+
+def _matches(problem: Dict, sources: Optional[List[str]], horizons: Optional[List[str]]) -> bool:
+    metadata = problem.get("metadata") or {}
+    return (not sources or metadata.get("source") in sources) and \
+        (not horizons or metadata.get("horizon") in horizons)
+
+
+@ProblemLoader.register("load_by_keywords", streaming=True, shardable=True)
+def iter_by_keywords(
+    raw_problems,
+    query: Union[str, Sequence[str]],
+    dataset: str = "forecastbench_v1",
+    sources: Optional[List[str]] = None,
+    horizons: Optional[List[str]] = None,
+    max_quest: Optional[int] = None,
+    seed: int = 42,
+    time_testing: str = None,
+    time_now: str = None,
+    templates_path: Optional[str] = None,
+    shard_index: int = 0,
+    num_shards: int = 1,
+    **kwargs
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream problems whose question, background or resolution criteria match a keyword query.
+
+    Args:
+        raw_problems: Problems database (used when dataset='problems')
+        query: Boolean query such as 'fed AND (rates OR inflation)' or '"S&P 500"';
+               a list of queries matches problems satisfying any of them
+        dataset: Corpus to search: 'forecastbench_v1', 'forecastbench', 'templatized' or 'problems'
+        sources: Sources to include (None = all)
+        horizons: Horizon groups to include (None = all; only v1 and templatized problems have horizons)
+        max_quest: Stratified sample size for forecastbench_v1 (None = every match)
+        seed: Random seed for the sample
+        time_testing: Testing time for 'problems' (default: each problem's time_start)
+        time_now: Shared time_now
+        templates_path: templates.json searched when dataset='templatized' (default: the bundled catalogue)
+        shard_index: This worker's shard, 0-based
+        num_shards: Number of shards the result is split into
+        **kwargs: For 'templatized', the backtest arguments of `templatized_backtest`
+                  (start, end, store or resolver, ...); its horizons in days are `horizon_days`
+
+    Returns:
+        Iterator over problem dicts, in dataset order
+    """
+    if dataset == "forecastbench_v1":
+        data, index = _v1_index()
+        rows = index.query(query)
+        if sources or horizons:
+            selected = data.index.select(source=sources or None, horizon=horizons or None)
+            rows = np.intersect1d(rows, selected, assume_unique=True)
+        if max_quest is None:
+            matched = forecastbench_v1._shard_rows(data, rows, shard_index, num_shards)
+        else:
+            matched = forecastbench_v1._sample_shard(data, rows, max_quest, seed, shard_index, num_shards)
+        return materialize(matched, time_now)
+
+    if dataset == "forecastbench":
+        rows = _legacy_index().query(query).tolist()
+        matched = forecastbench._iter_rows(rows, shard_index, num_shards, time_now)
+        return (p for p in matched if _matches(p, sources, horizons))
+
+    if dataset == "templatized":
+        path = Path(templates_path) if templates_path else DEFAULT_TEMPLATES_PATH
+        rows = _templatized_index(path).query(query).tolist()
+        if "horizon_days" in kwargs:
+            kwargs["horizons"] = kwargs.pop("horizon_days")
+        problems = templatized_backtest.iter_templatized_backtest(
+            None, sources=sources, templates_path=str(path), templates=rows, time_now=time_now, **kwargs)
+        matched = (p for p in problems if _matches(p, None, horizons))
+        return shard_filter(matched, shard_index, num_shards)
+
+    if dataset == "problems":
+        index = _db_index(raw_problems)
+        matched = (p for p in (raw_problems[i] for i in index.query(query).tolist()) if _matches(p, sources, horizons))
+        return process_problems(shard_filter(matched, shard_index, num_shards), time_testing, time_now)
+
+    raise ValueError(f"Unknown keyword dataset: {dataset}. "
+                     f"Available: ['forecastbench_v1', 'forecastbench', 'templatized', 'problems']")
+
+
+def load_by_keywords(raw_problems, query: Union[str, Sequence[str]], **kwargs) -> Dict[str, Any]:
+    """Dict-returning form of `iter_by_keywords`."""
+    return to_problem_dict(iter_by_keywords(raw_problems, query, **kwargs))
@@ -0,0 +1,171 @@
+"""
+Rolling-origin backtests over the ForecastBench templatized catalogue.
+
+Every selected template is resolved at each forecast origin (`start` to
+`end` every `step_days` days) for each horizon, giving one problem per
+(template, origin, horizon). Problems are produced template by template:
+each template's whole origin x horizon grid goes to the resolver in one
+`resolve_many` call. Overlapping windows (a resolution date that is also
+a later origin, or shared by several origin/horizon pairs) therefore
+share their value fetches. Grid-aware resolvers such as
+`StoreBackedResolver` read each series once per backtest; per-date
+resolvers can deduplicate through `FetchCacheMixin`.
+
+Only one chunk of templates is resolved at a time, so the cross product
+is never held in memory; with `workers > 1` chunks are resolved in a
+process pool and still yielded in catalogue order (see
+`ForecastBenchTemplatized.pipeline`).
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from fortest.loader.loader import ProblemLoader, to_problem_dict
+from fortest.loader.custom_loaders.forecastbench_v1 import HorizonGroup
+from fortest.problems.ForecastBenchTemplatized.pipeline import _chunks, iter_dataset_chunks
+from fortest.problems.ForecastBenchTemplatized.resolver import (
+    BaseResolver,
+    ResolvedQuestion,
+    StoreBackedResolver,
+    TemplatedQuestion,
+    TemplateLoader,
+    date_grid,
+    rolling_origins,
+)
+
+DEFAULT_HORIZONS = (7, 30, 90, 180, 365)
+
+
+def _problem_id(resolved: ResolvedQuestion, position: int, horizon_days: int) -> str:
+    # Template ids need not be unique, so the catalogue position tells templates apart
+    return f"fbt_{resolved.source}_{resolved.id}_t{position}_{resolved.forecast_due_date}_{horizon_days}d"
+
+
+def _catalogue(
+    loader: TemplateLoader,
+    sources: Optional[List[str]],
+    positions: Optional[Sequence[int]] = None,
+) -> List[Tuple[int, TemplatedQuestion]]:
+    """(catalogue position, template) of the templates at `positions` (all if None) of the given sources."""
+    wanted = set(sources) if sources else None
+    templates = loader.templates
+    positions = range(len(templates)) if positions is None else sorted(set(positions))
+    return [(i, templates[i]) for i in positions if wanted is None or templates[i].source in wanted]
+
+
+def _iter_problems(
+    loader: TemplateLoader,
+    selected: List[Tuple[int, TemplatedQuestion]],
+    resolver: BaseResolver,
+    grid: List,
+    horizon_days: List[int],
+    include_unresolved: bool,
+    time_now: str,
+    workers: int,
+    chunk_size: int,
+) -> Iterator[Dict[str, Any]]:
+    chunks = iter_dataset_chunks(loader, resolver, date_pairs=grid, workers=workers, chunk_size=chunk_size,
+                                 templates=[t for _, t in selected])
+    # The same template chunks the pipeline resolves, matched by position
+    template_chunks = _chunks(selected, chunk_size)
+    labels = [HorizonGroup.from_days(h).label for h in horizon_days]
+    for chunk, templates in zip(chunks, template_chunks):
+        # Template-major: each template's results follow the grid order
+        for k, (position, template) in enumerate(templates):
+            block = chunk[k * len(grid):(k + 1) * len(grid)]
+            backgrounds = template.render_many(grid, field='background')
+            criteria = template.render_many(grid, field='resolution_criteria')
+            for i, resolved in enumerate(block):
+                if resolved.resolved_to is None and not include_unresolved:
+                    continue
+                yield {
+                    "problem_id": _problem_id(resolved, position, horizon_days[i]),
+                    "question": resolved.question,
+                    "time_start": resolved.forecast_due_date,
+                    "time_end": resolved.resolution_date,
+                    "resolved_flag": resolved.resolved_to is not None,
+                    "resolution_status": resolved.resolved_to,
+                    "metadata": {
+                        "source": resolved.source,
+                        "horizon": labels[i],
+                        "horizon_days": horizon_days[i],
+                        "original_id": resolved.id,
+                        "template_index": position,
+                        "origin": resolved.forecast_due_date,
+                        "background": backgrounds[i],
+                        "resolution_criteria": criteria[i],
+                        "url": template.url,
+                        "resolution_value": resolved.resolution_value,
+                    },
+                    "time_now": time_now,
+                    # The forecaster sits at the origin
+                    "time_testing": resolved.forecast_due_date,
+                }
+
+
+@ProblemLoader.register("templatized_backtest", uses_raw_problems=False, streaming=True)
+def iter_templatized_backtest(
+    raw_problems,
+    start: str,
+    end: str,
+    step_days: int = 7,
+    horizons: Sequence[int] = DEFAULT_HORIZONS,
+    sources: Optional[List[str]] = None,
+    resolver: Optional[BaseResolver] = None,
+    store: Optional[str] = None,
+    max_staleness_days: Optional[int] = None,
+    templates_path: Optional[str] = None,
+    templates: Optional[Sequence[int]] = None,
+    include_unresolved: bool = False,
+    workers: int = 1,
+    chunk_size: int = 64,
+    time_now: Optional[str] = None,
+    **kwargs
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream rolling-origin backtest problems from the templatized catalogue.
+
+    Args:
+        raw_problems: Ignored
+        start: First forecast origin (YYYY-MM-DD)
+        end: Last possible origin (YYYY-MM-DD)
+        step_days: Days between origins
+        horizons: Distinct horizons in days; each origin is resolved at origin + horizon
+        sources: Template sources to include (None = all)
+        resolver: Resolver to use (picklable when workers > 1)
+        store: Alternatively, path of a SeriesStore for a StoreBackedResolver;
+               dates past a series' last observation stay unresolved
+        max_staleness_days: With `store`, oldest observation (in days) a date may resolve from
+        templates_path: templates.json to load (default: the bundled catalogue)
+        templates: Catalogue positions of the templates to include (None = all)
+        include_unresolved: Also yield problems the resolver could not resolve
+        workers: Worker processes resolving template chunks
+        chunk_size: Templates resolved per chunk
+        time_now: Shared time_now (default: now)
+
+    Returns:
+        Iterator over problem dicts, template-major, then origin, then horizon
+    """
+    if (resolver is None) == (store is None):
+        raise ValueError("Pass exactly one of resolver or store")
+    if resolver is None:
+        resolver = StoreBackedResolver(store, max_staleness_days)
+    horizons = [int(h) for h in horizons]
+    if not horizons or min(horizons) < 1:
+        raise ValueError(f"Horizons must be positive day counts, got {horizons}")
+    if len(set(horizons)) < len(horizons):
+        raise ValueError(f"Horizons must be distinct, got {horizons}")
+
+    origins = rolling_origins(start, end, step_days)
+    grid = date_grid(origins, horizons=horizons)
+    horizon_days = [h for _ in origins for h in horizons]
+    if not grid:
+        return iter(())
+    loader = TemplateLoader(templates_path)
+    return _iter_problems(loader, _catalogue(loader, sources, templates), resolver, grid, horizon_days, include_unresolved,
+                          time_now or datetime.now().isoformat(), workers, chunk_size)
+
+
+def load_templatized_backtest(raw_problems, **kwargs) -> Dict[str, Any]:
+    """Dict-returning form of `iter_templatized_backtest`."""
+    return to_problem_dict(iter_templatized_backtest(raw_problems, **kwargs))
@@ -0,0 +1,214 @@
+"""
+Near-duplicate clustering of question text with MinHash and LSH banding.
+
+Templatized questions differ only in their dates and numbers ("Will the
+FRED series X be higher on 2024-08-01 than on 2024-07-21?"). To group
+them, each question is normalized (lowercased, with dates and years
+collapsed to one placeholder) and cut into word shingles, and a MinHash
+signature estimates the Jaccard similarity of its shingle set with every
+other question's.
+
+Signatures are split into bands. Questions whose signatures agree on all
+the rows of at least one band land in the same bucket. With `bands` bands
+of `rows` rows, pairs above a Jaccard similarity of roughly
+(1 / bands) ** (1 / rows) usually share a bucket. Bucket members whose
+estimated similarity to the bucket's first member passes a threshold are
+merged transitively into clusters. Questions are never compared
+pairwise. All hashing and bucketing runs on NumPy arrays, in row chunks
+of bounded size.
+"""
+
+import re
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+_MONTH = (r"(?:january|february|march|april|may|june|july|august|september|october|november|december"
+          r"|jan|feb|mar|apr|jun|jul|aug|sept|sep|oct|nov|dec)\.?")
+_DAY = r"\d{1,2}(?:st|nd|rd|th)?"
+_YEAR = r"(?:19|20)\d{2}"
+_DATE_RE = re.compile(
+    r"\b\d{4}-\d{2}-\d{2}(?:[t ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:z|[+-]\d{2}:?\d{2})?)?\b"
+    r"|\b\d{1,2}/\d{1,2}/\d{2,4}\b"
+    rf"|\b{_DAY}\s+{_MONTH}(?:,?\s+{_YEAR})?\b"
+    rf"|\b{_MONTH}\s+{_DAY}(?:,?\s+{_YEAR})?\b"
+    rf"|\b{_MONTH},?\s+{_YEAR}\b"
+    rf"|\b{_YEAR}\b"
+)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Signature value of rows without shingles (empty text)
+_EMPTY = np.iinfo(np.uint32).max
+
+# Shingles hashed per chunk, bounding the (shingles x permutations) work array
+_CHUNK_SHINGLES = 1 << 16
+
+
+def normalize(text: Optional[str]) -> List[str]:
+    """Lowercased word tokens with every date (ISO, m/d/y, month-name, bare year) collapsed to 'date'."""
+    if not text:
+        return []
+    return _WORD_RE.findall(_DATE_RE.sub(" date ", text.lower()))
+
+
+def _token_hashes(token_lists: List[List[str]]):
+    """Flat uint64 hashes of every row's tokens, concatenated, plus the token count per row."""
+    vocab: Dict[str, int] = {}
+    ids = [vocab.setdefault(t, len(vocab)) for tokens in token_lists for t in tokens]
+    table = np.array([int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=4).digest(), "little")
+                      for t in vocab], dtype=np.uint64)
+    lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(token_lists))
+    return table[np.array(ids, dtype=np.int64)] if ids else np.empty(0, dtype=np.uint64), lengths
+
+
+def _shingle_hashes(tokens: np.ndarray, lengths: np.ndarray, shingle_size: int):
+    """32-bit hashes of the word k-grams starting at each token; k-grams running past a row's end are padded."""
+    n_rows = len(lengths)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+    row = np.repeat(np.arange(n_rows, dtype=np.int64), lengths)
+    pos = np.arange(len(tokens), dtype=np.int64) - starts[row]
+    shingles = np.zeros(len(tokens), dtype=np.uint64)
+    for offset in range(shingle_size):
+        # Positions past the end of the row read a fixed pad token
+        inside = pos + offset < lengths[row]
+        nxt = np.where(inside, tokens[np.minimum(np.arange(len(tokens)) + offset, len(tokens) - 1)], np.uint64(0x9E37))
+        shingles = shingles * np.uint64(0x100000001B3) ^ nxt
+    return (shingles >> np.uint64(16)) & np.uint64(0xFFFFFFFF)
+
+
+def minhash_signatures(
+    texts: Iterable[Optional[str]],
+    num_perm: int = 64,
+    shingle_size: int = 3,
+    seed: int = 1,
+) -> np.ndarray:
+    """
+    MinHash signatures of normalized texts.
+
+    Each of the `num_perm` hash functions is a multiply-shift hash
+    ((a * x + b) mod 2**64) >> 32 with random odd `a`; a row's signature
+    holds the minimum of each function over its shingles.
+
+    Args:
+        texts: Question texts (None allowed)
+        num_perm: Signature length
+        shingle_size: Words per shingle
+        seed: Seed for the hash functions; signatures are comparable only under one seed
+
+    Returns:
+        uint32 array (n_rows, num_perm); rows without text are all `2**32 - 1`
+    """
+    tokens, lengths = _token_hashes([normalize(t) for t in texts])
+    shingles = _shingle_hashes(tokens, lengths, shingle_size)
+    n_rows = len(lengths)
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+    signatures = np.full((n_rows, num_perm), _EMPTY, dtype=np.uint32)
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    row = 0
+    while row < n_rows:
+        # Whole rows per chunk, at least one
+        end = max(row + 1, int(np.searchsorted(bounds, bounds[row] + _CHUNK_SHINGLES, side="right")) - 1)
+        end = min(end, n_rows)
+        chunk_rows = np.flatnonzero(lengths[row:end]) + row
+        if len(chunk_rows):
+            values = shingles[bounds[row]:bounds[end], None] * a + b
+            values = (values >> np.uint64(32)).astype(np.uint32)
+            local = (bounds[chunk_rows] - bounds[row]).astype(np.int64)
+            signatures[chunk_rows] = np.minimum.reduceat(values, local, axis=0)
+        row = end
+    return signatures
+
+
+def _band_buckets(signatures: np.ndarray, bands: int) -> List[np.ndarray]:
+    """Per band, a bucket id per row (rows equal on that band share it)."""
+    rows_per_band = signatures.shape[1] // bands
+    buckets = []
+    for band in range(bands):
+        part = np.ascontiguousarray(signatures[:, band * rows_per_band:(band + 1) * rows_per_band])
+        keys = part.view(np.dtype((np.void, part.dtype.itemsize * rows_per_band))).ravel()
+        buckets.append(np.unique(keys, return_inverse=True)[1].ravel())
+    return buckets
+
+
+def _components(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Smallest node id of each node's connected component, by label propagation."""
+    labels = np.arange(n, dtype=np.int64)
+    while True:
+        previous = labels.copy()
+        np.minimum.at(labels, src, labels[dst])
+        np.minimum.at(labels, dst, labels[src])
+        # Pointer jumping: follow labels to their own labels
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def lsh_clusters(signatures: np.ndarray, bands: int = 8, threshold: float = 0.8) -> np.ndarray:
+    """
+    Cluster rows whose signatures collide in a band and are similar enough.
+
+    In every band, each row of a bucket is a candidate duplicate of the
+    bucket's first row; the pair is kept when their signatures agree in at
+    least `threshold` of their positions (the estimated Jaccard
+    similarity). Kept pairs are merged transitively. Checking against one
+    representative per bucket keeps the work linear in the number of rows
+    and stops chains of loosely related questions from merging.
+
+    Args:
+        signatures: uint32 MinHash signatures (n_rows, num_perm); num_perm divisible by `bands`
+        bands: Number of LSH bands
+        threshold: Minimum estimated Jaccard similarity of a merged pair
+
+    Returns:
+        int64 cluster label per row: the smallest row id in its cluster.
+        Rows without text are singletons.
+    """
+    n_rows, num_perm = signatures.shape
+    if num_perm % bands:
+        raise ValueError(f"Signature length {num_perm} is not divisible by bands={bands}")
+    labels = np.arange(n_rows, dtype=np.int64)
+    texted = np.flatnonzero((signatures != _EMPTY).any(axis=1))
+    if len(texted) < 2:
+        return labels
+
+    sigs = signatures[texted]
+    local = np.arange(len(texted), dtype=np.int64)
+    src, dst = [], []
+    for bucket in _band_buckets(sigs, bands):
+        first = np.full(int(bucket.max()) + 1, len(texted), dtype=np.int64)
+        np.minimum.at(first, bucket, local)
+        rep = first[bucket]
+        candidates = np.flatnonzero(rep != local)
+        agree = (sigs[candidates] == sigs[rep[candidates]]).mean(axis=1)
+        keep = candidates[agree >= threshold]
+        src.append(keep)
+        dst.append(rep[keep])
+    components = _components(len(texted), np.concatenate(src), np.concatenate(dst))
+    labels[texted] = texted[components]
+    return labels
+
+
+def near_duplicate_clusters(
+    texts: Iterable[Optional[str]],
+    num_perm: int = 64,
+    bands: int = 8,
+    threshold: float = 0.8,
+    shingle_size: int = 3,
+    seed: int = 1,
+) -> np.ndarray:
+    """
+    Near-duplicate cluster label per text (see module docstring).
+
+    The defaults (64 hashes in 8 bands of 8) make pairs above a Jaccard
+    similarity of about 0.77 candidates, and merge those estimated at 0.8
+    or more.
+
+    Returns:
+        int64 array; equal labels mean the same cluster
+    """
+    return lsh_clusters(minhash_signatures(texts, num_perm, shingle_size, seed), bands, threshold)
@@ -0,0 +1,190 @@
+"""
+Secondary indexes over prepared problem rows.
+
+A `PostingIndex` maps each (field, value) pair to the sorted array of row
+ids holding that value. Filters are answered by concatenating the postings
+of the requested values (disjoint within a field) and intersecting across
+fields, so a filtered load only touches matching rows.
+
+A `SortedTimeIndex` keeps row ids ordered by an epoch-seconds column, so a
+half-open time window is two binary searches plus a slice.
+
+Both also test an already selected set of rows against a filter in time
+proportional to that set (`mask`), so a window can be narrowed without
+scanning the other index's matches.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from fortest.loader.timecols import NAT, to_epoch_seconds
+
+
+def _group_rows(values: Sequence) -> Tuple[np.ndarray, Dict[Any, int], Dict[Any, np.ndarray]]:
+    """Per-row value codes, the code of each value, and sorted int64 row ids per value."""
+    codes_by_value: Dict[Any, int] = {}
+    codes = np.fromiter(
+        (codes_by_value.setdefault(v, len(codes_by_value)) for v in values),
+        dtype=np.int64, count=len(values),
+    )
+    order = np.argsort(codes, kind="stable")
+    bounds = np.cumsum(np.bincount(codes, minlength=len(codes_by_value)))[:-1]
+    groups = np.split(order, bounds)
+    return codes, codes_by_value, {v: groups[c] for v, c in codes_by_value.items()}
+
+
+class PostingIndex:
+    """Sorted row-id posting lists per field value, plus each row's value code."""
+
+    def __init__(
+        self,
+        n_rows: int,
+        postings: Dict[str, Dict[Any, np.ndarray]],
+        codes: Dict[str, Tuple[np.ndarray, Dict[Any, int]]],
+    ):
+        self.n_rows = n_rows
+        self._postings = postings
+        self._codes = codes
+
+    @classmethod
+    def build(cls, columns: Dict[str, Sequence]) -> "PostingIndex":
+        """
+        Build an index from equal-length columns of hashable values.
+
+        Args:
+            columns: Dict[field -> per-row values]
+        """
+        lengths = {len(v) for v in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Index columns have mismatched lengths: {sorted(lengths)}")
+        n_rows = lengths.pop() if lengths else 0
+        grouped = {field: _group_rows(values) for field, values in columns.items()}
+        return cls(
+            n_rows,
+            {field: postings for field, (_, _, postings) in grouped.items()},
+            {field: (codes, code_of) for field, (codes, code_of, _) in grouped.items()},
+        )
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._postings)
+
+    def values(self, field: str) -> List:
+        """Distinct values of a field."""
+        return list(self._postings[field])
+
+    def count(self, field: str, value) -> int:
+        """Number of rows holding `value`."""
+        return len(self._postings[field].get(value, ()))
+
+    def all_rows(self) -> np.ndarray:
+        return np.arange(self.n_rows, dtype=np.int64)
+
+    def rows(self, field: str, values: Iterable) -> np.ndarray:
+        """Sorted row ids whose `field` is any of `values`."""
+        postings = self._postings[field]
+        parts = [postings[v] for v in set(values) if v in postings]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+
+    def mask(self, rows: np.ndarray, field: str, values: Iterable) -> np.ndarray:
+        """Boolean mask of `rows` (any order) whose `field` is any of `values`, in O(len(rows))."""
+        codes, code_of = self._codes[field]
+        wanted = [code_of[v] for v in set(values) if v in code_of]
+        return np.isin(codes[rows], wanted)
+
+    def select(self, **filters) -> np.ndarray:
+        """
+        Sorted row ids matching every filter.
+
+        Args:
+            **filters: field=values filters; None means no constraint
+
+        Returns:
+            int64 array of row ids
+        """
+        result: Optional[np.ndarray] = None
+        parts = [self.rows(f, v) for f, v in filters.items() if v is not None]
+        for part in sorted(parts, key=len):
+            result = part if result is None else np.intersect1d(result, part, assume_unique=True)
+            if not len(result):
+                break
+        return self.all_rows() if result is None else result
+
+
+# A window bound: epoch seconds or an ISO date/datetime string
+TimeBound = Union[int, str, None]
+
+
+def _to_seconds(bound: TimeBound) -> Optional[int]:
+    """Epoch seconds of a window bound; ValueError if a string does not parse."""
+    if bound is None or isinstance(bound, (int, np.integer)):
+        return bound
+    seconds = int(to_epoch_seconds([bound])[0])
+    if seconds == NAT:
+        raise ValueError(f"Unparseable time bound: {bound!r}")
+    return seconds
+
+
+class SortedTimeIndex:
+    """Row ids sorted by an int64 epoch-seconds column; rows with a missing time are left out."""
+
+    def __init__(self, times: np.ndarray):
+        times = np.asarray(times, dtype=np.int64)
+        self.times = times
+        valid = np.flatnonzero(times != NAT)
+        order = np.argsort(times[valid], kind="stable")
+        self.n_rows = len(times)
+        self.order = valid[order]
+        self.keys = times[self.order]
+
+    @classmethod
+    def from_strings(cls, values: Iterable[Optional[str]]) -> "SortedTimeIndex":
+        """Build from ISO date/datetime strings (see `to_epoch_seconds`)."""
+        return cls(to_epoch_seconds(values))
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def bounds(self, low: TimeBound = None, high: TimeBound = None) -> tuple:
+        """Slice [start, end) of `order` covering times in [low, high)."""
+        low, high = _to_seconds(low), _to_seconds(high)
+        start = 0 if low is None else int(np.searchsorted(self.keys, low, side="left"))
+        end = len(self.keys) if high is None else int(np.searchsorted(self.keys, high, side="left"))
+        return start, max(start, end)
+
+    def window(self, low: TimeBound = None, high: TimeBound = None) -> np.ndarray:
+        """
+        Row ids whose time lies in [low, high), in time order (ties by row id).
+
+        Args:
+            low: Inclusive lower bound, epoch seconds or ISO string (None = open)
+            high: Exclusive upper bound, epoch seconds or ISO string (None = open)
+
+        Returns:
+            int64 array of row ids
+        """
+        start, end = self.bounds(low, high)
+        return self.order[start:end]
+
+    def mask(self, rows: np.ndarray, low: TimeBound = None, high: TimeBound = None) -> np.ndarray:
+        """Boolean mask of `rows` (any order) whose time lies in [low, high), in O(len(rows))."""
+        low, high = _to_seconds(low), _to_seconds(high)
+        times = self.times[rows]
+        keep = times != NAT
+        if low is not None:
+            keep &= times >= low
+        if high is not None:
+            keep &= times < high
+        return keep
+
+    def rows(self, low: TimeBound = None, high: TimeBound = None) -> np.ndarray:
+        """Sorted row ids whose time lies in [low, high), for intersecting with `PostingIndex`."""
+        return np.sort(self.window(low, high))
+
+    def count(self, low: TimeBound = None, high: TimeBound = None) -> int:
+        """Number of rows whose time lies in [low, high)."""
+        start, end = self.bounds(low, high)
+        return end - start
@@ -1,12 +1,46 @@
 import os
 import json
 import importlib
-import pkgutil
+from itertools import islice
+from collections.abc import Sequence
 from datetime import datetime
-from typing import Dict, List, Callable, Any
+from typing import Dict, List, Callable, Any, Optional, Iterable, Iterator, Union
+
+from fortest.registry import scan_registrations
+from fortest.loader.cache import FileCache
+from fortest.loader.sharding import check_shard, shard_filter
+
+# Parsed problems databases, keyed by path and invalidated on mtime/size change
+_RAW_CACHE = FileCache()
+
+
+class RawProblems(Sequence):
+    """Problems database that is parsed on first access and memoized per process."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def _parse(self):
+        with open(self.db_path, "r") as f:
+            return tuple(json.load(f))
+
+    def _problems(self):
+        return _RAW_CACHE.get(self.db_path, [self.db_path], self._parse)
+
+    def __len__(self) -> int:
+        return len(self._problems())
+
+    def __getitem__(self, i):
+        return self._problems()[i]
+
+    def __iter__(self):
+        return iter(self._problems())
+
 
 class ProblemLoader:
     _registry: Dict[str, Callable] = {}
+    # strategy name -> module defining it, built once per process
+    _manifest: Optional[Dict[str, str]] = None
 
     def __init__(self, db_path: str = None):
         if db_path is None:
@@ -17,44 +51,186 @@ class ProblemLoader:
         self._load_registry()
 
     def _load_registry(self):
-        """Automatically register loaders from the custom_loaders directory."""
-        import fortest.loader.custom_loaders as custom_loaders
-        path = custom_loaders.__path__
-        for loader, name, ispkg in pkgutil.iter_modules(path):
-            module = importlib.import_module(f"fortest.loader.custom_loaders.{name}")
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if callable(attr) and hasattr(attr, "_is_loader"):
-                    self._registry[attr._loader_name] = attr
+        """Record loaders in the custom_loaders directory without importing them (once per process)."""
+        if ProblemLoader._manifest is None:
+            import fortest.loader.custom_loaders as custom_loaders
+            ProblemLoader._manifest = scan_registrations(custom_loaders, "ProblemLoader")
 
     @classmethod
-    def register(cls, name: str):
-        """Decorator to register a custom loader function."""
+    def register(cls, name: str, uses_raw_problems: bool = True, streaming: bool = False, shardable: bool = False):
+        """
+        Decorator to register a custom loader function.
+
+        Loaders that read their own files should pass `uses_raw_problems=False`;
+        they then receive None instead of the problems database. Loaders that
+        yield processed problems one at a time instead of returning a dict
+        should pass `streaming=True`. Loaders that accept `shard_index` and
+        `num_shards` and drop other shards' problems before building them
+        should pass `shardable=True`; others are sharded after loading.
+        """
         def decorator(func):
             func._is_loader = True
             func._loader_name = name
+            func._uses_raw_problems = uses_raw_problems
+            func._streaming = streaming
+            func._shardable = shardable
+            cls._registry[name] = func
             return func
         return decorator
 
+    def _resolve(self, strategy: str) -> Callable:
+        """Return the loader for `strategy`, importing its module on first use."""
+        if strategy not in self._registry and strategy in self._manifest:
+            importlib.import_module(self._manifest[strategy])
+        if strategy not in self._registry:
+            raise ValueError(f"Loader strategy '{strategy}' not found. Available: {self.list_available_loaders()}")
+        return self._registry[strategy]
+
     def list_available_loaders(self) -> List[str]:
         """Returns a list of implemented custom loading functions."""
-        return list(self._registry.keys())
+        names = list(self._manifest)
+        names.extend(n for n in self._registry if n not in self._manifest)
+        return names
 
-    def load(self, strategy: str, **kwargs) -> Dict[str, Any]:
-        """Loads problems using the specified strategy."""
-        if strategy not in self._registry:
-            raise ValueError(f"Loader strategy '{strategy}' not found. Available: {self.list_available_loaders()}")
+    def iter_load(
+        self,
+        strategy: str,
+        batch_size: int = None,
+        shard_index: int = 0,
+        num_shards: int = 1,
+        **kwargs
+    ) -> Iterator[Union[Dict, List[Dict]]]:
+        """
+        Streams problems using the specified strategy.
+
+        Args:
+            strategy: Registered loader name
+            batch_size: If set, yield lists of up to this many problems
+            shard_index: This worker's shard, 0-based
+            num_shards: Number of workers sharing the problem set. Problems are
+                        assigned by a stable hash of problem_id, after any
+                        sampling, so every worker sees a disjoint slice of the
+                        same global set.
+            **kwargs: Passed to the loader
+
+        Returns:
+            Iterator over processed problem dicts, or lists of them when batch_size is set
+        """
+        check_shard(shard_index, num_shards)
+        loader_fn = self._resolve(strategy)
         
-        # Load raw data
-        with open(self.db_path, "r") as f:
-            raw_problems = json.load(f)
-            
-        return self._registry[strategy](raw_problems, **kwargs)
-
-def base_process_problem(problem: Dict, time_testing: str = None, time_now: str = None) -> Dict:
-    """Helper to add time_testing and time_now to a problem."""
-    processed = problem.copy()
-    now_dt = datetime.now()
-    processed["time_now"] = time_now or now_dt.isoformat()
-    processed["time_testing"] = time_testing or processed["time_start"] # Default to start if not provided
-    return processed
+        # Raw data is only handed to loaders that use it, and parsed on first access
+        raw_problems = RawProblems(self.db_path) if getattr(loader_fn, "_uses_raw_problems", True) else None
+
+        shardable = getattr(loader_fn, "_shardable", False)
+        if shardable and num_shards > 1:
+            kwargs.update(shard_index=shard_index, num_shards=num_shards)
+        result = loader_fn(raw_problems, **kwargs)
+        problems = iter(result) if getattr(loader_fn, "_streaming", False) else iter(result.values())
+        if not shardable:
+            problems = shard_filter(problems, shard_index, num_shards)
+        return _batched(problems, batch_size) if batch_size else problems
+
+    def load(self, strategy: str, **kwargs) -> Dict[str, Any]:
+        """Loads problems using the specified strategy (accepts `shard_index`/`num_shards`, see `iter_load`)."""
+        return to_problem_dict(self.iter_load(strategy, **kwargs))
+
+    def load_table(self, strategy: str, **kwargs) -> "ProblemTable":
+        """
+        Loads problems into a column-wise ProblemTable instead of a dict of dicts.
+
+        Problems are streamed into the table, so the dict form of the whole
+        set is never held at once. Accepts the same arguments as `iter_load`
+        (except `batch_size`).
+        """
+        from fortest.loader.table import ProblemTable
+        return ProblemTable.from_problems(self.iter_load(strategy, **kwargs))
+
+
+def _batched(problems: Iterator[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    """Group an iterator of problems into lists of up to batch_size."""
+    while True:
+        batch = list(islice(problems, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def to_problem_dict(problems: Iterable[Dict]) -> Dict[str, Dict]:
+    """Collect processed problems into a dict keyed by problem_id."""
+    return {p["problem_id"]: p for p in problems}
+
+def _copy_problem(problem: Dict) -> Dict:
+    """Copy of a problem that shares no mutable state with it at the top or metadata level."""
+    copied = problem.copy()
+    if isinstance(copied.get("metadata"), dict):
+        copied["metadata"] = copied["metadata"].copy()
+    return copied
+
+
+def base_process_problem(problem: Dict, time_testing: str = None, time_now: str = None, copy: bool = True) -> Dict:
+    """
+    Helper to add time_testing and time_now to a problem.
+
+    Pass `copy=False` when the problem is a fresh dict owned by the caller,
+    and a shared `time_now` when processing many problems (see `process_problems`).
+    """
+    return next(process_problems((problem,), time_testing, time_now, copy))
+
+
+def process_problems(
+    problems: Iterable[Dict],
+    time_testing: str = None,
+    time_now: str = None,
+    copy: bool = True,
+) -> Iterator[Dict]:
+    """
+    Batch form of `base_process_problem`.
+
+    The clock is read once, when this is called rather than when the
+    iterator is first advanced, so every problem of a load shares the
+    time_now of the load.
+
+    Args:
+        problems: Problems to process
+        time_testing: Testing time for all problems (default: each problem's time_start)
+        time_now: Shared time_now (default: now, read once)
+        copy: Copy each problem first; pass False for fresh dicts owned by the caller
+
+    Returns:
+        Iterator over processed problems, in input order
+    """
+    return _stamp_problems(problems, time_testing, time_now or datetime.now().isoformat(), copy)
+
+
+def _stamp_problems(problems: Iterable[Dict], time_testing: Optional[str], time_now: str, copy: bool) -> Iterator[Dict]:
+    for problem in problems:
+        # Raw rows are cached per process; copies keep callers from editing them
+        processed = _copy_problem(problem) if copy else problem
+        processed["time_now"] = time_now
+        processed["time_testing"] = time_testing or processed["time_start"] # Default to start if not provided
+        yield processed
+
+
+def materialize(problems: Iterable[Dict], time_now: str = None) -> Iterator[Dict]:
+    """
+    Copies of already processed problems, such as rows a loader caches, for a caller.
+
+    Unlike `process_problems`, each problem keeps its own time_testing; only
+    time_now is replaced. The clock is read when this is called.
+
+    Args:
+        problems: Processed problems to copy (left unchanged)
+        time_now: Shared time_now (default: now, read once)
+
+    Returns:
+        Iterator over copies, in input order
+    """
+    return _restamp_problems(problems, time_now or datetime.now().isoformat())
+
+
+def _restamp_problems(problems: Iterable[Dict], time_now: str) -> Iterator[Dict]:
+    for problem in problems:
+        copied = _copy_problem(problem)
+        copied["time_now"] = time_now
+        yield copied
@@ -0,0 +1,165 @@
+"""
+Quota-exact stratified sampling over integer-coded rows.
+
+Rows are described by integer source and horizon codes. The sampler
+1. splits `max_quest` equally across the sources present, capping each at
+   its size and handing the surplus to sources with spare capacity,
+2. splits each source's quota equally across its horizon groups when the
+   source is horizon-stratified (prediction markets), the same way,
+3. draws each stratum's quota without replacement.
+
+Optionally rows are first thinned to at most `per_cluster` random rows per
+near-duplicate cluster (see `fortest.loader.dedup`), so the sample does
+not spend its quota on variants of one question.
+
+All randomness comes from a private `numpy.random.Generator` seeded per
+call, so results are reproducible per seed and safe to compute from
+several threads at once.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def allocate_quota(total: int, capacity: np.ndarray, tiebreak: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Split `total` equally across strata, capped by each stratum's capacity.
+
+    Strata that cannot absorb their equal share are filled to capacity and
+    the surplus is shared among the rest. The final indivisible units go
+    to the strata with the most spare capacity (largest remainder), ties
+    broken by `tiebreak` (lower first), then by position.
+
+    Args:
+        total: Number of items to allocate
+        capacity: Items available per stratum
+        tiebreak: Optional per-stratum tie-break keys
+
+    Returns:
+        int64 array of per-stratum quotas summing to min(total, capacity.sum())
+    """
+    capacity = np.asarray(capacity, dtype=np.int64)
+    alloc = np.zeros_like(capacity)
+    remaining = int(min(max(total, 0), capacity.sum()))
+    open_ = capacity > 0
+    while remaining > 0:
+        n_open = int(open_.sum())
+        share = remaining // n_open
+        spare = capacity - alloc
+        full = open_ & (spare <= share)
+        if full.any():
+            # Saturate strata that cannot take a full share, then re-split
+            remaining -= int(spare[full].sum())
+            alloc[full] = capacity[full]
+            open_ &= ~full
+            continue
+        alloc[open_] += share
+        remaining -= share * n_open
+        if remaining:
+            idx = np.flatnonzero(open_)
+            keys = tiebreak[idx] if tiebreak is not None else np.zeros(len(idx))
+            order = np.lexsort((idx, keys, -(capacity - alloc)[idx]))
+            alloc[idx[order[:remaining]]] += 1
+            remaining = 0
+    return alloc
+
+
+def cap_per_group(groups: np.ndarray, cap: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Positions of at most `cap` randomly chosen rows per group label.
+
+    Returns:
+        Sorted int64 array of kept positions
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    order = np.lexsort((rng.random(len(groups)), groups))
+    sorted_groups = groups[order]
+    first = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]]) if len(groups) else order
+    rank = np.arange(len(groups)) - np.repeat(first, np.diff(np.r_[first, len(groups)]))
+    return np.sort(order[rank < cap])
+
+
+def _codes(values) -> np.ndarray:
+    """Integer codes as an array, without copying signed or narrow unsigned integer arrays."""
+    values = np.asarray(values)
+    if values.dtype.kind == "i" or (values.dtype.kind == "u" and values.dtype.itemsize < 8):
+        return values
+    return values.astype(np.int64)
+
+
+def quota_sample(
+    source_code: np.ndarray,
+    horizon_code: np.ndarray,
+    stratify_by_horizon: np.ndarray,
+    max_quest: int,
+    seed: int,
+    cluster: Optional[np.ndarray] = None,
+    per_cluster: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Draw a quota-exact stratified sample of row positions.
+
+    Args:
+        source_code: Per-row source codes (non-negative ints)
+        horizon_code: Per-row horizon group codes (non-negative ints)
+        stratify_by_horizon: Bool per source code; True splits that source's
+                             quota across its horizon groups
+        max_quest: Sample size (fewer if not enough rows)
+        seed: Seed for the private random generator
+        cluster: Optional per-row near-duplicate cluster labels
+        per_cluster: With `cluster`, draw at most this many rows per cluster
+
+    Returns:
+        int64 array of selected positions into the input arrays, grouped by
+        source code and shuffled within each stratum
+    """
+    source_code = _codes(source_code)
+    horizon_code = _codes(horizon_code)
+    if len(source_code) == 0 or max_quest <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    if cluster is not None and per_cluster is not None:
+        # Thin with a generator of its own, so the draw below matches an uncapped draw over the kept rows
+        kept = cap_per_group(cluster, per_cluster, np.random.default_rng([seed, 1]))
+        positions = quota_sample(source_code[kept], horizon_code[kept], stratify_by_horizon, max_quest, seed)
+        return kept[positions]
+
+    rng = np.random.default_rng(seed)
+    n_sources = int(source_code.max()) + 1
+    n_horizons = int(horizon_code.max()) + 1
+    stratify = np.zeros(n_sources, dtype=bool)
+    known = min(len(stratify_by_horizon), n_sources)
+    stratify[:known] = np.asarray(stratify_by_horizon, dtype=bool)[:known]
+
+    # Strata: (source, horizon) for stratified sources, (source, 0) otherwise.
+    # Codes in the narrowest dtype that holds them, so NumPy groups the rows
+    # with a one- or two-byte radix sort
+    n_strata = n_sources * n_horizons
+    dtype = np.uint8 if n_strata <= 1 << 8 else np.int16 if n_strata <= np.iinfo(np.int16).max else np.int64
+    stratum = source_code.astype(dtype) * dtype(n_horizons)
+    stratum += (horizon_code * stratify[source_code]).astype(dtype, copy=False)
+    stratum_cap = np.bincount(stratum, minlength=n_strata).reshape(n_sources, n_horizons)
+
+    # Source quotas
+    source_cap = stratum_cap.sum(axis=1)
+    source_quota = allocate_quota(max_quest, source_cap, rng.random(n_sources))
+
+    quota = np.zeros_like(stratum_cap)
+    for src in np.flatnonzero(source_quota):
+        if stratify[src]:
+            quota[src] = allocate_quota(source_quota[src], stratum_cap[src], rng.random(n_horizons))
+        else:
+            quota[src, 0] = source_quota[src]
+    quota = quota.ravel()
+    stratum_cap = stratum_cap.ravel()
+
+    # Rows grouped by stratum (stable, so each group is in row order), then
+    # one draw without replacement per stratum with a quota
+    order = np.argsort(stratum, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(stratum_cap)[:-1]))
+    picks = []
+    for st in np.flatnonzero(quota):
+        members = order[starts[st]:starts[st] + stratum_cap[st]]
+        picks.append(members[rng.choice(len(members), size=int(quota[st]), replace=False)])
+    return np.concatenate(picks) if picks else np.empty(0, dtype=np.int64)
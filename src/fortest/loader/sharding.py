@@ -0,0 +1,51 @@
+"""
+Deterministic sharding of problem sets across workers.
+
+A problem belongs to shard `hash(problem_id) % num_shards`, where the hash
+is a fixed-width BLAKE2b digest rather than Python's per-process salted
+`hash()`. Every worker therefore agrees on the assignment without
+coordination, and shards are disjoint and cover the whole set.
+"""
+
+import hashlib
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+def shard_of(problem_id: str, num_shards: int) -> int:
+    """Shard index owning `problem_id`."""
+    digest = hashlib.blake2b(problem_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % num_shards
+
+
+def check_shard(shard_index: int, num_shards: int):
+    """Raise ValueError unless 0 <= shard_index < num_shards."""
+    if num_shards < 1:
+        raise ValueError(f"num_shards must be >= 1, got {num_shards}")
+    if not 0 <= shard_index < num_shards:
+        raise ValueError(f"shard_index must be in [0, {num_shards}), got {shard_index}")
+
+
+def shard_filter(
+    items: Iterable[T],
+    shard_index: int,
+    num_shards: int,
+    key: Callable[[T], str] = lambda p: p["problem_id"],
+) -> Iterator[T]:
+    """
+    Keep the items whose id falls in the given shard.
+
+    Args:
+        items: Problems (or anything `key` maps to a problem_id)
+        shard_index: This worker's shard, 0-based
+        num_shards: Total number of shards
+        key: Maps an item to its problem_id
+
+    Returns:
+        Iterator over the items of this shard, in input order
+    """
+    check_shard(shard_index, num_shards)
+    if num_shards == 1:
+        return iter(items)
+    return (item for item in items if shard_of(key(item), num_shards) == shard_index)
@@ -0,0 +1,186 @@
+"""
+Columnar on-disk snapshots with memory-mapped loading.
+
+A snapshot is a directory holding:
+- `meta.json`: row count, column names and caller-supplied metadata
+- `<name>.npy`: one NumPy array per numeric column
+- `<name>.offsets.npy` / `<name>.blob.npy` / `<name>.null.npy`: text columns,
+  stored as UTF-8 bytes concatenated into one blob with int64 offsets
+
+Arrays are opened with `mmap_mode='r'`, so opening a snapshot costs almost
+nothing and processes reading the same snapshot share the page cache.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+
+
+class TextColumn(Sequence):
+    """Read-only sequence of optional strings backed by an offsets+blob layout."""
+
+    def __init__(self, offsets: np.ndarray, blob: np.ndarray, null: np.ndarray):
+        self._offsets = offsets
+        self._blob = blob
+        self._null = null
+
+    def __len__(self) -> int:
+        return len(self._null)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if self._null[i]:
+            return None
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        return iter(self.tolist())
+
+    def tolist(self) -> List[Optional[str]]:
+        """Decode the whole column in one pass."""
+        raw = self._blob.tobytes()
+        offsets = self._offsets.tolist()
+        null = self._null.tolist()
+        return [
+            None if null[i] else raw[offsets[i]:offsets[i + 1]].decode("utf-8")
+            for i in range(len(null))
+        ]
+
+
+def _encode_text(values: List[Optional[str]]):
+    """Encode strings into (offsets, blob, null) arrays."""
+    encoded = [(v if v is not None else "").encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    null = np.array([v is None for v in values], dtype=bool)
+    return offsets, blob, null
+
+
+def write_snapshot(
+    path,
+    arrays: Dict[str, np.ndarray],
+    texts: Dict[str, List[Optional[str]]],
+    meta: Dict[str, Any] = None,
+) -> Path:
+    """
+    Write a snapshot directory, replacing any existing one atomically.
+
+    Args:
+        path: Snapshot directory to create
+        arrays: Numeric columns, all of the same length
+        texts: Text columns (None allowed), same length as the numeric ones
+        meta: Extra JSON-serializable metadata stored in meta.json
+
+    Returns:
+        Path of the written snapshot
+    """
+    path = Path(path)
+    lengths = {len(a) for a in arrays.values()} | {len(t) for t in texts.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Snapshot columns have mismatched lengths: {sorted(lengths)}")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=f".{path.name}.", dir=path.parent))
+    try:
+        for name, arr in arrays.items():
+            np.save(tmp / f"{name}.npy", np.ascontiguousarray(arr))
+        for name, values in texts.items():
+            offsets, blob, null = _encode_text(values)
+            np.save(tmp / f"{name}.offsets.npy", offsets)
+            np.save(tmp / f"{name}.blob.npy", blob)
+            np.save(tmp / f"{name}.null.npy", null)
+        with open(tmp / META_FILE, "w") as f:
+            json.dump({
+                "format_version": FORMAT_VERSION,
+                "rows": lengths.pop() if lengths else 0,
+                "arrays": sorted(arrays),
+                "texts": sorted(texts),
+                "meta": meta or {},
+            }, f)
+        _swap_in(tmp, path)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return path
+
+
+def _swap_in(tmp: Path, path: Path):
+    """
+    Move the finished directory `tmp` to `path`.
+
+    An existing snapshot is first renamed aside and only deleted once the new
+    one is in place, so `path` never holds a partially deleted snapshot and
+    the old one is restored if the swap fails. Readers that already mapped
+    the old files keep valid mappings.
+    """
+    if not path.exists():
+        os.replace(tmp, path)
+        return
+    old = Path(tempfile.mkdtemp(prefix=f".{path.name}.old.", dir=path.parent))
+    os.replace(path, old)
+    try:
+        os.replace(tmp, path)
+    except BaseException:
+        os.replace(old, path)
+        raise
+    shutil.rmtree(old, ignore_errors=True)
+
+
+class Snapshot:
+    """Memory-mapped view of a snapshot directory."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / META_FILE) as f:
+            info = json.load(f)
+        if info.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format in {self.path}: {info.get('format_version')}")
+        self.rows: int = info["rows"]
+        self.meta: Dict[str, Any] = info["meta"]
+        self._array_names = set(info["arrays"])
+        self._text_names = set(info["texts"])
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._texts: Dict[str, TextColumn] = {}
+
+    @classmethod
+    def exists(cls, path) -> bool:
+        """Whether `path` holds a snapshot."""
+        return (Path(path) / META_FILE).exists()
+
+    def _load(self, name: str) -> np.ndarray:
+        return np.load(self.path / f"{name}.npy", mmap_mode="r")
+
+    def array(self, name: str) -> np.ndarray:
+        """Memory-mapped numeric column."""
+        if name not in self._array_names:
+            raise KeyError(f"Snapshot has no array column '{name}'")
+        if name not in self._arrays:
+            self._arrays[name] = self._load(name)
+        return self._arrays[name]
+
+    def text(self, name: str) -> TextColumn:
+        """Memory-mapped text column."""
+        if name not in self._text_names:
+            raise KeyError(f"Snapshot has no text column '{name}'")
+        if name not in self._texts:
+            self._texts[name] = TextColumn(
+                self._load(f"{name}.offsets"),
+                self._load(f"{name}.blob"),
+                self._load(f"{name}.null"),
+            )
+        return self._texts[name]
+
+    def __len__(self) -> int:
+        return self.rows
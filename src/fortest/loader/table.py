@@ -0,0 +1,313 @@
+"""
+Column-wise problem storage.
+
+A `ProblemTable` holds a problem set as columns instead of one dict per
+problem (plus a nested metadata dict). Each top-level field and each
+metadata key becomes one column, encoded by its content:
+
+- categorical: values repeated across rows (sources, horizon labels,
+  question sets, dates) are stored once, with a small integer code per row
+- text: mostly distinct strings (questions, backgrounds, urls) are stored
+  as UTF-8 in one offsets+blob buffer (see `fortest.loader.snapshot`)
+- numeric: int/float columns become NumPy arrays
+- object: anything else (lists, nested values) stays a Python list
+
+The table is a read-only `Mapping[problem_id, ProblemView]`. A view is a
+two-slot handle that decodes fields on access, so `table[pid]['time_testing']`
+and `table[pid]['metadata']['source']` work as they do on the dict form.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from fortest.loader.snapshot import TextColumn, _encode_text
+from fortest.loader.timecols import to_epoch_seconds
+
+# Placeholder for a key a row does not have
+_ABSENT = object()
+# Stored in the 'metadata' field column where the metadata dict went to the metadata columns
+_NESTED = object()
+
+
+class _CategoryColumn:
+    """Repeated values stored once, with an integer code per row."""
+
+    __slots__ = ("categories", "codes")
+
+    def __init__(self, categories: List, codes: List[int]):
+        self.categories = categories
+        dtype = np.uint8 if len(categories) <= 1 << 8 else np.uint16 if len(categories) <= 1 << 16 else np.int32
+        self.codes = np.array(codes, dtype=dtype)
+
+    def __getitem__(self, i):
+        value = self.categories[self.codes[i]]
+        # Lists are shared between rows; hand out copies
+        return list(value) if type(value) is list else value
+
+    def nbytes(self) -> int:
+        return self.codes.nbytes
+
+
+class _TextColumn:
+    """Mostly distinct optional strings in one UTF-8 buffer."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, values: List[Optional[str]]):
+        self.text = TextColumn(*_encode_text(values))
+
+    def __getitem__(self, i):
+        return self.text[i]
+
+    def nbytes(self) -> int:
+        return self.text._offsets.nbytes + self.text._blob.nbytes + self.text._null.nbytes
+
+
+class _NumericColumn:
+    """int64 or float64 values with a null mask."""
+
+    __slots__ = ("values", "null")
+
+    def __init__(self, values: List, dtype):
+        self.null = np.array([v is None for v in values], dtype=bool)
+        self.values = np.array([0 if v is None else v for v in values], dtype=dtype)
+
+    def __getitem__(self, i):
+        return None if self.null[i] else self.values[i].item()
+
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.null.nbytes
+
+
+class _ObjectColumn:
+    """Values kept as Python objects."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: List):
+        self.values = values
+
+    def __getitem__(self, i):
+        return self.values[i]
+
+    def nbytes(self) -> int:
+        return 8 * len(self.values)
+
+
+def _is_type(values: List, types) -> bool:
+    return all(v is None or (type(v) in types) for v in values)
+
+
+def _encode_column(values: List):
+    """Pick the most compact column type for `values`."""
+    # Keyed by type too, so 1, 1.0 and True stay distinct; flat lists key by their items
+    seen: Dict = {}
+    try:
+        codes = [seen.setdefault((type(v), tuple(v) if type(v) is list else v), (len(seen), v))[0]
+                 for v in values]
+    except TypeError:
+        return _ObjectColumn(values)
+    categories = [v for _, v in seen.values()]
+    if 2 * len(categories) <= len(values):
+        return _CategoryColumn(categories, codes)
+    if _is_type(values, (str,)):
+        return _TextColumn(values)
+    if _is_type(values, (int,)) and all(v is None or -(1 << 63) <= v < (1 << 63) for v in values):
+        return _NumericColumn(values, np.int64)
+    if _is_type(values, (float,)):
+        return _NumericColumn(values, np.float64)
+    return _CategoryColumn(categories, codes)
+
+
+class _ColumnGroup:
+    """Encoded columns for one level of keys (top-level fields or metadata)."""
+
+    __slots__ = ("keys", "columns", "present")
+
+    def __init__(self, raw: Dict[str, List], n_rows: int):
+        self.keys: List[str] = list(raw)
+        self.columns: Dict[str, Any] = {}
+        # Per-key presence masks, only for keys some rows lack
+        self.present: Dict[str, np.ndarray] = {}
+        for key, values in raw.items():
+            values.extend([_ABSENT] * (n_rows - len(values)))
+            mask = np.fromiter((v is not _ABSENT for v in values), dtype=bool, count=n_rows)
+            if not mask.all():
+                self.present[key] = mask
+                values = [None if v is _ABSENT else v for v in values]
+            self.columns[key] = _encode_column(values)
+
+    def has(self, key: str, row: int) -> bool:
+        if key not in self.columns:
+            return False
+        mask = self.present.get(key)
+        return mask is None or bool(mask[row])
+
+    def row_keys(self, row: int) -> List[str]:
+        return [k for k in self.keys if k not in self.present or self.present[k][row]]
+
+    def nbytes(self) -> int:
+        return sum(c.nbytes() for c in self.columns.values()) + sum(m.nbytes for m in self.present.values())
+
+
+class MetadataView(Mapping):
+    """Read-only dict-like view of one row's metadata."""
+
+    __slots__ = ("_group", "_row")
+
+    def __init__(self, group: _ColumnGroup, row: int):
+        self._group = group
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        if not self._group.has(key, self._row):
+            raise KeyError(key)
+        return self._group.columns[key][self._row]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._group.row_keys(self._row))
+
+    def __len__(self) -> int:
+        return len(self._group.row_keys(self._row))
+
+    def __repr__(self) -> str:
+        return f"MetadataView({self.copy()!r})"
+
+    def copy(self) -> Dict[str, Any]:
+        """Plain, mutable dict copy of the metadata."""
+        return {key: self[key] for key in self}
+
+
+class ProblemView(Mapping):
+    """Read-only dict-like view of one row of a ProblemTable."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "ProblemTable", row: int):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        return self._table._value(self._row, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table._row_keys(self._row))
+
+    def __len__(self) -> int:
+        return len(self._table._row_keys(self._row))
+
+    def __repr__(self) -> str:
+        return f"ProblemView({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Decode the row into a plain problem dict (with a plain metadata dict)."""
+        problem = {key: self[key] for key in self}
+        if isinstance(problem.get("metadata"), MetadataView):
+            problem["metadata"] = problem["metadata"].copy()
+        return problem
+
+    def copy(self) -> Dict[str, Any]:
+        """Plain, mutable dict copy of the problem (like `dict.copy` on the dict form)."""
+        return self.to_dict()
+
+
+class ProblemTable(Mapping):
+    """Read-only Mapping[problem_id, ProblemView] stored column-wise."""
+
+    def __init__(self, ids: List[str], rows: Dict[str, int], fields: _ColumnGroup, metadata: _ColumnGroup):
+        self._ids = ids
+        self._rows = rows
+        self._fields = fields
+        self._metadata = metadata
+
+    @classmethod
+    def from_problems(cls, problems: Iterable[Dict[str, Any]]) -> "ProblemTable":
+        """
+        Build a table from processed problem dicts.
+
+        Problems are consumed one at a time, so streaming from
+        `ProblemLoader.iter_load` never holds the dict form of the whole set.
+        As with `to_problem_dict`, a repeated problem_id keeps its first
+        position and its last value.
+
+        Args:
+            problems: Iterable of problem dicts with a 'problem_id'
+
+        Returns:
+            ProblemTable
+        """
+        ids: List[str] = []
+        fields: Dict[str, List] = {}
+        metadata: Dict[str, List] = {}
+        for n, p in enumerate(problems):
+            ids.append(p["problem_id"])
+            for key, value in p.items():
+                if key == "problem_id":
+                    continue
+                if key == "metadata" and isinstance(value, dict):
+                    for mkey, mvalue in value.items():
+                        metadata.setdefault(mkey, [_ABSENT] * n).append(mvalue)
+                    value = _NESTED
+                fields.setdefault(key, [_ABSENT] * n).append(value)
+            for column in (*fields.values(), *metadata.values()):
+                if len(column) == n:
+                    column.append(_ABSENT)
+        rows = {}
+        for row, pid in enumerate(ids):
+            rows[pid] = row
+        return cls(ids, rows, _ColumnGroup(fields, len(ids)), _ColumnGroup(metadata, len(ids)))
+
+    def __getitem__(self, problem_id: str) -> ProblemView:
+        return ProblemView(self, self._rows[problem_id])
+
+    def __contains__(self, problem_id) -> bool:
+        return problem_id in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _value(self, row: int, key: str) -> Any:
+        if key == "problem_id":
+            return self._ids[row]
+        if not self._fields.has(key, row):
+            raise KeyError(key)
+        value = self._fields.columns[key][row]
+        return MetadataView(self._metadata, row) if value is _NESTED else value
+
+    def _row_keys(self, row: int) -> List[str]:
+        return ["problem_id", *self._fields.row_keys(row)]
+
+    def column(self, key: str, metadata: bool = False) -> List[Any]:
+        """
+        Values of one field (or metadata key) for every problem, in table order.
+
+        Missing values are returned as None.
+        """
+        group = self._metadata if metadata else self._fields
+        column = group.columns[key]
+        return [column[self._rows[pid]] for pid in self._rows]
+
+    def epoch_seconds(self, key: str) -> np.ndarray:
+        """
+        int64 epoch seconds of a time field (e.g. 'time_testing'), in table order.
+
+        Categorical time columns are parsed once per distinct value.
+        """
+        rows = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+        column = self._fields.columns[key]
+        if isinstance(column, _CategoryColumn):
+            return to_epoch_seconds(column.categories)[column.codes[rows]]
+        return to_epoch_seconds([column[r] for r in rows.tolist()])
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Decode into the dict-of-dicts form returned by `ProblemLoader.load`."""
+        return {pid: self[pid].to_dict() for pid in self}
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the encoded columns (excluding the id index)."""
+        return self._fields.nbytes() + self._metadata.nbytes()
@@ -0,0 +1,282 @@
+"""
+Inverted keyword index over problem text.
+
+Text fields (question, background, resolution criteria) are lowercased and
+split into tokens; each token maps to the sorted row ids whose text holds
+it. Posting lists are stored delta-encoded in one byte blob, each list at
+the narrowest unsigned width (1, 2 or 4 bytes) that fits its largest gap,
+and decoded with a cumulative sum on lookup.
+
+Queries are boolean expressions over terms:
+
+    fed AND (rates OR inflation)
+    "S&P 500" OR nasdaq
+    ukraine russia              (adjacent terms are ANDed)
+
+A term made of several tokens ("S&P 500") matches rows holding all of
+them. AND binds tighter than OR; both are answered by posting-list
+intersection and union.
+
+An index is built once per dataset fingerprint and saved as an `.npz`
+file next to the dataset, so later processes load it instead of
+re-tokenizing (see `cached_keyword_index`).
+"""
+
+import os
+import re
+import json
+import logging
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from fortest.loader.cache import FileCache, dataset_fingerprint
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# Words, numbers and joined forms such as 's&p', 'u.s', "russia's"
+_TOKEN_RE = re.compile(r"[0-9a-z]+(?:[&.'][0-9a-z]+)*")
+_QUERY_RE = re.compile(r'\(|\)|"[^"]*"|[^\s()"]+')
+
+_WIDTHS = (np.uint8, np.uint16, np.uint32)
+
+# Indexes loaded or built in this process, keyed like the datasets they cover
+_INDEX_CACHE = FileCache()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercased tokens of a text (empty for None)."""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def _encode_postings(rows: np.ndarray):
+    """Delta-encode sorted row ids at the narrowest width that fits: (bytes, width code)."""
+    deltas = np.diff(rows, prepend=0)
+    largest = int(deltas.max()) if len(deltas) else 0
+    code = 0 if largest < 1 << 8 else 1 if largest < 1 << 16 else 2
+    return deltas.astype(_WIDTHS[code]).tobytes(), code
+
+
+class KeywordIndex:
+    """Token -> sorted row ids, with delta-compressed posting lists."""
+
+    def __init__(self, n_rows: int, terms: List[str], offsets: np.ndarray, widths: np.ndarray, blob: np.ndarray):
+        self.n_rows = n_rows
+        self.terms = terms
+        self._term_ids = {t: i for i, t in enumerate(terms)}
+        self._offsets = offsets
+        self._widths = widths
+        self._blob = blob
+
+    @classmethod
+    def build(cls, columns: Dict[str, Sequence[Optional[str]]]) -> "KeywordIndex":
+        """
+        Index equal-length text columns; a row matches a token found in any of them.
+
+        Args:
+            columns: Dict[field -> per-row text (None allowed)]
+        """
+        lengths = {len(v) for v in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Index columns have mismatched lengths: {sorted(lengths)}")
+        n_rows = lengths.pop() if lengths else 0
+
+        postings: Dict[str, List[int]] = {}
+        for row in range(n_rows):
+            tokens = set()
+            for values in columns.values():
+                tokens.update(tokenize(values[row]))
+            for token in tokens:
+                postings.setdefault(token, []).append(row)
+
+        terms = sorted(postings)
+        parts, widths = [], []
+        for term in terms:
+            data, code = _encode_postings(np.array(postings[term], dtype=np.int64))
+            parts.append(data)
+            widths.append(code)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(p) for p in parts], out=offsets[1:])
+        blob = np.frombuffer(b"".join(parts), dtype=np.uint8)
+        return cls(n_rows, terms, offsets, np.array(widths, dtype=np.uint8), blob)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def postings(self, token: str) -> np.ndarray:
+        """Sorted row ids holding `token` (already lowercased)."""
+        i = self._term_ids.get(token)
+        if i is None:
+            return np.empty(0, dtype=np.int64)
+        data = self._blob[self._offsets[i]:self._offsets[i + 1]]
+        return np.cumsum(data.view(_WIDTHS[self._widths[i]]), dtype=np.int64)
+
+    def term_rows(self, term: str) -> np.ndarray:
+        """Sorted row ids holding every token of `term`."""
+        tokens = tokenize(term)
+        if not tokens:
+            raise ValueError(f"Keyword {term!r} has no searchable tokens")
+        result = None
+        for part in sorted((self.postings(t) for t in set(tokens)), key=len):
+            result = part if result is None else np.intersect1d(result, part, assume_unique=True)
+            if not len(result):
+                break
+        return result
+
+    def query(self, query: Union[str, Iterable[str]]) -> np.ndarray:
+        """
+        Sorted row ids matching a boolean query.
+
+        Args:
+            query: Expression with AND/OR, parentheses and "quoted terms";
+                   a list of expressions matches rows satisfying any of them
+
+        Returns:
+            int64 array of row ids
+        """
+        if not isinstance(query, str):
+            parts = [self.query(q) for q in query]
+            return np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+        return _QueryParser(self, query).parse()
+
+    def nbytes(self) -> int:
+        """Bytes held by the compressed posting lists."""
+        return self._blob.nbytes + self._offsets.nbytes + self._widths.nbytes
+
+    def save(self, path, fingerprint=None) -> Path:
+        """Write the index to an .npz file atomically, tagged with the source fingerprint."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = {"format_version": FORMAT_VERSION, "n_rows": self.n_rows, "fingerprint": fingerprint}
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".npz", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    header=np.frombuffer(json.dumps(header).encode("utf-8"), dtype=np.uint8),
+                    terms=np.frombuffer("\n".join(self.terms).encode("utf-8"), dtype=np.uint8),
+                    offsets=self._offsets,
+                    widths=self._widths,
+                    blob=self._blob,
+                )
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path, fingerprint=None) -> Optional["KeywordIndex"]:
+        """Read an index saved by `save`; None if it is missing, unreadable or built from other files."""
+        try:
+            with np.load(path) as data:
+                header = json.loads(data["header"].tobytes().decode("utf-8"))
+                if header.get("format_version") != FORMAT_VERSION or header.get("fingerprint") != fingerprint:
+                    return None
+                text = data["terms"].tobytes().decode("utf-8")
+                return cls(header["n_rows"], text.split("\n") if text else [],
+                           data["offsets"], data["widths"], data["blob"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+class _QueryParser:
+    """Recursive-descent evaluator for keyword queries (OR of ANDs of terms)."""
+
+    def __init__(self, index: KeywordIndex, query: str):
+        self.index = index
+        self.tokens = _QUERY_RE.findall(query)
+        self.pos = 0
+        if not self.tokens:
+            raise ValueError("Empty keyword query")
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def parse(self) -> np.ndarray:
+        result = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected {self._peek()!r} in keyword query")
+        return result
+
+    def _or(self) -> np.ndarray:
+        result = self._and()
+        while self._peek() == "OR":
+            self.pos += 1
+            result = np.union1d(result, self._and())
+        return result
+
+    def _and(self) -> np.ndarray:
+        result = self._atom()
+        while self._peek() not in (None, "OR", ")"):
+            if self._peek() == "AND":
+                self.pos += 1
+            result = np.intersect1d(result, self._atom(), assume_unique=True)
+        return result
+
+    def _atom(self) -> np.ndarray:
+        token = self._peek()
+        if token is None or token in ("AND", "OR", ")"):
+            raise ValueError(f"Expected a keyword, got {token!r}")
+        self.pos += 1
+        if token == "(":
+            result = self._or()
+            if self._peek() != ")":
+                raise ValueError("Unbalanced parentheses in keyword query")
+            self.pos += 1
+            return result
+        return self.index.term_rows(token.strip('"'))
+
+
+def _fingerprint_json(paths: Iterable) -> List[List]:
+    """Source fingerprint in the JSON-friendly form stored with a saved index."""
+    return [[os.path.basename(p), mtime, size] for p, mtime, size in dataset_fingerprint(paths)]
+
+
+def cached_keyword_index(
+    key: str,
+    paths: Sequence,
+    index_path,
+    texts: Callable[[], Dict[str, Sequence[Optional[str]]]],
+    n_rows: Optional[int] = None,
+) -> KeywordIndex:
+    """
+    Keyword index for a dataset, built once per fingerprint of its source files.
+
+    Looks in the process cache, then at `index_path` on disk, and only then
+    tokenizes `texts()` and saves the result to `index_path` (best effort:
+    an unwritable location just skips persisting).
+
+    Args:
+        key: Cache entry name (one per dataset)
+        paths: Files the dataset rows are derived from
+        index_path: Where the index is persisted
+        texts: Zero-argument callable returning the text columns, in row order
+        n_rows: Expected row count; a saved index of another size is rebuilt
+
+    Returns:
+        KeywordIndex
+    """
+    def build() -> KeywordIndex:
+        fingerprint = _fingerprint_json(paths)
+        index = KeywordIndex.load(index_path, fingerprint)
+        if index is not None and (n_rows is None or index.n_rows == n_rows):
+            return index
+        index = KeywordIndex.build(texts())
+        try:
+            index.save(index_path, fingerprint)
+        except OSError as e:
+            logger.warning(f"Could not save keyword index to {index_path}: {e}")
+        return index
+
+    return _INDEX_CACHE.get(key, paths, build)
+
+
+def invalidate_cache():
+    """Drop keyword indexes held in this process (saved files are kept)."""
+    _INDEX_CACHE.invalidate()
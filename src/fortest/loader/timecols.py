@@ -0,0 +1,126 @@
+"""
+Bulk parsing of ISO date/datetime strings into integer time columns.
+
+Problems carry their times as ISO strings. Loaders that filter or bucket
+by time parse whole columns at once into int64 epoch seconds or days with
+`numpy.datetime64`, then compare and bucket with array operations instead
+of calling `datetime.strptime` per row.
+
+Missing or unparseable values ('', None, 'N/A', malformed strings) become
+`NAT`, the smallest int64, which sorts before every real time.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+
+NAT = np.iinfo(np.int64).min
+
+_MISSING = ("", "N/A", "NaT")
+
+
+def _split_offset(value: str):
+    """
+    Split a trailing 'Z' or '+HH:MM'/'-HH:MM' UTC offset off an ISO datetime, in seconds.
+
+    A malformed offset (e.g. '+ab:cd') makes the whole value "NaT".
+    """
+    if value.endswith("Z"):
+        return value[:-1], 0
+    if len(value) > 16 and value[-3] == ":" and value[-6] in "+-" and "T" in value:
+        digits = value[-5:-3] + value[-2:]
+        if not (digits.isascii() and digits.isdigit()):
+            return "NaT", 0
+        sign = -1 if value[-6] == "-" else 1
+        return value[:-6], sign * (int(value[-5:-3]) * 3600 + int(value[-2:]) * 60)
+    return value, 0
+
+
+def _parse(values, unit: str) -> np.ndarray:
+    """datetime64[unit] array of already normalized strings, NaT where unparseable."""
+    try:
+        return np.array(values, dtype=f"datetime64[{unit}]")
+    except ValueError:
+        out = np.empty(len(values), dtype=f"datetime64[{unit}]")
+        for i, v in enumerate(values):
+            try:
+                out[i] = np.datetime64(v, unit)
+            except ValueError:
+                out[i] = np.datetime64("NaT", unit)
+        return out
+
+
+def _as_int(parsed: np.ndarray) -> np.ndarray:
+    ints = parsed.astype(np.int64)
+    ints[np.isnat(parsed)] = NAT
+    return ints
+
+
+def to_epoch_seconds(values: Iterable[Optional[str]]) -> np.ndarray:
+    """
+    Parse ISO dates/datetimes to int64 seconds since the epoch (UTC).
+
+    Args:
+        values: ISO strings; UTC offsets are applied, naive values are taken as UTC
+
+    Returns:
+        int64 array, `NAT` for missing or unparseable values
+    """
+    stripped, offsets = [], []
+    for v in values:
+        if not v or v in _MISSING:
+            stripped.append("NaT")
+            offsets.append(0)
+            continue
+        text, offset = _split_offset(v)
+        stripped.append(text)
+        offsets.append(offset)
+    seconds = _as_int(_parse(stripped, "s"))
+    offsets = np.array(offsets, dtype=np.int64)
+    valid = seconds != NAT
+    seconds[valid] -= offsets[valid]
+    return seconds
+
+
+def _date_part(value: Optional[str]) -> str:
+    """
+    The 'YYYY-MM-DD' part of a date or 'YYYY-MM-DDT...' datetime, else "NaT".
+
+    Only that exact shape is accepted, as with `strptime('%Y-%m-%d')` on the
+    part before 'T': '2024', '2024-01', '20240101' and space-separated
+    datetimes are rejected rather than read as some other date.
+    """
+    if not value or value in _MISSING:
+        return "NaT"
+    if len(value) > 10 and value[10] != "T":
+        return "NaT"
+    date = value[:10]
+    if len(date) != 10 or date[4] != "-" or date[7] != "-":
+        return "NaT"
+    digits = date[:4] + date[5:7] + date[8:]
+    if not (digits.isascii() and digits.isdigit()):
+        return "NaT"
+    return date
+
+
+def to_epoch_days(values: Iterable[Optional[str]]) -> np.ndarray:
+    """
+    Parse the date part of ISO dates/datetimes to int64 days since the epoch.
+
+    The calendar date is taken as written, ignoring any time or offset.
+    Values must be 'YYYY-MM-DD' or 'YYYY-MM-DDT...' (see `_date_part`).
+
+    Returns:
+        int64 array, `NAT` for missing or unparseable values
+    """
+    return _as_int(_parse([_date_part(v) for v in values], "D"))
+
+
+def bucketize(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Index of the half-open bucket [edges[i], edges[i + 1]) holding each value.
+
+    Values below edges[0] get -1; values at or past the last edge fall in
+    the last bucket.
+    """
+    return np.searchsorted(edges, values, side="right") - 1
@@ -5,8 +5,24 @@ from .resolver import (
     ResolvedQuestion,
     BaseResolver,
     DummyResolver,
+    StoreBackedResolver,
     TemplateLoader,
+    date_grid,
     generate_dataset,
+    resolve_increase_grid,
+    rolling_origins,
+)
+from .store import SeriesStore, build_series_store, write_series_store
+from .acled import AcledCounts, AcledResolver, parse_acled_id
+from .fetch_cache import CacheStats, FetchCache, FetchCacheMixin, with_fetch_cache
+from .pipeline import (
+    ColumnarSink,
+    JsonlSink,
+    iter_dataset,
+    iter_dataset_chunks,
+    open_sink,
+    read_dataset,
+    write_dataset,
 )
 
 __all__ = [
@@ -14,6 +30,27 @@ __all__ = [
     'ResolvedQuestion', 
     'BaseResolver',
     'DummyResolver',
+    'StoreBackedResolver',
     'TemplateLoader',
+    'date_grid',
     'generate_dataset',
+    'resolve_increase_grid',
+    'rolling_origins',
+    'SeriesStore',
+    'build_series_store',
+    'write_series_store',
+    'AcledCounts',
+    'AcledResolver',
+    'parse_acled_id',
+    'CacheStats',
+    'FetchCache',
+    'FetchCacheMixin',
+    'with_fetch_cache',
+    'ColumnarSink',
+    'JsonlSink',
+    'iter_dataset',
+    'iter_dataset_chunks',
+    'open_sink',
+    'read_dataset',
+    'write_dataset',
 ]
@@ -0,0 +1,288 @@
+"""
+ACLED event-count resolution from prefix sums.
+
+ACLED templates compare a recent event (or fatality) count in a country
+with a longer baseline. Their ids follow the ForecastBench scheme
+`<country>.<variable>.<rule>`, where `variable` is an ACLED event type
+(e.g. 'Battles', 'Protests') or 'fatalities', and `rule` is one of:
+
+- `last30Days.gt.30DayAvgOverPast360Days`: more events in the 30 days
+  before the resolution date than the 30-day average over the 360 days
+  before the forecast due date
+- `last30DaysTimes10.gt.30DayAvgOverPast360DaysPlus1`: more than ten times
+  one plus that average
+
+Windows are half-open and end before their date: "the 30 days before D"
+is [D - 30, D).
+
+`AcledCounts` ingests a local ACLED export (CSV with `event_date`,
+`country`, `event_type` and `fatalities` columns) into one daily count
+row per (country, event_type) and per (country, 'fatalities'), and keeps
+their cumulative sums with a leading zero. The count of any window is then
+the difference of two entries, and `AcledResolver` resolves a whole date
+grid with a few vectorized subtractions per template.
+"""
+
+import csv
+import os
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fortest.loader.timecols import NAT, to_epoch_days
+from .resolver import BaseResolver, DatePair, ResolvedQuestion, TemplatedQuestion
+
+FATALITIES = 'fatalities'
+
+# Template rule -> (recent window days, baseline window days, factor, offset):
+# resolves to 1.0 when recent count > factor * (baseline 30-day average + offset)
+RULES: Dict[str, Tuple[int, int, float, float]] = {
+    'last30Days.gt.30DayAvgOverPast360Days': (30, 360, 1.0, 0.0),
+    'last30DaysTimes10.gt.30DayAvgOverPast360DaysPlus1': (30, 360, 10.0, 1.0),
+}
+
+# Non-ISO event_date formats found in ACLED exports
+_DATE_FORMATS = ('%d %B %Y', '%d-%b-%y', '%m/%d/%Y')
+
+
+def parse_acled_id(question_id: str) -> Optional[Tuple[str, str, str]]:
+    """(country, variable, rule) of an ACLED template id, or None if it follows no known rule."""
+    country, _, rest = question_id.partition('.')
+    for rule in RULES:
+        if rest.endswith('.' + rule) and len(rest) > len(rule) + 1:
+            return country, rest[:-len(rule) - 1], rule
+    return None
+
+
+def _query_days(dates: Sequence[str]) -> np.ndarray:
+    """Epoch days of query dates; unparseable ones map far before any coverage, so their windows are NaN."""
+    days = to_epoch_days(dates)
+    days[days == NAT] = np.iinfo(np.int32).min
+    return days
+
+
+def _event_days(values: List[str]) -> np.ndarray:
+    """Epoch days of ACLED event dates (ISO or the export's '%d %B %Y' form), NAT where unparseable."""
+    days = to_epoch_days(values)
+    for i in np.flatnonzero(days == NAT).tolist():
+        for fmt in _DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(values[i].strip(), fmt).date()
+            except (AttributeError, ValueError):
+                continue
+            days[i] = (parsed - date(1970, 1, 1)).days
+            break
+    return days
+
+
+class AcledCounts:
+    """
+    Cumulative daily counts per (country, variable).
+
+    `cumsum[k, i]` is the count of series `k` on days before
+    `first_day + i`, so a window [a, b) counts `cumsum[k, b - first] -
+    cumsum[k, a - first]`. Windows must lie within [first_day, last_day].
+    """
+
+    def __init__(self, keys: List[Tuple[str, str]], first_day: int, cumsum: np.ndarray):
+        self.keys = keys
+        self.first_day = int(first_day)
+        self.cumsum = cumsum
+        self._position = {key: i for i, key in enumerate(keys)}
+
+    @property
+    def last_day(self) -> int:
+        """Last covered day (epoch days)."""
+        return self.first_day + self.cumsum.shape[1] - 2
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key) -> bool:
+        return key in self._position
+
+    @classmethod
+    def from_export(cls, path, first_date: str = None, last_date: str = None) -> "AcledCounts":
+        """
+        Build counts from a local ACLED CSV export.
+
+        Args:
+            path: CSV export with event_date, country, event_type and fatalities columns
+            first_date: First covered date (default: earliest event)
+            last_date: Last covered date (default: latest event); pass the
+                       export's end date so quiet trailing days count as zero
+
+        Returns:
+            AcledCounts
+        """
+        dates, countries, event_types, fatalities = [], [], [], []
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                dates.append(row.get('event_date'))
+                countries.append(row.get('country') or '')
+                event_types.append(row.get('event_type') or '')
+                try:
+                    fatalities.append(int(float(row.get('fatalities') or 0)))
+                except ValueError:
+                    fatalities.append(0)
+        return cls.from_events(dates, countries, event_types, fatalities, first_date, last_date)
+
+    @classmethod
+    def from_events(
+        cls,
+        dates: Sequence[str],
+        countries: Sequence[str],
+        event_types: Sequence[str],
+        fatalities: Sequence[int],
+        first_date: str = None,
+        last_date: str = None,
+    ) -> "AcledCounts":
+        """Build counts from event columns (see `from_export`); rows with unparseable dates are dropped."""
+        days = _event_days(list(dates))
+        keep = days != NAT
+        days = days[keep]
+        countries = np.asarray(countries, dtype=object)[keep]
+        event_types = np.asarray(event_types, dtype=object)[keep]
+        fatalities = np.asarray(fatalities, dtype=np.int64)[keep]
+
+        first = int(to_epoch_days([first_date])[0]) if first_date else (int(days.min()) if len(days) else 0)
+        last = int(to_epoch_days([last_date])[0]) if last_date else (int(days.max()) if len(days) else first)
+        if first == NAT or last == NAT or last < first:
+            raise ValueError(f"Invalid ACLED coverage: {first_date} to {last_date}")
+        inside = (days >= first) & (days <= last)
+        days, countries = days[inside], countries[inside]
+        event_types, fatalities = event_types[inside], fatalities[inside]
+
+        # One event-count series per (country, event type), one fatality series per country
+        event_keys = list(zip(countries.tolist(), event_types.tolist()))
+        fatality_keys = [(c, FATALITIES) for c in countries.tolist()]
+        keys = sorted(set(event_keys) | set(fatality_keys))
+        position = {key: i for i, key in enumerate(keys)}
+        n_days = last - first + 1
+        offset = days - first
+
+        counts = np.zeros((len(keys), n_days), dtype=np.int64)
+        np.add.at(counts, (np.array([position[k] for k in event_keys], dtype=np.int64), offset), 1)
+        np.add.at(counts, (np.array([position[k] for k in fatality_keys], dtype=np.int64), offset), fatalities)
+        cumsum = np.zeros((len(keys), n_days + 1), dtype=np.int64)
+        np.cumsum(counts, axis=1, out=cumsum[:, 1:])
+        return cls(keys, first, cumsum)
+
+    def window_counts(self, key: Tuple[str, str], start_days: np.ndarray, end_days: np.ndarray) -> np.ndarray:
+        """
+        Counts of one series over [start, end) windows, in one subtraction.
+
+        Returns:
+            float64 array; NaN where the window leaves the covered range,
+            zeros for series without any event
+        """
+        start_days = np.asarray(start_days, dtype=np.int64)
+        end_days = np.asarray(end_days, dtype=np.int64)
+        covered = (start_days >= self.first_day) & (end_days <= self.last_day + 1) & (start_days <= end_days)
+        out = np.full(len(start_days), np.nan)
+        i = self._position.get(key)
+        if i is None:
+            out[covered] = 0.0
+            return out
+        row = self.cumsum[i]
+        out[covered] = row[end_days[covered] - self.first_day] - row[start_days[covered] - self.first_day]
+        return out
+
+    def save(self, path) -> Path:
+        """Write counts to an .npz file atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        keys = np.array(['\t'.join(k) for k in self.keys], dtype=str)
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".npz", dir=path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, keys=keys, first_day=np.int64(self.first_day), cumsum=self.cumsum)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path) -> "AcledCounts":
+        """Read counts written by `save`."""
+        with np.load(path) as data:
+            keys = [tuple(k.split('\t', 1)) for k in data['keys'].tolist()]
+            return cls(keys, int(data['first_day']), data['cumsum'])
+
+
+class AcledResolver(BaseResolver):
+    """
+    Resolver for ACLED templates backed by `AcledCounts`.
+
+    `fetch_value(question_id, date)` is the template's recent window count
+    ending before `date`. Templates whose id follows no known rule, and
+    windows outside the export's coverage, stay unresolved.
+    """
+
+    def __init__(self, counts):
+        if not isinstance(counts, AcledCounts):
+            counts = AcledCounts.load(counts) if str(counts).endswith('.npz') else AcledCounts.from_export(counts)
+        self.counts = counts
+
+    def fetch_value(self, question_id: str, date: str) -> Optional[float]:
+        return self.fetch_many(question_id, [date])[0]
+
+    def fetch_many(self, question_id: str, dates: Sequence[str]) -> List[Optional[float]]:
+        """Recent window counts ending before each date."""
+        parsed = parse_acled_id(question_id)
+        if parsed is None:
+            return [None] * len(dates)
+        country, variable, rule = parsed
+        days = _query_days(dates)
+        values = self.counts.window_counts((country, variable), days - RULES[rule][0], days)
+        return [None if np.isnan(v) else v for v in values.tolist()]
+
+    def resolve(
+        self,
+        template: TemplatedQuestion,
+        forecast_due_date: str,
+        resolution_date: str
+    ) -> ResolvedQuestion:
+        return self.resolve_many([template], [(forecast_due_date, resolution_date)])[0]
+
+    def resolve_many(
+        self,
+        templates: Sequence[TemplatedQuestion],
+        date_pairs: Sequence[DatePair],
+    ) -> List[ResolvedQuestion]:
+        """Resolve the grid with vectorized window differences per template."""
+        due = _query_days([d for d, _ in date_pairs])
+        res = _query_days([r for _, r in date_pairs])
+        results = []
+        for template in templates:
+            parsed = parse_acled_id(template.id)
+            recent = np.full(len(date_pairs), np.nan)
+            outcome = np.full(len(date_pairs), np.nan)
+            if parsed is not None:
+                country, variable, rule = parsed
+                recent_days, baseline_days, factor, offset = RULES[rule]
+                key = (country, variable)
+                recent = self.counts.window_counts(key, res - recent_days, res)
+                baseline = self.counts.window_counts(key, due - baseline_days, due) * (30.0 / baseline_days)
+                known = ~(np.isnan(recent) | np.isnan(baseline))
+                outcome[known] = (recent[known] > factor * (baseline[known] + offset)).astype(np.float64)
+            questions = template.render_many(date_pairs)
+            recent, outcome = recent.tolist(), outcome.tolist()
+            results.extend(
+                ResolvedQuestion(
+                    id=template.id,
+                    source=template.source,
+                    question=questions[i],
+                    forecast_due_date=d,
+                    resolution_date=r,
+                    resolved_to=None if np.isnan(outcome[i]) else outcome[i],
+                    resolution_value=None if np.isnan(recent[i]) else recent[i],
+                )
+                for i, (d, r) in enumerate(date_pairs)
+            )
+        return results
@@ -0,0 +1,361 @@
+"""
+Two-tier cache for resolver `fetch_value` lookups.
+
+Values are keyed by (source, question_id, date). The first tier is an
+in-process LRU bounded by entry count and by an estimate of the bytes the
+entries hold. The optional second tier is a sqlite file that several
+processes can share (WAL journal, one connection per process). Lookups
+that miss in memory are looked up on disk and promoted.
+
+Values are stored as they read back from JSON (tuples as lists, NumPy
+scalars as Python numbers), so a lookup returns the same value whichever
+tier it hits. Values JSON cannot encode are kept in memory only.
+
+A `None` value means the resolver had no data for that point. Such
+negative entries expire after `negative_ttl` seconds, so data published
+later is picked up; positive values never expire, since observed values
+of past dates do not change.
+
+Resolvers opt in with `FetchCacheMixin` (or the `with_fetch_cache` class
+decorator). This routes `fetch_value` and `fetch_many` through a
+`FetchCache`, and `resolve` / `resolve_many` reach the cache because they
+fetch through those methods.
+"""
+
+import os
+import sys
+import json
+import importlib
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .resolver import BaseResolver
+
+CacheKey = Tuple[str, str, str]
+
+# Returned by lookups that find nothing (None is a cached "no data" value)
+MISSING = object()
+
+# Dates per sqlite lookup, well under the bound-parameter limit
+_QUERY_CHUNK = 500
+
+# Rough per-entry overhead of the LRU dict, key tuple and bookkeeping
+_ENTRY_OVERHEAD = 200
+
+
+@dataclass
+class CacheStats:
+    """Lookup counters of a FetchCache."""
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+    negative_hits: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, 'tolist'):
+        # NumPy scalars and arrays
+        return value.tolist()
+    raise TypeError(f"Not JSON-serializable: {type(value).__name__}")
+
+
+def _normalize(value: Any) -> Any:
+    """
+    The value as it reads back from the disk tier.
+
+    Tuples become lists and NumPy scalars or arrays become Python numbers
+    or lists, so a value reads back the same from either tier. Values JSON
+    cannot encode are returned unchanged.
+    """
+    if value is None or type(value) in (float, int, str, bool):
+        return value
+    try:
+        return json.loads(json.dumps(value, default=_json_default))
+    except (TypeError, ValueError):
+        return value
+
+
+def _entry_bytes(key: CacheKey, value: Any) -> int:
+    return _ENTRY_OVERHEAD + sum(sys.getsizeof(k) for k in key) + sys.getsizeof(value)
+
+
+class FetchCache:
+    """In-memory LRU over an optional shared sqlite tier (see module docstring)."""
+
+    def __init__(
+        self,
+        path=None,
+        max_entries: int = 100_000,
+        max_bytes: int = 64 << 20,
+        negative_ttl: float = 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: sqlite file of the disk tier (None = memory only)
+            max_entries: Most entries kept in memory
+            max_bytes: Most (estimated) bytes kept in memory
+            negative_ttl: Seconds a "no data" entry stays valid
+            clock: Time source, in seconds
+        """
+        self.path = Path(path) if path is not None else None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        self._lru: "OrderedDict[CacheKey, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Process pools get the configuration and the shared disk tier, not the memory tier
+        return {k: getattr(self, k) for k in ('path', 'max_entries', 'max_bytes', 'negative_ttl', 'clock')}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__init__(**state)
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated bytes held by the memory tier."""
+        return self._bytes
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._conn is None or self._conn_pid != os.getpid():
+            # A connection inherited through fork is not safe to use; open our own
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS fetch_values ("
+                "source TEXT NOT NULL, question_id TEXT NOT NULL, date TEXT NOT NULL, "
+                "value TEXT, stored_at REAL NOT NULL, PRIMARY KEY (source, question_id, date))"
+            )
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def _expired(self, value: Any, stored_at: float) -> bool:
+        return value is None and self.clock() - stored_at > self.negative_ttl
+
+    def _remember(self, key: CacheKey, value: Any, stored_at: float):
+        """Insert into the memory tier, evicting least recently used entries past the bounds."""
+        old = self._lru.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+        size = _entry_bytes(key, value)
+        self._lru[key] = (value, stored_at, size)
+        self._bytes += size
+        while self._lru and (len(self._lru) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, _, evicted) = self._lru.popitem(last=False)
+            self._bytes -= evicted
+            self.stats.evictions += 1
+
+    def get_many(self, keys: Sequence[CacheKey]) -> List[Any]:
+        """
+        Cached values of several keys.
+
+        Returns:
+            One value per key: the cached value (None for cached "no data"),
+            or MISSING
+        """
+        results = [MISSING] * len(keys)
+        with self._lock:
+            pending = []
+            for i, key in enumerate(keys):
+                entry = self._lru.get(key)
+                if entry is not None and not self._expired(entry[0], entry[1]):
+                    self._lru.move_to_end(key)
+                    results[i] = entry[0]
+                else:
+                    pending.append(i)
+
+            db = self._db()
+            if db is not None and pending:
+                found = {}
+                by_series: Dict[Tuple[str, str], List[str]] = {}
+                for i in pending:
+                    by_series.setdefault(keys[i][:2], []).append(keys[i][2])
+                for (source, question_id), dates in by_series.items():
+                    for start in range(0, len(dates), _QUERY_CHUNK):
+                        chunk = dates[start:start + _QUERY_CHUNK]
+                        rows = db.execute(
+                            "SELECT date, value, stored_at FROM fetch_values WHERE source = ? AND question_id = ? "
+                            f"AND date IN ({', '.join('?' * len(chunk))})", (source, question_id, *chunk))
+                        for date, value, stored_at in rows:
+                            decoded = None if value is None else json.loads(value)
+                            found[(source, question_id, date)] = (decoded, stored_at)
+                for i in pending:
+                    hit = found.get(keys[i])
+                    if hit is not None and not self._expired(*hit):
+                        results[i] = hit[0]
+                        self._remember(keys[i], *hit)
+                        self.stats.disk_hits += 1
+
+            for value in results:
+                if value is MISSING:
+                    self.stats.misses += 1
+                else:
+                    self.stats.hits += 1
+                    if value is None:
+                        self.stats.negative_hits += 1
+        return results
+
+    def get(self, key: CacheKey) -> Any:
+        """Cached value of one key, or MISSING."""
+        return self.get_many([key])[0]
+
+    def put_many(self, items: Sequence[Tuple[CacheKey, Any]]):
+        """Store values (None = no data, normalised as for JSON) in memory and, in one transaction, on disk."""
+        now = self.clock()
+        items = [(key, _normalize(value)) for key, value in items]
+        with self._lock:
+            for key, value in items:
+                self._remember(key, value, now)
+            db = self._db()
+            if db is None or not items:
+                return
+            rows = []
+            for (source, question_id, date), value in items:
+                try:
+                    encoded = None if value is None else json.dumps(value)
+                except (TypeError, ValueError):
+                    # Not JSON-serializable: kept in memory only
+                    continue
+                rows.append((source, question_id, date, encoded, now))
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.executemany("INSERT OR REPLACE INTO fetch_values VALUES (?, ?, ?, ?, ?)", rows)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def put(self, key: CacheKey, value: Any):
+        """Store one value (None = no data)."""
+        self.put_many([(key, value)])
+
+    def clear(self, disk: bool = False):
+        """Drop the memory tier and, with `disk`, every row of the disk tier."""
+        with self._lock:
+            self._lru.clear()
+            self._bytes = 0
+            db = self._db()
+            if disk and db is not None:
+                db.execute("DELETE FROM fetch_values")
+
+    def close(self):
+        """Close the disk tier's connection (reopened on the next lookup)."""
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+class FetchCacheMixin:
+    """
+    Caches a resolver's `fetch_value` / `fetch_many` in a `FetchCache`.
+
+    Put it before the resolver class in the bases, e.g.
+    `class CachedResolver(FetchCacheMixin, MyResolver)`, and pass
+    `fetch_cache=FetchCache(...)` to the constructor. Keys use
+    `cache_source`, which defaults to the resolver class name.
+    """
+
+    cache_source: Optional[str] = None
+
+    def __init__(self, *args, fetch_cache: Optional[FetchCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fetch_cache = fetch_cache if fetch_cache is not None else FetchCache()
+
+    def _cache_source(self) -> str:
+        if self.cache_source is not None:
+            return self.cache_source
+        # Name of the wrapped resolver class, not of the cached subclass
+        for cls in type(self).__mro__:
+            if not issubclass(cls, FetchCacheMixin):
+                return cls.__name__
+        return type(self).__name__
+
+    def fetch_value(self, question_id: str, date: str) -> Any:
+        return self.fetch_many(question_id, [date])[0]
+
+    def fetch_many(self, question_id: str, dates: Sequence[str]) -> List[Any]:
+        """Values per date, fetching only the dates not cached (once each)."""
+        source = self._cache_source()
+        unique = list(dict.fromkeys(dates))
+        cached = self.fetch_cache.get_many([(source, question_id, d) for d in unique])
+        values = dict(zip(unique, cached))
+        missing = [d for d in unique if values[d] is MISSING]
+        if missing:
+            batch, fetch_one = super().fetch_many, super().fetch_value
+            if len(missing) > 1 and getattr(batch, '__func__', None) is not BaseResolver.fetch_many:
+                fetched = batch(question_id, missing)
+            else:
+                # The default fetch_many would call back into the cached fetch_value
+                fetched = [fetch_one(question_id, d) for d in missing]
+            fetched = [_normalize(v) for v in fetched]
+            values.update(zip(missing, fetched))
+            self.fetch_cache.put_many([((source, question_id, d), v) for d, v in zip(missing, fetched)])
+        return [values[d] for d in dates]
+
+
+# Subclasses made by with_fetch_cache, per wrapped resolver class
+_CACHED_CLASSES: Dict[type, type] = {}
+
+
+def _restore_cached(module: str, qualname: str, state: Dict[str, Any]):
+    """Unpickle an instance of a `with_fetch_cache` class from its wrapped class's location."""
+    cls = sys.modules.get(module) or importlib.import_module(module)
+    for part in qualname.split('.'):
+        cls = getattr(cls, part)
+    # Decorator use rebinds the wrapped class's name to the cached subclass
+    if not issubclass(cls, FetchCacheMixin):
+        cls = with_fetch_cache(cls)
+    obj = cls.__new__(cls)
+    obj.__dict__.update(state)
+    return obj
+
+
+def _reduce_cached(self):
+    wrapped = type(self)._wrapped_resolver
+    return _restore_cached, (wrapped.__module__, wrapped.__qualname__, dict(self.__dict__))
+
+
+def with_fetch_cache(resolver_cls: type) -> type:
+    """
+    Class decorator: a subclass of `resolver_cls` whose fetches go through a FetchCache.
+
+    The subclass is named `Cached<Name>` and is made once per resolver
+    class. Its instances pickle by reference to `resolver_cls`, so both
+    `Cached = with_fetch_cache(MyResolver)` and decorator use can be sent
+    to process pools.
+    """
+    cached = _CACHED_CLASSES.get(resolver_cls)
+    if cached is None:
+        cached = type(f"Cached{resolver_cls.__name__}", (FetchCacheMixin, resolver_cls), {
+            '__module__': resolver_cls.__module__,
+            '__qualname__': f"Cached{resolver_cls.__qualname__}",
+            '__doc__': resolver_cls.__doc__,
+            '__reduce__': _reduce_cached,
+            '_wrapped_resolver': resolver_cls,
+        })
+        _CACHED_CLASSES[resolver_cls] = cached
+    return cached
@@ -0,0 +1,254 @@
+"""
+Streaming, parallel dataset generation for the templatized catalogue.
+
+`iter_dataset` splits the selected templates into chunks of `chunk_size`
+and resolves each chunk with `resolver.resolve_many` over the whole date
+grid, in a process pool when `workers > 1`. At most `max_in_flight` chunks
+are submitted and not yet consumed at any time, and chunks are yielded in
+submission order. The output is therefore the same sequence as
+`generate_dataset`, whatever the worker count. Memory is bounded by the
+window, not by the catalogue.
+
+`write_dataset` drains the stream into a sink:
+- `JsonlSink`: one JSON object per resolved question, in a file
+- `ColumnarSink`: a directory of numbered snapshot parts (see
+  `fortest.loader.snapshot`), one per chunk, with text columns for the
+  string fields, `resolved_to` as float64 (NaN when unresolved) and
+  `resolution_value` JSON-encoded
+
+Sinks replace what is already at their path unless opened with
+`append=True`, so writing the same dataset twice gives the same output.
+
+The resolver and the date grid are sent to each worker once, when the
+worker starts; tasks carry only their templates. Resolvers must therefore
+be picklable (`StoreBackedResolver` reopens its store by path).
+"""
+
+import json
+import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from fortest.loader.snapshot import Snapshot, write_snapshot
+from .resolver import (
+    BaseResolver,
+    DatePair,
+    ResolvedQuestion,
+    TemplatedQuestion,
+    TemplateLoader,
+    _date_pairs,
+    _select_templates,
+)
+
+# ResolvedQuestion fields stored as text columns, in field order
+_TEXT_FIELDS = ('id', 'source', 'question', 'forecast_due_date', 'resolution_date')
+
+# Per-worker state set by _init_worker
+_WORKER_RESOLVER: Optional[BaseResolver] = None
+_WORKER_DATE_PAIRS: List[DatePair] = []
+
+
+def _init_worker(resolver: BaseResolver, date_pairs: List[DatePair]):
+    global _WORKER_RESOLVER, _WORKER_DATE_PAIRS
+    _WORKER_RESOLVER = resolver
+    _WORKER_DATE_PAIRS = date_pairs
+
+
+def _resolve_chunk(templates: List[TemplatedQuestion]) -> List[ResolvedQuestion]:
+    return _WORKER_RESOLVER.resolve_many(templates, _WORKER_DATE_PAIRS)
+
+
+def _chunks(items: Sequence, size: int) -> Iterator[List]:
+    for start in range(0, len(items), size):
+        yield list(items[start:start + size])
+
+
+def iter_dataset_chunks(
+    loader: TemplateLoader,
+    resolver: BaseResolver,
+    forecast_due_date: str = None,
+    resolution_date: str = None,
+    sources: List[str] = None,
+    date_pairs: Sequence[DatePair] = None,
+    workers: int = 1,
+    chunk_size: int = 64,
+    max_in_flight: int = None,
+    templates: Sequence[TemplatedQuestion] = None,
+) -> Iterator[List[ResolvedQuestion]]:
+    """
+    Resolved questions one template chunk at a time, in catalogue order.
+
+    Args:
+        loader: TemplateLoader with templates
+        resolver: Resolver to use (picklable when workers > 1)
+        forecast_due_date: Start date (YYYY-MM-DD)
+        resolution_date: End date (YYYY-MM-DD)
+        sources: Optional list of sources to include
+        date_pairs: Grid of (forecast_due_date, resolution_date) pairs, instead of one pair
+        workers: Worker processes; 1 resolves in this process
+        chunk_size: Templates per task
+        max_in_flight: Chunks submitted but not yet yielded (default: 2 per worker)
+        templates: Templates to resolve, instead of selecting them from `loader` by `sources`
+
+    Returns:
+        Iterator over lists of ResolvedQuestion, each template-major
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    date_pairs = _date_pairs(forecast_due_date, resolution_date, date_pairs)
+    if templates is None:
+        templates = _select_templates(loader, sources)
+    chunks = _chunks(templates, chunk_size)
+
+    workers = min(workers or 1, -(-len(templates) // chunk_size))
+    if workers <= 1:
+        for chunk in chunks:
+            yield resolver.resolve_many(chunk, date_pairs)
+        return
+
+    window = max(max_in_flight or 2 * workers, 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(resolver, date_pairs)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            pending.append(pool.submit(_resolve_chunk, chunk))
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_dataset(loader: TemplateLoader, resolver: BaseResolver, **kwargs) -> Iterator[ResolvedQuestion]:
+    """Generator form of `generate_dataset`; takes the arguments of `iter_dataset_chunks`."""
+    for chunk in iter_dataset_chunks(loader, resolver, **kwargs):
+        yield from chunk
+
+
+class JsonlSink:
+    """Writes resolved questions to a JSON Lines file, truncating it unless `append` is set."""
+
+    def __init__(self, path, append: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a' if append else 'w', encoding='utf-8')
+
+    def write(self, results: Sequence[ResolvedQuestion]):
+        self._file.writelines(json.dumps(asdict(r), ensure_ascii=False) + '\n' for r in results)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ColumnarSink:
+    """
+    Writes each chunk of resolved questions as the next snapshot part of a directory.
+
+    Existing parts are removed when the sink is opened unless `append` is
+    set, in which case numbering continues after them.
+    """
+
+    def __init__(self, path, append: bool = False):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        if not append:
+            for part in _parts(self.path):
+                shutil.rmtree(part)
+        self._next_part = len(_parts(self.path))
+
+    def write(self, results: Sequence[ResolvedQuestion]):
+        if not results:
+            return
+        resolved_to = [np.nan if r.resolved_to is None else r.resolved_to for r in results]
+        write_snapshot(
+            self.path / f"part-{self._next_part:05d}",
+            arrays={'resolved_to': np.array(resolved_to, dtype=np.float64)},
+            texts={
+                **{name: [getattr(r, name) for r in results] for name in _TEXT_FIELDS},
+                'resolution_value': [json.dumps(r.resolution_value) for r in results],
+            },
+        )
+        self._next_part += 1
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _parts(path: Path) -> List[Path]:
+    return sorted(p for p in path.glob('part-*') if Snapshot.exists(p))
+
+
+def open_sink(path, format: str = None, append: bool = False) -> Union[JsonlSink, ColumnarSink]:
+    """Sink for `path`: 'jsonl' (the default for *.jsonl paths) or 'columnar'; see the sinks for `append`."""
+    format = format or ('jsonl' if str(path).endswith('.jsonl') else 'columnar')
+    if format == 'jsonl':
+        return JsonlSink(path, append)
+    if format == 'columnar':
+        return ColumnarSink(path, append)
+    raise ValueError(f"Unknown sink format: {format}. Available: ['jsonl', 'columnar']")
+
+
+def write_dataset(sink, loader: TemplateLoader, resolver: BaseResolver, append: bool = False, **kwargs) -> int:
+    """
+    Stream a generated dataset into a sink, one chunk at a time.
+
+    Args:
+        sink: JsonlSink, ColumnarSink or a path passed to `open_sink`
+        loader: TemplateLoader with templates
+        resolver: Resolver to use
+        append: When `sink` is a path, add to what is there instead of replacing it
+        **kwargs: Arguments of `iter_dataset_chunks` (dates, sources, workers, ...)
+
+    Returns:
+        Number of resolved questions written
+    """
+    owned = not isinstance(sink, (JsonlSink, ColumnarSink))
+    if owned:
+        sink = open_sink(sink, append=append)
+    written = 0
+    try:
+        for chunk in iter_dataset_chunks(loader, resolver, **kwargs):
+            sink.write(chunk)
+            written += len(chunk)
+    finally:
+        if owned:
+            sink.close()
+    return written
+
+
+def read_dataset(path) -> Iterator[ResolvedQuestion]:
+    """Resolved questions written by a sink, in write order."""
+    path = Path(path)
+    if path.is_file():
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield ResolvedQuestion(**json.loads(line))
+        return
+    for part in _parts(path):
+        snapshot = Snapshot(part)
+        columns = {name: snapshot.text(name).tolist() for name in (*_TEXT_FIELDS, 'resolution_value')}
+        resolved_to = snapshot.array('resolved_to').tolist()
+        for i in range(snapshot.rows):
+            yield ResolvedQuestion(
+                **{name: columns[name][i] for name in _TEXT_FIELDS},
+                resolved_to=None if np.isnan(resolved_to[i]) else resolved_to[i],
+                resolution_value=json.loads(columns['resolution_value'][i]),
+            )
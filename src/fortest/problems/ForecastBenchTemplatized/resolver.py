@@ -9,30 +9,202 @@ TODO: Implement actual data fetching and resolution logic.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Dict, Any, Optional, List
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Sequence, Tuple
+import re
 import json
 from pathlib import Path
 
+import numpy as np
+
+from fortest.loader.cache import file_fingerprint
+from .store import SeriesStore
+
+# (forecast_due_date, resolution_date), both YYYY-MM-DD
+DatePair = Tuple[str, str]
+
+
+# Template fields read from templates.json on access instead of held in memory
+LAZY_FIELDS = ('resolution_criteria', 'background', 'source_intro')
+
+
+class _TemplateSpan:
+    """
+    Byte range of one template object in templates.json.
+
+    The span is decoded once, on first access, and all `LAZY_FIELDS` are
+    kept together. Offsets are only trusted while the file's (mtime, size)
+    fingerprint matches the one recorded when the templates were indexed.
+    """
+
+    __slots__ = ('path', 'start', 'end', 'fingerprint', '_fields')
+
+    def __init__(self, path: Path, start: int, end: int, fingerprint: Tuple[str, int, int] = None):
+        self.path = path
+        self.start = start
+        self.end = end
+        self.fingerprint = fingerprint if fingerprint is not None else file_fingerprint(path)
+        self._fields: Optional[Dict[str, str]] = None
+
+    def read(self, field: str) -> str:
+        if self._fields is None:
+            self._fields = self._decode()
+        return self._fields[field]
+
+    def _decode(self) -> Dict[str, str]:
+        if file_fingerprint(self.path) != self.fingerprint:
+            raise ValueError(f"{self.path} changed since its templates were loaded; reload the TemplateLoader")
+        with open(self.path, 'rb') as f:
+            f.seek(self.start)
+            data = f.read(self.end - self.start)
+        template = json.loads(data)
+        return {field: template.get(field, '') for field in LAZY_FIELDS}
+
+
+# Fields that may hold {forecast_due_date} / {resolution_date} placeholders
+RENDERABLE_FIELDS = ('question_template', 'resolution_criteria', 'background')
+
+_PLACEHOLDER_RE = re.compile(r'(\{forecast_due_date\}|\{resolution_date\})')
+
+
+def _legacy_render(text: str, forecast_due_date: str, resolution_date: str) -> str:
+    return text.replace('{forecast_due_date}', forecast_due_date).replace('{resolution_date}', resolution_date)
+
+
+def compile_template(text: str) -> Tuple[str, ...]:
+    """
+    Split a template into literal segments and placeholder slots.
+
+    Returns:
+        Tuple alternating literal segments (even positions) with the
+        placeholders between them (odd positions)
+    """
+    return tuple(_PLACEHOLDER_RE.split(text))
+
+
+def _fill_due_date(parts: Tuple[str, ...], forecast_due_date: str) -> List[str]:
+    """Segments left between resolution date slots once the due date is filled in."""
+    segments, current = [], parts[0]
+    for i in range(1, len(parts), 2):
+        if parts[i] == '{forecast_due_date}':
+            current += forecast_due_date + parts[i + 1]
+        else:
+            segments.append(current)
+            current = parts[i + 1]
+    segments.append(current)
+    return segments
+
+
+def render_compiled(parts: Tuple[str, ...], text: str, date_pairs: Sequence[DatePair]) -> List[str]:
+    """
+    Render a compiled template (see `compile_template`) for every date pair.
+
+    The due date is filled in once per distinct due date; each pair is
+    then one join of the remaining segments on its resolution date. The
+    output equals replacing {forecast_due_date} and then {resolution_date}
+    in `text`. A due date containing braces could form a placeholder with
+    the text around it under that rule, so such pairs fall back to the
+    replacements.
+    """
+    by_due = {}
+    rendered = []
+    for d, r in date_pairs:
+        segments = by_due.get(d)
+        if segments is None:
+            segments = by_due[d] = False if '{' in d or '}' in d else _fill_due_date(parts, d)
+        rendered.append(r.join(segments) if segments else _legacy_render(text, d, r))
+    return rendered
+
+
+def _lazy_field(name: str) -> property:
+    slot = f'_{name}'
+
+    def get(self) -> str:
+        value = getattr(self, slot)
+        return value.read(name) if isinstance(value, _TemplateSpan) else value
+
+    def set(self, value: str):
+        setattr(self, slot, value)
+
+    return property(get, set, doc=f"Template {name} (read from templates.json on first access when loaded lazily).")
+
 
-@dataclass
 class TemplatedQuestion:
-    """A templatized question with placeholders for dates."""
-    id: str
-    source: str
-    question_template: str
-    resolution_criteria: str
-    background: str
-    url: str
-    source_intro: str
+    """
+    A templatized question with placeholders for dates.
+
+    `resolution_criteria`, `background` and `source_intro` may be given as a
+    `_TemplateSpan`, in which case they are read from templates.json when
+    first accessed rather than at load time.
+    """
+
+    __slots__ = ('id', 'source', 'question_template', 'url', '_resolution_criteria', '_background', '_source_intro',
+                 '_compiled')
+
+    def __init__(
+        self,
+        id: str,
+        source: str,
+        question_template: str,
+        resolution_criteria: str,
+        background: str,
+        url: str,
+        source_intro: str,
+    ):
+        self.id = id
+        self.source = source
+        self.question_template = question_template
+        self._resolution_criteria = resolution_criteria
+        self._background = background
+        self.url = url
+        self._source_intro = source_intro
+        self._compiled = None
+
+    resolution_criteria = _lazy_field('resolution_criteria')
+    background = _lazy_field('background')
+    source_intro = _lazy_field('source_intro')
+
+    def _fields(self) -> Tuple:
+        return (self.id, self.source, self.question_template, self.resolution_criteria,
+                self.background, self.url, self.source_intro)
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __repr__(self) -> str:
+        return f"TemplatedQuestion(id={self.id!r}, source={self.source!r}, question_template={self.question_template!r})"
     
-    def render(self, forecast_due_date: str, resolution_date: str) -> str:
-        """Render the question with actual dates."""
-        return self.question_template.replace(
-            '{forecast_due_date}', forecast_due_date
-        ).replace(
-            '{resolution_date}', resolution_date
-        )
+    def _compile(self, field: str) -> Tuple[str, Tuple[str, ...]]:
+        """(text, compiled parts) of a renderable field."""
+        if field not in RENDERABLE_FIELDS:
+            raise ValueError(f"Cannot render field {field!r}. Available: {list(RENDERABLE_FIELDS)}")
+        text = getattr(self, field)
+        if field != 'question_template':
+            # Only the question keeps its compiled form; other fields are compiled per call
+            return text, compile_template(text)
+        if self._compiled is None or self._compiled[0] is not text:
+            self._compiled = (text, compile_template(text))
+        return self._compiled
+    
+    def render(self, forecast_due_date: str, resolution_date: str, field: str = 'question_template') -> str:
+        """Render the question (or another renderable field) with actual dates."""
+        return self.render_many([(forecast_due_date, resolution_date)], field)[0]
+
+    def render_many(self, date_pairs: Sequence[DatePair], field: str = 'question_template') -> List[str]:
+        """
+        Render a field for every (forecast_due_date, resolution_date) pair.
+
+        Args:
+            date_pairs: (forecast_due_date, resolution_date) pairs
+            field: One of RENDERABLE_FIELDS
+
+        Returns:
+            Rendered strings, one per pair
+        """
+        text, parts = self._compile(field)
+        return render_compiled(parts, text, date_pairs)
 
 
 @dataclass 
@@ -65,6 +237,132 @@ class BaseResolver(ABC):
         """Resolve a templatized question for given dates."""
         pass
 
+    def fetch_many(self, question_id: str, dates: Sequence[str]) -> List[Any]:
+        """
+        Fetch the values for a question at several dates.
+
+        The default calls `fetch_value` once per distinct date; resolvers
+        that can read a whole series at once should override it.
+        """
+        values = {d: self.fetch_value(question_id, d) for d in dict.fromkeys(dates)}
+        return [values[d] for d in dates]
+
+    def resolve_many(
+        self,
+        templates: Sequence[TemplatedQuestion],
+        date_pairs: Sequence[DatePair],
+    ) -> List[ResolvedQuestion]:
+        """
+        Resolve every template for every (forecast_due_date, resolution_date) pair.
+
+        The default calls `resolve` for each combination. Resolvers should
+        override it to fetch each template's series once (see `fetch_many`)
+        and resolve the whole grid with array comparisons (see
+        `resolve_increase_grid`).
+
+        Args:
+            templates: Templates to resolve
+            date_pairs: (forecast_due_date, resolution_date) pairs
+
+        Returns:
+            ResolvedQuestion list, template-major: all pairs of the first
+            template, then all pairs of the next
+        """
+        return [self.resolve(t, due, res) for t in templates for due, res in date_pairs]
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def resolve_increase_grid(
+    template: TemplatedQuestion,
+    date_pairs: Sequence[DatePair],
+    values: Dict[str, Any],
+) -> List[ResolvedQuestion]:
+    """
+    Resolve "has X increased by {resolution_date} compared to {forecast_due_date}?"
+    for every date pair from one fetch of the series.
+
+    Args:
+        template: Template to resolve
+        date_pairs: (forecast_due_date, resolution_date) pairs
+        values: Series value per date, covering every date in `date_pairs`
+                (missing or non-numeric values leave the question unresolved)
+
+    Returns:
+        One ResolvedQuestion per pair, in order; resolved_to is 1.0 when the
+        value at the resolution date is higher, 0.0 when not, None when
+        either value is missing
+    """
+    due = np.array([_as_float(values.get(d)) for d, _ in date_pairs], dtype=np.float64)
+    res = np.array([_as_float(values.get(r)) for _, r in date_pairs], dtype=np.float64)
+    known = ~(np.isnan(due) | np.isnan(res))
+    outcome = (res > due).astype(np.float64).tolist()
+    known = known.tolist()
+    questions = template.render_many(date_pairs)
+    return [
+        ResolvedQuestion(
+            id=template.id,
+            source=template.source,
+            question=questions[i],
+            forecast_due_date=d,
+            resolution_date=r,
+            resolved_to=outcome[i] if known[i] else None,
+            resolution_value=values.get(r),
+        )
+        for i, (d, r) in enumerate(date_pairs)
+    ]
+
+
+def date_grid(
+    forecast_due_dates: Iterable[str],
+    resolution_dates: Iterable[str] = None,
+    horizons: Iterable[int] = None,
+) -> List[DatePair]:
+    """
+    Cross product of forecast due dates with resolution dates or horizons.
+
+    Args:
+        forecast_due_dates: Due dates (YYYY-MM-DD)
+        resolution_dates: Resolution dates; pairs not after their due date are dropped
+        horizons: Alternatively, horizons in days added to each due date
+
+    Returns:
+        (forecast_due_date, resolution_date) pairs, due-date-major
+    """
+    if (resolution_dates is None) == (horizons is None):
+        raise ValueError("Pass exactly one of resolution_dates or horizons")
+    due_dates = list(forecast_due_dates)
+    if horizons is not None:
+        horizons = list(horizons)
+        return [(d, (date.fromisoformat(d) + timedelta(days=h)).isoformat())
+                for d in due_dates for h in horizons if h > 0]
+    resolution_dates = list(resolution_dates)
+    return [(d, r) for d in due_dates for r in resolution_dates if r > d]
+
+
+def rolling_origins(start: str, end: str, step_days: int = 7) -> List[str]:
+    """
+    Forecast origins from `start` to `end` (inclusive), every `step_days` days.
+
+    Args:
+        start: First origin (YYYY-MM-DD)
+        end: Last possible origin (YYYY-MM-DD)
+        step_days: Days between origins
+
+    Returns:
+        ISO dates, ascending
+    """
+    if step_days < 1:
+        raise ValueError(f"step_days must be positive, got {step_days}")
+    first, last = date.fromisoformat(start), date.fromisoformat(end)
+    count = (last - first).days // step_days + 1 if last >= first else 0
+    return [(first + timedelta(days=i * step_days)).isoformat() for i in range(count)]
+
 
 class DummyResolver(BaseResolver):
     """Dummy resolver for testing - always returns None."""
@@ -91,31 +389,151 @@ class DummyResolver(BaseResolver):
         )
 
 
+class StoreBackedResolver(BaseResolver):
+    """
+    Offline resolver reading series from a local `SeriesStore`.
+
+    A template's series is the store entry named by the template id; values
+    are as-of lookups (last observation on or before the date, never past
+    the series' last observation, and at most `max_staleness_days` old when
+    set). Questions resolve as "has the value increased by the resolution
+    date compared to the forecast due date", and stay unresolved when
+    either value is missing.
+    """
+
+    def __init__(self, store, max_staleness_days: Optional[int] = None):
+        self.store = store if isinstance(store, SeriesStore) else SeriesStore(store)
+        self.max_staleness_days = max_staleness_days
+
+    def fetch_value(self, question_id: str, date: str) -> Optional[float]:
+        """Value of the series on `date` (as of), or None."""
+        return self.store.as_of(question_id, date, self.max_staleness_days)
+
+    def fetch_many(self, question_id: str, dates: Sequence[str]) -> List[Optional[float]]:
+        """Values of the series on each date, in one vectorized lookup."""
+        values = self.store.as_of_many(question_id, dates, self.max_staleness_days)
+        return [None if np.isnan(v) else v for v in values.tolist()]
+
+    def resolve(
+        self,
+        template: TemplatedQuestion,
+        forecast_due_date: str,
+        resolution_date: str
+    ) -> ResolvedQuestion:
+        return self.resolve_many([template], [(forecast_due_date, resolution_date)])[0]
+
+    def resolve_many(
+        self,
+        templates: Sequence[TemplatedQuestion],
+        date_pairs: Sequence[DatePair],
+    ) -> List[ResolvedQuestion]:
+        """Resolve the grid reading each template's series once."""
+        dates = list(dict.fromkeys(d for pair in date_pairs for d in pair))
+        results = []
+        for template in templates:
+            values = dict(zip(dates, self.fetch_many(template.id, dates)))
+            results.extend(resolve_increase_grid(template, date_pairs, values))
+        return results
+
+
+def _template_spans(text: str) -> Iterator[Tuple[Dict[str, Any], int, int]]:
+    """
+    Each object of the top-level "templates" array with its character span.
+
+    Walks the outer object with the JSON scanner, decoding one template at
+    a time, so no offsets have to be searched for in the text.
+    """
+    decoder = json.JSONDecoder()
+    ws = json.decoder.WHITESPACE
+
+    def skip(pos: int, char: str = None) -> int:
+        pos = ws.match(text, pos).end()
+        if char is not None:
+            if text[pos:pos + 1] != char:
+                raise ValueError(f"Expected {char!r} at position {pos} of templates file")
+            pos = ws.match(text, pos + 1).end()
+        return pos
+
+    pos = skip(0, '{')
+    while text[pos:pos + 1] != '}':
+        if text[pos:pos + 1] != '"':
+            raise ValueError(f"Expected a key at position {pos} of templates file")
+        key, pos = json.decoder.scanstring(text, pos + 1)
+        pos = skip(pos, ':')
+        if key == 'templates':
+            pos = skip(pos, '[')
+            while text[pos:pos + 1] != ']':
+                start = pos
+                template, pos = decoder.raw_decode(text, pos)
+                yield template, start, pos
+                pos = skip(pos)
+                if text[pos:pos + 1] == ',':
+                    pos = skip(pos + 1)
+            pos += 1
+        else:
+            _, pos = decoder.raw_decode(text, pos)
+        pos = skip(pos)
+        if text[pos:pos + 1] == ',':
+            pos = skip(pos + 1)
+
+
+# The bundled catalogue, loaded when no templates path is given
+DEFAULT_TEMPLATES_PATH = Path(__file__).parent / 'templates.json'
+
+
 class TemplateLoader:
-    """Load and manage templatized questions."""
+    """
+    Load and manage templatized questions.
+
+    Templates are indexed by id and by source when loaded, so lookups do
+    not scan the template list. With `lazy_text` (the default) the long
+    fields (`LAZY_FIELDS`) stay in templates.json until one of a template's
+    fields is accessed; its byte range is then decoded once.
+    """
     
-    def __init__(self, templates_path: str = None):
+    def __init__(self, templates_path: str = None, lazy_text: bool = True):
         if templates_path is None:
-            templates_path = Path(__file__).parent / 'templates.json'
+            templates_path = DEFAULT_TEMPLATES_PATH
         self.templates_path = Path(templates_path)
+        self.lazy_text = lazy_text
         self._templates: List[TemplatedQuestion] = []
+        self._by_id: Dict[str, TemplatedQuestion] = {}
+        self._by_source: Dict[str, List[TemplatedQuestion]] = {}
         self._load()
     
     def _load(self):
-        """Load templates from JSON file."""
-        with open(self.templates_path) as f:
-            data = json.load(f)
+        """Load templates from JSON file and build the id and source indexes."""
+        fingerprint = file_fingerprint(self.templates_path)
+        data = self.templates_path.read_bytes()
+        text = data.decode('utf-8')
+        if text.isascii():
+            byte_offset = None
+        else:
+            # Byte position of every character (UTF-8 lead bytes), plus the end
+            raw = np.frombuffer(data, dtype=np.uint8)
+            byte_offset = np.append(np.flatnonzero((raw & 0xC0) != 0x80), len(data))
         
-        for t in data.get('templates', []):
-            self._templates.append(TemplatedQuestion(
+        for t, start, end in _template_spans(text):
+            if self.lazy_text:
+                if byte_offset is not None:
+                    start, end = int(byte_offset[start]), int(byte_offset[end])
+                span = _TemplateSpan(self.templates_path, start, end, fingerprint)
+                lazy = {field: span for field in LAZY_FIELDS}
+            else:
+                lazy = {field: t.get(field, '') for field in LAZY_FIELDS}
+            self._add(TemplatedQuestion(
                 id=t['id'],
                 source=t['source'],
                 question_template=t['question_template'],
-                resolution_criteria=t.get('resolution_criteria', ''),
-                background=t.get('background', ''),
                 url=t.get('url', ''),
-                source_intro=t.get('source_intro', ''),
+                **lazy,
             ))
+
+    def _add(self, template: TemplatedQuestion):
+        self._templates.append(template)
+        # The first template with an id wins, as the old linear scan did
+        self._by_id.setdefault(template.id, template)
+        self._by_source.setdefault(template.source, []).append(template)
     
     @property
     def templates(self) -> List[TemplatedQuestion]:
@@ -124,48 +542,66 @@ class TemplateLoader:
     
     def get_by_source(self, source: str) -> List[TemplatedQuestion]:
         """Get templates by source."""
-        return [t for t in self._templates if t.source == source]
+        return list(self._by_source.get(source, ()))
     
     def get_by_id(self, question_id: str) -> Optional[TemplatedQuestion]:
         """Get template by ID."""
-        for t in self._templates:
-            if t.id == question_id:
-                return t
-        return None
+        return self._by_id.get(question_id)
     
     @property
     def sources(self) -> List[str]:
-        """Get unique sources."""
-        return list(set(t.source for t in self._templates))
+        """Get unique sources, in order of first appearance."""
+        return list(self._by_source)
 
 
 def generate_dataset(
     loader: TemplateLoader,
     resolver: BaseResolver,
-    forecast_due_date: str,
-    resolution_date: str,
+    forecast_due_date: str = None,
+    resolution_date: str = None,
     sources: List[str] = None,
+    date_pairs: Sequence[DatePair] = None,
 ) -> List[ResolvedQuestion]:
     """
     Generate a dataset of resolved questions for given dates.
     
+    Pass either one `forecast_due_date`/`resolution_date` pair or, in grid
+    mode, `date_pairs` (see `date_grid`). Either way the templates are
+    resolved in one `resolver.resolve_many` call.
+    
     Args:
         loader: TemplateLoader with templates
         resolver: Resolver to use for resolution
         forecast_due_date: Start date (YYYY-MM-DD)
         resolution_date: End date (YYYY-MM-DD)
         sources: Optional list of sources to include
+        date_pairs: Grid of (forecast_due_date, resolution_date) pairs
     
     Returns:
-        List of ResolvedQuestion objects
+        List of ResolvedQuestion objects, template-major in grid mode
     """
-    results = []
-    
-    for template in loader.templates:
-        if sources and template.source not in sources:
-            continue
-        
-        resolved = resolver.resolve(template, forecast_due_date, resolution_date)
-        results.append(resolved)
-    
-    return results
+    date_pairs = _date_pairs(forecast_due_date, resolution_date, date_pairs)
+    return resolver.resolve_many(_select_templates(loader, sources), date_pairs)
+
+
+def _date_pairs(
+    forecast_due_date: Optional[str],
+    resolution_date: Optional[str],
+    date_pairs: Optional[Sequence[DatePair]],
+) -> List[DatePair]:
+    """The date pairs of a generate call: one explicit pair or a grid, never both."""
+    if date_pairs is None:
+        if forecast_due_date is None or resolution_date is None:
+            raise ValueError("Pass forecast_due_date and resolution_date, or date_pairs")
+        return [(forecast_due_date, resolution_date)]
+    if forecast_due_date is not None or resolution_date is not None:
+        raise ValueError("Pass either forecast_due_date/resolution_date or date_pairs, not both")
+    return list(date_pairs)
+
+
+def _select_templates(loader: TemplateLoader, sources: Optional[List[str]]) -> List[TemplatedQuestion]:
+    """Templates of the given sources (all if None), in catalogue order."""
+    if not sources:
+        return list(loader.templates)
+    sources = set(sources)
+    return [t for t in loader.templates if t.source in sources]
@@ -0,0 +1,206 @@
+"""
+Local columnar time-series store for offline resolution.
+
+A store is a directory holding every series as one run of sorted int64
+epoch days (`dates.npy`) and float64 values (`values.npy`). Each series
+occupies the slice `offsets[i]:offsets[i + 1]`, and `meta.json` maps series
+ids to their position. The arrays are opened with `mmap_mode='r'`, so
+opening a store is cheap and lookups only touch the pages of the series
+they read.
+
+Lookups are as-of: the value of a series at a date is its last
+observation on or before that date, found by `searchsorted`. Dates after
+a series' last observation have no value; it is never carried forward
+past the end of the data.
+
+Stores are built from local files (see `build_series_store`):
+- CSV with `series_id,date,value` columns (long format), or `date,value`
+  with the series id taken from the file name
+- JSON as {series_id: {date: value}} or {series_id: [[date, value], ...]}
+"""
+
+import os
+import csv
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fortest.loader.timecols import NAT, to_epoch_days
+
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+
+# Raw observations of one series: (dates, values)
+Observations = Tuple[List[str], List[float]]
+
+
+def _as_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _sorted_series(dates: Sequence[str], values: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """Epoch days and values sorted by date, without unparseable rows; a repeated date keeps its last value."""
+    days = to_epoch_days(dates)
+    vals = np.array([_as_float(v) for v in values], dtype=np.float64)
+    keep = (days != NAT) & ~np.isnan(vals)
+    days, vals = days[keep], vals[keep]
+    order = np.argsort(days, kind="stable")
+    days, vals = days[order], vals[order]
+    last = np.r_[days[1:] != days[:-1], True] if len(days) else np.zeros(0, dtype=bool)
+    return days[last], vals[last]
+
+
+def write_series_store(path, series: Dict[str, Observations]) -> Path:
+    """
+    Write a store directory, replacing any existing one atomically.
+
+    Args:
+        path: Store directory to create
+        series: Dict[series_id -> (dates, values)]; dates are ISO strings,
+                values anything `float()` accepts (others are dropped)
+
+    Returns:
+        Path of the written store
+    """
+    path = Path(path)
+    ids = sorted(series)
+    parts = [_sorted_series(*series[sid]) for sid in ids]
+    offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum([len(d) for d, _ in parts], out=offsets[1:])
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=f".{path.name}.", dir=path.parent))
+    try:
+        np.save(tmp / "dates.npy", np.concatenate([d for d, _ in parts]) if parts else np.empty(0, np.int64))
+        np.save(tmp / "values.npy", np.concatenate([v for _, v in parts]) if parts else np.empty(0, np.float64))
+        np.save(tmp / "offsets.npy", offsets)
+        with open(tmp / META_FILE, "w") as f:
+            json.dump({"format_version": FORMAT_VERSION, "series": ids}, f)
+        if path.exists():
+            shutil.rmtree(path)
+        os.replace(tmp, path)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return path
+
+
+def read_series_file(path) -> Dict[str, Observations]:
+    """Observations per series in one CSV or JSON file (see module docstring)."""
+    path = Path(path)
+    series: Dict[str, Observations] = {}
+    if path.suffix.lower() == ".json":
+        with open(path) as f:
+            data = json.load(f)
+        for sid, obs in data.items():
+            pairs = obs.items() if isinstance(obs, dict) else obs
+            dates, values = series.setdefault(str(sid), ([], []))
+            for d, v in pairs:
+                dates.append(d)
+                values.append(v)
+        return series
+
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            sid = row.get("series_id") or path.stem
+            dates, values = series.setdefault(sid, ([], []))
+            dates.append(row.get("date"))
+            values.append(row.get("value"))
+    return series
+
+
+def build_series_store(files: Iterable, path) -> Path:
+    """
+    Ingest local CSV/JSON files into a store at `path`.
+
+    Observations of a series spread over several files are merged; for a
+    date present in more than one, the file listed last wins.
+    """
+    merged: Dict[str, Observations] = {}
+    for file in files:
+        for sid, (dates, values) in read_series_file(file).items():
+            target = merged.setdefault(sid, ([], []))
+            target[0].extend(dates)
+            target[1].extend(values)
+    return write_series_store(path, merged)
+
+
+class SeriesStore:
+    """Memory-mapped view of a store directory."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / META_FILE) as f:
+            info = json.load(f)
+        if info.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported series store format in {self.path}: {info.get('format_version')}")
+        self.series_ids: List[str] = info["series"]
+        self._position = {sid: i for i, sid in enumerate(self.series_ids)}
+        self._dates = np.load(self.path / "dates.npy", mmap_mode="r")
+        self._values = np.load(self.path / "values.npy", mmap_mode="r")
+        self._offsets = np.load(self.path / "offsets.npy")
+
+    def __reduce__(self):
+        # Reopen from the path instead of pickling the mapped arrays (process pools)
+        return SeriesStore, (self.path,)
+
+    @classmethod
+    def exists(cls, path) -> bool:
+        """Whether `path` holds a store."""
+        return (Path(path) / META_FILE).exists()
+
+    def __len__(self) -> int:
+        return len(self.series_ids)
+
+    def __contains__(self, series_id) -> bool:
+        return series_id in self._position
+
+    def series(self, series_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(epoch days, values) of a series, sorted by date; KeyError if unknown."""
+        i = self._position[series_id]
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return self._dates[start:end], self._values[start:end]
+
+    def as_of_many(self, series_id: str, dates: Sequence[str], max_staleness_days: Optional[int] = None) -> np.ndarray:
+        """
+        Last observation on or before each date.
+
+        Dates after the series' last observation are unknown rather than
+        carried forward: the value there has not been observed yet.
+
+        Args:
+            series_id: Series to read
+            dates: ISO dates (or datetimes; the date part is used)
+            max_staleness_days: If set, also treat a date as unknown when its
+                                last observation is more than this many days older
+
+        Returns:
+            float64 array, NaN where the series is unknown, has no
+            observation that early, the date is past its last observation
+            or the date does not parse
+        """
+        out = np.full(len(dates), np.nan)
+        if series_id not in self._position:
+            return out
+        days, values = self.series(series_id)
+        if not len(days):
+            return out
+        query = to_epoch_days(dates)
+        pos = np.searchsorted(days, query, side="right") - 1
+        found = (pos >= 0) & (query != NAT) & (query <= days[-1])
+        if max_staleness_days is not None:
+            found &= query - days[pos] <= max_staleness_days
+        out[found] = values[pos[found]]
+        return out
+
+    def as_of(self, series_id: str, date: str, max_staleness_days: Optional[int] = None) -> Optional[float]:
+        """Last observation on or before `date`, or None (see `as_of_many`)."""
+        value = self.as_of_many(series_id, [date], max_staleness_days)[0]
+        return None if np.isnan(value) else float(value)
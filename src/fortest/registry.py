@@ -0,0 +1,58 @@
+"""
+Import-free discovery of registered loaders and search functions.
+
+Modules under `custom_loaders/` and `search_core/` register callables with
+`@ProblemLoader.register(...)` / `@SearchCore.register(...)`. Importing them
+all up front drags in heavy optional dependencies (matplotlib, pandas), so
+instead their source is parsed with `ast` to record which module provides
+which name. The owning module is imported only when a name is resolved.
+"""
+
+import ast
+import pkgutil
+import importlib.util
+from types import ModuleType
+from typing import Dict, Iterable
+
+
+def _registered_names(source: str, owner: str) -> Iterable[str]:
+    """Yield names registered via `@<owner>.register("name")` in `source`."""
+    tree = ast.parse(source)
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        for dec in node.decorator_list:
+            if not (isinstance(dec, ast.Call) and isinstance(dec.func, ast.Attribute)):
+                continue
+            target = dec.func
+            if target.attr != "register" or not (isinstance(target.value, ast.Name) and target.value.id == owner):
+                continue
+            if dec.args and isinstance(dec.args[0], ast.Constant) and isinstance(dec.args[0].value, str):
+                yield dec.args[0].value
+
+
+def scan_registrations(package: ModuleType, owner: str, skip: Iterable[str] = ()) -> Dict[str, str]:
+    """
+    Map registered names to the modules that define them, without importing those modules.
+
+    Args:
+        package: Package whose direct submodules are scanned
+        owner: Class name used in the decorator (e.g. "ProblemLoader")
+        skip: Submodule names to ignore
+
+    Returns:
+        Dict[registered name -> fully qualified module name]
+    """
+    manifest = {}
+    for _, name, ispkg in pkgutil.iter_modules(package.__path__):
+        if ispkg or name in skip:
+            continue
+        module_name = f"{package.__name__}.{name}"
+        spec = importlib.util.find_spec(module_name)
+        if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+            continue
+        with open(spec.origin, encoding="utf-8") as f:
+            source = f.read()
+        for registered in _registered_names(source, owner):
+            manifest[registered] = module_name
+    return manifest
@@ -0,0 +1,73 @@
+import gc
+import json
+import logging
+import argparse
+import tracemalloc
+
+from fortest.loader.loader import ProblemLoader
+from fortest.loader.table import ProblemTable
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _retained(build):
+    """(result, bytes still allocated after building it, peak bytes while building)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak
+
+
+def measure(strategy: str, **loader_kwargs):
+    """
+    Compare the memory held by a loaded problem set as dicts and as a ProblemTable.
+
+    Problems are round-tripped through JSON first, so the dicts own their
+    strings as they would in a fresh evaluation process instead of sharing
+    them with the loader's cache.
+
+    Returns:
+        Dict with problem count and retained/peak bytes for both forms
+    """
+    payload = json.dumps(list(ProblemLoader().iter_load(strategy, **loader_kwargs)))
+
+    dicts, dict_bytes, dict_peak = _retained(
+        lambda: {p["problem_id"]: p for p in json.loads(payload)})
+    count = len(dicts)
+    del dicts
+    _, table_bytes, table_peak = _retained(
+        lambda: ProblemTable.from_problems(json.loads(payload)))
+    return {
+        "problems": count,
+        "dict_bytes": dict_bytes,
+        "dict_peak_bytes": dict_peak,
+        "table_bytes": table_bytes,
+        "table_peak_bytes": table_peak,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory of a problem set as dicts vs a ProblemTable.")
+    parser.add_argument("--strategy", default="forecastbench_v1", help="Loader strategy")
+    parser.add_argument("--max-quest", type=int, default=100000, help="max_quest passed to the loader")
+    args = parser.parse_args()
+
+    result = measure(args.strategy, max_quest=args.max_quest)
+    n = max(result["problems"], 1)
+    logger.info(f"{result['problems']} problems from '{args.strategy}'")
+    for form in ("dict", "table"):
+        logger.info(
+            f"  {form:>5}: {result[f'{form}_bytes'] / 2**20:8.2f} MiB retained "
+            f"({result[f'{form}_bytes'] / n:7.0f} B/problem), "
+            f"{result[f'{form}_peak_bytes'] / 2**20:8.2f} MiB peak")
+    logger.info(f"  ratio: {result['dict_bytes'] / max(result['table_bytes'], 1):.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
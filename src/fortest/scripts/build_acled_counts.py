@@ -0,0 +1,27 @@
+import logging
+import argparse
+from datetime import date, timedelta
+
+from fortest.problems.ForecastBenchTemplatized.acled import AcledCounts
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build ACLED prefix-sum counts from a local ACLED CSV export.")
+    parser.add_argument("export", help="ACLED CSV export (event_date, country, event_type, fatalities)")
+    parser.add_argument("--output", required=True, help=".npz file to write")
+    parser.add_argument("--first-date", default=None, help="First covered date (default: earliest event)")
+    parser.add_argument("--last-date", default=None, help="Last covered date (default: latest event)")
+    args = parser.parse_args()
+
+    counts = AcledCounts.from_export(args.export, args.first_date, args.last_date)
+    path = counts.save(args.output)
+    epoch = date(1970, 1, 1)
+    first, last = epoch + timedelta(days=counts.first_day), epoch + timedelta(days=counts.last_day)
+    logger.info(f"Wrote {len(counts)} series covering {first} to {last} to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import logging
+import argparse
+from pathlib import Path
+
+from fortest.problems.ForecastBenchTemplatized.store import SeriesStore, build_series_store
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest local CSV/JSON series files into a SeriesStore.")
+    parser.add_argument("inputs", nargs="+", help="CSV/JSON files, or directories searched for them")
+    parser.add_argument("--output", required=True, help="Store directory to write")
+    args = parser.parse_args()
+
+    files = []
+    for item in map(Path, args.inputs):
+        if item.is_dir():
+            files.extend(sorted(p for p in item.rglob("*") if p.suffix.lower() in (".csv", ".json")))
+        else:
+            files.append(item)
+
+    path = build_series_store(files, args.output)
+    logger.info(f"Wrote {len(SeriesStore(path))} series from {len(files)} files to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import logging
+import argparse
+
+from fortest.loader.custom_loaders.forecastbench_v1 import build_snapshot
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the ForecastBench_v1 columnar snapshot.")
+    parser.add_argument("--output", default=None, help="Snapshot directory (default: next to the JSON files)")
+    args = parser.parse_args()
+
+    path = build_snapshot(args.output)
+    logger.info(f"Wrote ForecastBench_v1 snapshot to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,247 @@
-
 import os
-import subprocess
+import shutil
+import hashlib
 import logging
+import tarfile
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, Optional
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 REPO_URL = "https://github.com/forecastingresearch/forecastbench-datasets"
-BASE_DIR = os.getcwd() # Use current working directory for data download
-DATA_DIR = os.path.join(BASE_DIR, "data")
-TARGET_DIR = os.path.join(DATA_DIR, "forecastbench")
 
-def ensure_forecastbench_data():
+# Environment variables: shared data location, and a local tarball/directory to install from
+DATA_DIR_ENV = "FORTEST_DATA_DIR"
+SOURCE_ENV = "FORTEST_FORECASTBENCH_SOURCE"
+
+# Per-file hash manifest looked for at the root of a source ("<sha256>  <relative path>" lines)
+MANIFEST_NAME = "SHA256SUMS"
+
+
+def get_data_dir() -> str:
     """
-    Checks if the forecastbench-datasets repo is cloned in data/forecastbench.
-    If not, clones it.
+    Shared data directory, independent of the working directory.
+
+    $FORTEST_DATA_DIR if set (e.g. FORTEST_DATA_DIR=./data for an older
+    checkout), else $XDG_CACHE_HOME/fortest (default ~/.cache/fortest).
+    Read from the environment on every call, never frozen at import.
     """
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
+    if os.environ.get(DATA_DIR_ENV):
+        return os.path.abspath(os.path.expanduser(os.environ[DATA_DIR_ENV]))
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "fortest")
 
-    if os.path.exists(TARGET_DIR):
-        logger.info(f"ForecastBench data found at {TARGET_DIR}")
-        return
 
-    logger.info(f"Cloning ForecastBench datasets from {REPO_URL} to {TARGET_DIR}...")
+def get_target_dir() -> str:
+    """ForecastBench install location inside the shared data directory."""
+    return os.path.join(get_data_dir(), "forecastbench")
+
+
+def _legacy_checkout_hint(target_dir: str):
+    """Point users with a ./data checkout from older setups at FORTEST_DATA_DIR instead of using it."""
+    legacy = os.path.join(os.getcwd(), "data")
+    if not os.environ.get(DATA_DIR_ENV) and os.path.exists(os.path.join(legacy, "forecastbench")):
+        logger.warning(
+            f"Ignoring the ForecastBench checkout in {legacy}; set {DATA_DIR_ENV}={legacy} to use it "
+            f"instead of {target_dir}"
+        )
+
+
+def sha256_file(path, chunk_size: int = 1 << 20) -> str:
+    """Hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest(path) -> Dict[str, str]:
+    """Parse a sha256sum-style manifest into {relative path: hex digest}."""
+    hashes = {}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            digest, name = line.split(None, 1)
+            hashes[name.lstrip("*").strip()] = digest.lower()
+    return hashes
+
+
+def verify_tree(root, hashes: Dict[str, str]):
+    """Raise ValueError unless every file listed in `hashes` exists under `root` with that hash."""
+    bad = []
+    for name, expected in hashes.items():
+        path = os.path.join(root, name)
+        if not os.path.isfile(path):
+            bad.append(f"{name}: missing")
+        elif sha256_file(path) != expected:
+            bad.append(f"{name}: hash mismatch")
+    if bad:
+        raise ValueError(f"ForecastBench data failed verification ({len(bad)} files): {bad[:5]}")
+    logger.info(f"Verified {len(hashes)} files")
+
+
+def _data_root(path: str) -> str:
+    """The dataset root inside an unpacked source, descending a single wrapping directory."""
+    entries = [e for e in os.listdir(path) if not e.startswith(".")]
+    if "datasets" not in entries and len(entries) == 1 and os.path.isdir(os.path.join(path, entries[0])):
+        return os.path.join(path, entries[0])
+    return path
+
+
+def install_forecastbench_data(
+    source,
+    target_dir: str = None,
+    sha256: Optional[str] = None,
+    manifest=None,
+    preprocess: bool = True,
+    verify: bool = True,
+) -> str:
+    """
+    Install ForecastBench data from a local tarball or directory, without network access.
+
+    The data is unpacked next to `target_dir`, verified, and moved into place
+    in one step, so a failed or interrupted install never leaves a partial tree.
+
+    Args:
+        source: Path to a .tar/.tar.gz/.tgz archive or to an unpacked directory
+        target_dir: Install location (default: `get_target_dir()`)
+        sha256: Expected SHA-256 of the archive itself
+        manifest: sha256sum-style file listing per-file hashes; defaults to a
+                  SHA256SUMS file at the root of the source
+        preprocess: Build the consolidated snapshot used by the loader
+        verify: Require a manifest and check per-file hashes against it; pass
+                False to install an unverified tree (the archive hash is
+                still checked when `sha256` is given)
+
+    Returns:
+        The install directory
+    """
+    source = os.path.abspath(os.path.expanduser(str(source)))
+    target_dir = os.path.abspath(target_dir or get_target_dir())
+    parent = os.path.dirname(target_dir)
+    os.makedirs(parent, exist_ok=True)
+
+    if os.path.isdir(source) and os.path.commonpath([source, target_dir]) == source:
+        raise ValueError(f"Install target {target_dir} is inside the source directory {source}")
+
+    if sha256 is not None:
+        if os.path.isdir(source):
+            raise ValueError("An archive hash was given, but the source is a directory")
+        actual = sha256_file(source)
+        if actual != sha256.lower():
+            raise ValueError(f"Archive hash mismatch for {source}: expected {sha256}, got {actual}")
+
+    tmp = tempfile.mkdtemp(prefix=".forecastbench.", dir=parent)
     try:
-        subprocess.run(["git", "clone", REPO_URL, TARGET_DIR], check=True)
-        logger.info("Clone successful.")
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Failed to clone repository: {e}")
-        raise
+        if os.path.isdir(source):
+            logger.info(f"Copying ForecastBench data from {source}")
+            shutil.copytree(source, os.path.join(tmp, "data"), ignore=shutil.ignore_patterns(".git"))
+        elif tarfile.is_tarfile(source):
+            logger.info(f"Unpacking ForecastBench data from {source}")
+            with tarfile.open(source) as tar:
+                tar.extractall(os.path.join(tmp, "data"), filter="data")
+        else:
+            raise ValueError(f"Unsupported ForecastBench source (expected a directory or tar archive): {source}")
+
+        root = _data_root(os.path.join(tmp, "data"))
+        if manifest is None and os.path.exists(os.path.join(root, MANIFEST_NAME)):
+            manifest = os.path.join(root, MANIFEST_NAME)
+        if not verify:
+            logger.warning("Verification disabled; per-file hashes were not checked")
+        elif manifest:
+            verify_tree(root, read_manifest(manifest))
+        else:
+            raise ValueError(
+                f"No {MANIFEST_NAME} manifest found in {source}; pass a manifest, or verify=False to skip verification"
+            )
+
+        if os.path.exists(target_dir):
+            shutil.rmtree(target_dir)
+        os.replace(root, target_dir)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    logger.info(f"Installed ForecastBench data to {target_dir}")
+
+    if preprocess:
+        preprocess_forecastbench_data(target_dir)
+    return target_dir
+
+
+def preprocess_forecastbench_data(target_dir: str = None, force: bool = False):
+    """
+    Convert the question and resolution sets into the loader's consolidated snapshot.
+
+    Skipped when a snapshot matching the current files exists, unless `force`.
+    """
+    from fortest.loader.custom_loaders.forecastbench import build_forecastbench_snapshot, _open_snapshot
+
+    target_dir = target_dir or get_target_dir()
+    if not force and _open_snapshot(target_dir) is not None:
+        logger.info("ForecastBench snapshot is up to date")
+        return
+    path = build_forecastbench_snapshot(target_dir)
+    logger.info(f"Wrote ForecastBench snapshot to {path}")
+
+
+def ensure_forecastbench_data(source=None, preprocess: bool = True, verify: bool = True):
+    """
+    Make sure ForecastBench data is available in `get_target_dir()`.
+
+    If it is missing, installs it from `source` (or $FORTEST_FORECASTBENCH_SOURCE)
+    when given, otherwise shallow-clones the datasets repository. With
+    `preprocess` (setup), then builds the consolidated snapshot if it is
+    missing or stale; loaders pass `preprocess=False` and never write to
+    the data directory. `verify` is passed on to install_forecastbench_data.
+    """
+    target_dir = get_target_dir()
+    if os.path.exists(target_dir):
+        logger.info(f"ForecastBench data found at {target_dir}")
+    else:
+        _legacy_checkout_hint(target_dir)
+        source = source or os.environ.get(SOURCE_ENV)
+        if source:
+            install_forecastbench_data(source, target_dir, preprocess=False, verify=verify)
+        else:
+            os.makedirs(os.path.dirname(target_dir), exist_ok=True)
+            logger.info(f"Cloning ForecastBench datasets from {REPO_URL} to {target_dir}...")
+            try:
+                subprocess.run(["git", "clone", "--depth", "1", REPO_URL, target_dir], check=True)
+                logger.info("Clone successful.")
+            except subprocess.CalledProcessError as e:
+                logger.error(f"Failed to clone repository: {e}")
+                raise
+
+    if preprocess:
+        preprocess_forecastbench_data(target_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Provision the ForecastBench datasets.")
+    parser.add_argument("--from", dest="source", default=None,
+                        help="Local tarball or directory to install from (no network)")
+    parser.add_argument("--sha256", default=None, help="Expected SHA-256 of the tarball")
+    parser.add_argument("--manifest", default=None, help=f"Per-file hash manifest (default: {MANIFEST_NAME} in the source)")
+    parser.add_argument("--no-verify", dest="verify", action="store_false",
+                        help=f"Install from --from without a {MANIFEST_NAME} manifest (per-file hashes are not checked)")
+    parser.add_argument("--force", action="store_true", help="Reinstall from --from and rebuild the snapshot")
+    args = parser.parse_args()
+
+    target_dir = get_target_dir()
+    logger.info(f"ForecastBench data directory: {target_dir}")
+    if args.source and (args.force or not os.path.exists(target_dir)):
+        install_forecastbench_data(args.source, target_dir, sha256=args.sha256, manifest=args.manifest,
+                                   verify=args.verify)
+    else:
+        ensure_forecastbench_data()
+        if args.force:
+            preprocess_forecastbench_data(target_dir, force=True)
+
 
 if __name__ == "__main__":
-    ensure_forecastbench_data()
+    main()
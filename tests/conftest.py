@@ -0,0 +1,124 @@
+"""Shared fixtures: small synthetic ForecastBench_v1 and ForecastBench datasets on disk."""
+
+import json
+import pytest
+from datetime import date, timedelta
+
+from fortest.loader.custom_loaders import forecastbench, forecastbench_v1
+
+
+SYNTHETIC_SOURCES = ['fred', 'yfinance', 'acled', 'manifold', 'metaculus', 'polymarket']
+
+
+def make_v1_dataset(data_dir, n: int = 120):
+    """Write matching X/y single-question files with `n` questions to `data_dir`."""
+    questions, resolutions = [], []
+    horizons = [3, 10, 45, 120, 250, 400]
+    for i in range(n):
+        source = SYNTHETIC_SOURCES[i % len(SYNTHETIC_SOURCES)]
+        qset = '2024-07-21-llm.json' if i % 2 == 0 else '2024-08-04-llm.json'
+        due = qset[:10]
+        days = horizons[(i // len(SYNTHETIC_SOURCES)) % len(horizons)]
+        end = (date.fromisoformat(due) + timedelta(days=days)).isoformat()
+        # Some ids contain '_', as in the shipped data, to exercise composed-id splitting
+        qid = f"q_{i:04d}" if i % 10 == 5 else f"q{i:04d}"
+        questions.append({
+            'id': qid,
+            'question_set': qset,
+            'forecast_due_date': due,
+            'source': source,
+            'question': f"Will {source} series {qid} rise?",
+            'background': f"Background for {qid}.",
+            'resolution_criteria': f"Resolves YES if {qid} rises.",
+            'url': f"https://example.com/{qid}",
+            'freeze_datetime': f"{due}T00:00:00+00:00",
+            'freeze_datetime_value': str(i / n),
+        })
+        resolutions.append({
+            'id': qid,
+            'question_set': qset,
+            'resolved_to': float(i % 3 == 0),
+            'resolution_date': end,
+            'direction': None,
+        })
+    with open(data_dir / 'X_single_resolved.json', 'w') as f:
+        json.dump({'questions': questions}, f)
+    with open(data_dir / 'y_single_resolved.json', 'w') as f:
+        json.dump({'resolutions': resolutions}, f)
+    make_v1_composed(data_dir, questions, resolutions)
+    return data_dir
+
+
+def make_v1_composed(data_dir, questions, resolutions):
+    """Write y_compose_resolved.json pairing consecutive single questions of the same set and source."""
+    directions = [[1, 1], [-1, 1], [1, -1], [-1, -1]]
+    composed = []
+    by_set = {}
+    for q, r in zip(questions, resolutions):
+        by_set.setdefault((r['question_set'], q['source']), []).append(r)
+    for rows in by_set.values():
+        for k in range(0, len(rows) - 1, 2):
+            a, b = rows[k], rows[k + 1]
+            composed.append({
+                'id': f"{a['id']}_{b['id']}",
+                'question_set': a['question_set'],
+                'resolved_to': float(k % 4 == 0),
+                'resolution_date': max(a['resolution_date'], b['resolution_date']),
+                'direction': directions[(k // 2) % len(directions)],
+            })
+    # One pair whose components are not resolved single questions
+    composed.append({
+        'id': 'missing_a_missing_b',
+        'question_set': '2024-07-21-llm.json',
+        'resolved_to': 1.0,
+        'resolution_date': '2024-09-01',
+        'direction': [1, 1],
+    })
+    with open(data_dir / 'y_compose_resolved.json', 'w') as f:
+        json.dump({'resolutions': composed}, f)
+
+
+@pytest.fixture
+def v1_data_dir(tmp_path, monkeypatch):
+    """Point the ForecastBench_v1 loaders at a synthetic dataset."""
+    make_v1_dataset(tmp_path)
+    monkeypatch.setattr(forecastbench_v1, '_get_data_dir', lambda: tmp_path)
+    forecastbench_v1.invalidate_cache()
+    yield tmp_path
+    forecastbench_v1.invalidate_cache()
+
+
+_FB_DATES = ['2024-07-21', '2024-08-04', '2024-08-18']
+
+
+@pytest.fixture
+def fb_dates():
+    """Question set dates written by `fb_repo`."""
+    return list(_FB_DATES)
+
+
+@pytest.fixture
+def fb_repo(tmp_path, monkeypatch):
+    """Write question/resolution sets for a few dates and point the loader at them."""
+    qdir = tmp_path / 'datasets' / 'question_sets'
+    rdir = tmp_path / 'datasets' / 'resolution_sets'
+    qdir.mkdir(parents=True)
+    rdir.mkdir(parents=True)
+    for date in _FB_DATES:
+        resolutions = [{'id': ['a', 'b'], 'resolved': True, 'resolved_to': 1.0}]
+        for variant in ('llm', 'human'):
+            questions = [{
+                'id': f"{date}-{variant}-{i}",
+                'question': f"Question {i}?",
+                'freeze_datetime': f"{date}T00:00:00+00:00",
+                'start_date': date,
+            } for i in range(6)]
+            with open(qdir / f"{date}-{variant}.json", 'w') as f:
+                json.dump({'forecast_due_date': date, 'questions': questions}, f, indent=1)
+            resolutions += [{'id': q['id'], 'resolved': True, 'resolved_to': float(i % 2)}
+                            for i, q in enumerate(questions)]
+        with open(rdir / f"{date}_resolution_set.json", 'w') as f:
+            json.dump({'resolutions': resolutions}, f)
+    monkeypatch.setattr(forecastbench, 'get_target_dir', lambda: str(tmp_path))
+    monkeypatch.setattr(forecastbench, 'ensure_forecastbench_data', lambda **kwargs: None)
+    return tmp_path
@@ -0,0 +1,130 @@
+"""Tests for ACLED prefix-sum counts and AcledResolver."""
+
+import csv
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from fortest.problems.ForecastBenchTemplatized.acled import AcledCounts, AcledResolver, parse_acled_id
+from fortest.problems.ForecastBenchTemplatized.resolver import TemplatedQuestion, date_grid
+
+RULE = 'last30Days.gt.30DayAvgOverPast360Days'
+RULE_10X = 'last30DaysTimes10.gt.30DayAvgOverPast360DaysPlus1'
+
+
+def _day(iso, offset=0):
+    return (date.fromisoformat(iso) + timedelta(days=offset)).isoformat()
+
+
+def _events():
+    """Sudan: one battle every 10 days in 2024, then a surge of 5 a day in March 2025."""
+    rows = [(_day('2024-01-01', i), 'Sudan', 'Battles', 2) for i in range(0, 366, 10)]
+    rows += [(_day('2025-03-01', i), 'Sudan', 'Battles', 1) for i in range(31) for _ in range(5)]
+    rows += [('15 June 2024', 'Chad', 'Protests', 0), ('bad date', 'Chad', 'Protests', 9)]
+    return rows
+
+
+def _template(tid):
+    return TemplatedQuestion(tid, 'acled', f'{tid}: {{forecast_due_date}} -> {{resolution_date}}', '', '', '', '')
+
+
+def _naive(rows, country, variable, start, end):
+    """Reference window count by scanning raw events."""
+    total = 0
+    for d, c, e, f in rows:
+        if c != country or d == 'bad date':
+            continue
+        d = '2024-06-15' if d == '15 June 2024' else d
+        if start <= d < end:
+            total += f if variable == 'fatalities' else e == variable
+    return total
+
+
+@pytest.fixture
+def export(tmp_path):
+    path = tmp_path / 'acled.csv'
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['event_date', 'country', 'event_type', 'fatalities', 'notes'])
+        writer.writerows((*row, '') for row in _events())
+    return path
+
+
+@pytest.fixture
+def counts(export):
+    return AcledCounts.from_export(export, first_date='2024-01-01', last_date='2025-04-30')
+
+
+class TestParseId:
+    """Tests for parse_acled_id."""
+
+    def test_rules(self):
+        assert parse_acled_id(f'Sudan.Battles.{RULE}') == ('Sudan', 'Battles', RULE)
+        assert parse_acled_id(f'Sudan.Explosions/Remote violence.{RULE_10X}') == \
+            ('Sudan', 'Explosions/Remote violence', RULE_10X)
+        assert parse_acled_id('Sudan.Battles.last7Days') is None
+        assert parse_acled_id(RULE) is None
+
+
+class TestAcledCounts:
+    """Window counts are prefix-sum differences."""
+
+    def test_matches_naive_scan(self, counts):
+        rows = _events()
+        starts = ['2024-01-01', '2024-02-15', '2024-06-15', '2025-02-20', '2025-03-10']
+        ends = ['2024-01-31', '2024-06-16', '2024-06-16', '2025-03-05', '2025-04-01']
+        for country, variable in [('Sudan', 'Battles'), ('Sudan', 'fatalities'), ('Chad', 'Protests'),
+                                  ('Chad', 'Battles')]:
+            got = counts.window_counts((country, variable), [_to_days(s) for s in starts], [_to_days(e) for e in ends])
+            assert got.tolist() == [_naive(rows, country, variable, s, e) for s, e in zip(starts, ends)]
+
+    def test_outside_coverage_is_nan(self, counts):
+        got = counts.window_counts(('Sudan', 'Battles'), [_to_days('2023-12-31'), _to_days('2025-04-01')],
+                                   [_to_days('2024-01-10'), _to_days('2025-05-02')])
+        assert np.isnan(got).all()
+
+    def test_save_load(self, counts, tmp_path):
+        loaded = AcledCounts.load(counts.save(tmp_path / 'acled.npz'))
+        assert loaded.keys == counts.keys and loaded.first_day == counts.first_day
+        assert np.array_equal(loaded.cumsum, counts.cumsum)
+
+
+def _to_days(iso):
+    return (date.fromisoformat(iso) - date(1970, 1, 1)).days
+
+
+class TestAcledResolver:
+    """Grid resolution against a naive per-window evaluation."""
+
+    def test_grid_matches_naive(self, counts):
+        rows = _events()
+        resolver = AcledResolver(counts)
+        grid = date_grid(['2025-01-01', '2025-02-01', '2025-03-01'], horizons=[7, 31, 45])
+        templates = [_template(f'Sudan.Battles.{RULE}'), _template(f'Sudan.Battles.{RULE_10X}'),
+                     _template(f'Sudan.fatalities.{RULE}')]
+        results = resolver.resolve_many(templates, grid)
+        expected = []
+        for template in templates:
+            country, variable, rule = parse_acled_id(template.id)
+            factor, offset = (10, 1) if rule == RULE_10X else (1, 0)
+            for due, res in grid:
+                if res > '2025-05-01':
+                    expected.append(None)
+                    continue
+                recent = _naive(rows, country, variable, _day(res, -30), res)
+                baseline = _naive(rows, country, variable, _day(due, -360), due) / 12
+                expected.append(float(recent > factor * (baseline + offset)))
+        assert [r.resolved_to for r in results] == expected
+        assert 1.0 in expected and 0.0 in expected
+        assert results[0].question == f'Sudan.Battles.{RULE}: 2025-01-01 -> 2025-01-08'
+
+    def test_fetch_and_unknown(self, counts, export, tmp_path):
+        resolver = AcledResolver(str(export))
+        assert resolver.fetch_value(f'Sudan.Battles.{RULE}', '2025-04-01') == 150.0
+        assert resolver.fetch_many(f'Chad.Battles.{RULE}', ['2024-07-01', 'N/A']) == [0.0, None]
+        assert resolver.fetch_value('Sudan.Battles.other', '2025-04-01') is None
+        unknown = resolver.resolve(_template('wiki_page'), '2025-01-01', '2025-02-01')
+        assert unknown.resolved_to is None and unknown.resolution_value is None
+        saved = AcledResolver(str(counts.save(tmp_path / 'acled.npz')))
+        assert saved.fetch_value(f'Sudan.fatalities.{RULE}', '2024-02-01') == 6.0
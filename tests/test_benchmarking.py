@@ -63,3 +63,27 @@ def test_metrics_calculation():
     assert brier_score(preds, outcomes) == pytest.approx(0.11)
     # Accuracy: (1 + 1 + 1) / 3 = 1.0 (threshold 0.5, 0.5 is predicted as 1)
     assert accuracy(preds, outcomes) == 1.0
+
+def test_iter_load_streams_problems():
+    loader = ProblemLoader()
+    streamed = list(loader.iter_load("load_all"))
+    assert [p["problem_id"] for p in streamed] == list(loader.load("load_all"))
+
+def test_iter_load_batches():
+    loader = ProblemLoader()
+    total = len(loader.load("load_all"))
+    batches = list(loader.iter_load("load_all", batch_size=1))
+    assert len(batches) == total
+    assert all(isinstance(b, list) and len(b) == 1 for b in batches)
+
+def test_iter_load_accepts_dict_loaders():
+    @ProblemLoader.register("test_dict_loader")
+    def dict_loader(problems):
+        return {"X1": {"problem_id": "X1"}}
+
+    try:
+        loader = ProblemLoader()
+        assert list(loader.iter_load("test_dict_loader")) == [{"problem_id": "X1"}]
+        assert loader.load("test_dict_loader") == {"X1": {"problem_id": "X1"}}
+    finally:
+        ProblemLoader._registry.pop("test_dict_loader")
@@ -0,0 +1,83 @@
+"""Tests for MinHash/LSH near-duplicate clustering and the per-cluster sample cap."""
+
+import numpy as np
+import pytest
+
+from fortest.loader.dedup import lsh_clusters, minhash_signatures, near_duplicate_clusters, normalize
+from fortest.loader.loader import ProblemLoader
+from fortest.loader.custom_loaders import forecastbench_v1
+from fortest.loader.custom_loaders.forecastbench_v1 import _load_and_prepare_all, _stratified_sample
+
+
+TEMPLATE = "Will the FRED series {} be higher on {} than on {}? The series is published daily by the St. Louis Fed."
+
+
+class TestNormalize:
+    """Dates collapse to one placeholder; other words and numbers stay."""
+
+    def test_dates(self):
+        assert normalize("On 2024-08-01T00:00:00+00:00, July 21st, 2025 or 3 Aug 2024?") == \
+            ['on', 'date', 'date', 'or', 'date']
+        assert normalize("By 12/31/2024 in 2026 above 5000") == ['by', 'date', 'in', 'date', 'above', '5000']
+
+    def test_month_words_need_a_day_or_year(self):
+        assert normalize("It may rise in March") == ['it', 'may', 'rise', 'in', 'march']
+        assert normalize(None) == []
+
+
+class TestClustering:
+    """Clusters of templated variants."""
+
+    def test_templated_variants_cluster(self):
+        texts = [
+            TEMPLATE.format('DGS10', '2024-08-01', '2024-07-21'),
+            TEMPLATE.format('DGS10', '2024-09-15', '2024-09-01'),
+            TEMPLATE.format('DGS10', 'October 3, 2025', 'September 19, 2025'),
+            "Who will win the 2024 US presidential election?",
+            None,
+            "",
+            "Who will win the 2028 US presidential election?",
+        ]
+        labels = near_duplicate_clusters(texts)
+        assert labels.tolist() == [0, 0, 0, 3, 4, 5, 3]
+
+    def test_distinct_questions_stay_apart(self):
+        texts = [f"Question about topic {w} and its outlook {w}" for w in
+                 ('apples', 'oranges', 'bananas', 'grapes', 'cherries')]
+        assert near_duplicate_clusters(texts, threshold=0.9).tolist() == [0, 1, 2, 3, 4]
+
+    def test_signature_shape_and_chunking(self, monkeypatch):
+        texts = [TEMPLATE.format(f"S{i % 7}", '2024-01-01', '2024-02-01') for i in range(300)]
+        full = minhash_signatures(texts, num_perm=32)
+        monkeypatch.setattr('fortest.loader.dedup._CHUNK_SHINGLES', 40)
+        assert full.shape == (300, 32) and full.dtype == np.uint32
+        assert np.array_equal(minhash_signatures(texts, num_perm=32), full)
+
+    def test_bands_must_divide_signature(self):
+        with pytest.raises(ValueError):
+            lsh_clusters(np.zeros((3, 10), dtype=np.uint32), bands=4)
+
+
+class TestSamplerCap:
+    """per_cluster caps near-duplicates in the v1 samplers."""
+
+    def test_stratified_sample_cap(self):
+        problems = [{'problem_id': f"p{i}", 'question': TEMPLATE.format('DGS10', f"2024-01-{i + 1:02d}", '2023-12-31'),
+                     'metadata': {'source': 'fred', 'horizon': 'near_term'}} for i in range(20)]
+        problems += [{'problem_id': f"u{i}", 'question': f"Unrelated question number {i} on {w}?",
+                      'metadata': {'source': 'fred', 'horizon': 'near_term'}}
+                     for i, w in enumerate(('gold', 'oil', 'wheat', 'copper'))]
+        sample = _stratified_sample(problems, 10, 1, per_cluster=1)
+        assert sum(pid.startswith('p') for pid in sample) == 1
+        assert len(sample) == 5
+
+    def test_loader_cap_uses_cached_clusters(self, v1_data_dir, monkeypatch):
+        # The synthetic questions are all distinct; group rows into 10 clusters instead
+        monkeypatch.setattr(forecastbench_v1, 'near_duplicate_clusters', lambda texts: np.arange(len(texts)) % 10)
+        loader = ProblemLoader()
+        sample = loader.load('forecastbench_v1', max_quest=1000, per_cluster=1)
+        row_of = {p['problem_id']: i for i, p in enumerate(_load_and_prepare_all())}
+        assert sorted(row_of[pid] % 10 for pid in sample) == list(range(10))
+        monkeypatch.setattr(forecastbench_v1, 'near_duplicate_clusters',
+                            lambda texts: pytest.fail("clusters recomputed"))
+        assert list(loader.load('forecastbench_v1', max_quest=1000, per_cluster=1)) == list(sample)
@@ -0,0 +1,171 @@
+"""Tests for the resolver fetch cache."""
+
+import pickle
+
+import numpy as np
+
+from fortest.problems.ForecastBenchTemplatized.fetch_cache import (
+    MISSING,
+    FetchCache,
+    FetchCacheMixin,
+    with_fetch_cache,
+)
+from fortest.problems.ForecastBenchTemplatized.resolver import (
+    DummyResolver,
+    TemplatedQuestion,
+    date_grid,
+    resolve_increase_grid,
+)
+
+SERIES = {'2025-01-01': 1.0, '2025-02-01': 2.0, '2025-03-01': 1.5}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingResolver(DummyResolver):
+    """Per-date resolver counting fetch_value calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch_value(self, question_id, date):
+        self.calls.append((question_id, date))
+        return SERIES.get(date) if question_id == 'a' else None
+
+    def resolve_many(self, templates, date_pairs):
+        dates = list(dict.fromkeys(d for pair in date_pairs for d in pair))
+        results = []
+        for template in templates:
+            values = dict(zip(dates, self.fetch_many(template.id, dates)))
+            results.extend(resolve_increase_grid(template, date_pairs, values))
+        return results
+
+
+class CachedCounting(FetchCacheMixin, CountingResolver):
+    pass
+
+
+class BatchResolver(CountingResolver):
+    """Overrides fetch_many, counting batches."""
+
+    def fetch_many(self, question_id, dates):
+        self.calls.append((question_id, tuple(dates)))
+        return [SERIES.get(d) for d in dates]
+
+
+CachedBatch = with_fetch_cache(BatchResolver)
+
+
+@with_fetch_cache
+class DecoratedResolver(CountingResolver):
+    pass
+
+
+class TupleResolver(DummyResolver):
+    def fetch_value(self, question_id, date):
+        return (np.float64(1.5), np.int64(2))
+
+
+class TestFetchCache:
+    """Memory LRU, disk tier and negative TTL."""
+
+    def test_lru_entry_bound(self):
+        cache = FetchCache(max_entries=2)
+        cache.put(('s', 'a', '1'), 1.0)
+        cache.put(('s', 'a', '2'), 2.0)
+        assert cache.get(('s', 'a', '1')) == 1.0
+        cache.put(('s', 'a', '3'), 3.0)
+        assert cache.get(('s', 'a', '2')) is MISSING
+        assert cache.get(('s', 'a', '1')) == 1.0 and len(cache) == 2
+        assert cache.stats.evictions == 1 and cache.stats.hits == 2 and cache.stats.misses == 1
+
+    def test_byte_bound(self):
+        cache = FetchCache(max_bytes=5000)
+        cache.put_many([(('s', 'big', str(i)), 'x' * 1000) for i in range(10)])
+        assert cache.nbytes <= 5000 and 0 < len(cache) < 10
+        assert cache.get(('s', 'big', '9')) == 'x' * 1000
+
+    def test_disk_tier_shared(self, tmp_path):
+        path = tmp_path / 'fetch.sqlite'
+        FetchCache(path).put_many([(('s', 'a', '2025-01-01'), 1.5), (('s', 'a', '2025-01-02'), {'v': [1, 2]})])
+        other = FetchCache(path)
+        assert other.get_many([('s', 'a', '2025-01-01'), ('s', 'a', '2025-01-02'), ('s', 'b', '2025-01-01')]) == \
+            [1.5, {'v': [1, 2]}, MISSING]
+        assert other.stats.disk_hits == 2 and len(other) == 2
+
+    def test_negative_ttl(self, tmp_path):
+        clock = Clock()
+        cache = FetchCache(tmp_path / 'fetch.sqlite', negative_ttl=60, clock=clock)
+        cache.put_many([(('s', 'a', 'neg'), None), (('s', 'a', 'pos'), 0.0)])
+        clock.now += 30
+        assert cache.get_many([('s', 'a', 'neg'), ('s', 'a', 'pos')]) == [None, 0.0]
+        assert cache.stats.negative_hits == 1
+        clock.now += 31
+        assert cache.get(('s', 'a', 'neg')) is MISSING
+        assert FetchCache(tmp_path / 'fetch.sqlite', negative_ttl=60, clock=clock).get(('s', 'a', 'neg')) is MISSING
+        assert cache.get(('s', 'a', 'pos')) == 0.0
+
+    def test_pickle_drops_memory_tier(self, tmp_path):
+        cache = FetchCache(tmp_path / 'fetch.sqlite', max_entries=7)
+        cache.put(('s', 'a', 'd'), 1.0)
+        copy = pickle.loads(pickle.dumps(cache))
+        assert len(copy) == 0 and copy.max_entries == 7
+        assert copy.get(('s', 'a', 'd')) == 1.0
+
+
+class TestFetchCacheMixin:
+    """Cached resolvers fetch each (series, date) once."""
+
+    def test_grid_fetches_each_point_once(self):
+        resolver = CachedCounting()
+        template = TemplatedQuestion('a', 'fred', 'A {forecast_due_date} {resolution_date}', '', '', '', '')
+        grid = date_grid(['2025-01-01', '2025-02-01'], resolution_dates=['2025-02-01', '2025-03-01'])
+        first = resolver.resolve_many([template], grid)
+        assert sorted(resolver.calls) == [('a', '2025-01-01'), ('a', '2025-02-01'), ('a', '2025-03-01')]
+        assert resolver.resolve_many([template], grid) == first
+        assert len(resolver.calls) == 3
+        assert resolver.fetch_cache.stats.hits == 3 and resolver.fetch_cache.stats.misses == 3
+
+    def test_negative_results_cached(self):
+        resolver = CachedCounting(fetch_cache=FetchCache(negative_ttl=60))
+        assert resolver.fetch_value('b', '2025-01-01') is None
+        assert resolver.fetch_value('b', '2025-01-01') is None
+        assert resolver.calls == [('b', '2025-01-01')]
+
+    def test_batch_fetches_only_misses(self, tmp_path):
+        resolver = CachedBatch(fetch_cache=FetchCache(tmp_path / 'fetch.sqlite'))
+        assert CachedBatch.__name__ == 'CachedBatchResolver' and isinstance(resolver, BatchResolver)
+        assert resolver.fetch_many('a', ['2025-01-01', '2025-02-01']) == [1.0, 2.0]
+        assert resolver.fetch_many('a', ['2025-02-01', '2025-03-01', '2025-04-01', '2025-03-01']) == \
+            [2.0, 1.5, None, 1.5]
+        assert resolver.calls == [('a', ('2025-01-01', '2025-02-01')), ('a', ('2025-03-01', '2025-04-01'))]
+        assert CachedBatch(fetch_cache=FetchCache(tmp_path / 'fetch.sqlite')).fetch_value('a', '2025-03-01') == 1.5
+
+    def test_cache_source_keys(self):
+        resolver = CachedCounting()
+        resolver.fetch_value('a', '2025-01-01')
+        assert resolver.fetch_cache.get(('CountingResolver', 'a', '2025-01-01')) == 1.0
+
+    def test_pickle_round_trip(self, tmp_path):
+        resolver = CachedBatch(fetch_cache=FetchCache(tmp_path / 'fetch.sqlite', max_entries=7))
+        resolver.fetch_value('a', '2025-01-01')
+        copy = pickle.loads(pickle.dumps(resolver))
+        assert type(copy) is CachedBatch and with_fetch_cache(BatchResolver) is CachedBatch
+        assert copy.calls == resolver.calls and copy.fetch_cache.max_entries == 7
+        assert copy.fetch_value('a', '2025-01-01') == 1.0 and len(copy.calls) == 1
+
+        decorated = pickle.loads(pickle.dumps(DecoratedResolver()))
+        assert type(decorated) is DecoratedResolver and decorated.fetch_value('a', '2025-02-01') == 2.0
+
+    def test_values_read_back_alike_from_both_tiers(self, tmp_path):
+        resolver = with_fetch_cache(TupleResolver)(fetch_cache=FetchCache(tmp_path / 'fetch.sqlite'))
+        fetched = resolver.fetch_value('a', '2025-01-01')
+        assert fetched == [1.5, 2] and type(fetched[0]) is float
+        assert resolver.fetch_value('a', '2025-01-01') == fetched
+        assert FetchCache(tmp_path / 'fetch.sqlite').get(('TupleResolver', 'a', '2025-01-01')) == fetched
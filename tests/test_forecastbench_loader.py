@@ -0,0 +1,114 @@
+"""Tests for the legacy forecastbench loader on a synthetic repo layout (no network)."""
+
+import io
+import json
+
+import pytest
+
+from fortest.loader.loader import ProblemLoader
+from fortest.loader.custom_loaders import forecastbench
+from fortest.loader.custom_loaders.forecastbench import _JsonStream, _iter_json_array
+from fortest.scripts import setup_datasets
+
+
+class TestJsonStream:
+    """Tests for the incremental JSON reader."""
+
+    @pytest.mark.parametrize('chunk_size', [1, 3, 7, 1 << 16])
+    def test_streams_array_under_key(self, tmp_path, chunk_size):
+        doc = {'meta': {'n': 12345}, 'count': 10, 'questions': [{'id': i, 'v': [i, 'x' * i]} for i in range(10)]}
+        stream = _JsonStream(io.StringIO(json.dumps(doc)), chunk_size=chunk_size)
+        assert stream.value() == doc
+
+        path = tmp_path / 'doc.json'
+        path.write_text(json.dumps(doc, indent=2))
+        assert list(_iter_json_array(str(path), 'questions')) == doc['questions']
+
+    def test_top_level_list_and_missing_key(self, tmp_path):
+        path = tmp_path / 'list.json'
+        path.write_text('[1, 2, 3]')
+        assert list(_iter_json_array(str(path), 'resolutions')) == [1, 2, 3]
+        path.write_text('{"other": []}')
+        assert list(_iter_json_array(str(path), 'resolutions')) == []
+
+
+class TestForecastBenchLoader:
+    """Tests for serial, pooled and limited loads."""
+
+    def test_serial_and_pooled_match(self, fb_repo, fb_dates):
+        loader = ProblemLoader()
+        serial = loader.load('forecastbench', workers=1)
+        pooled = loader.load('forecastbench', workers=2)
+        assert len(serial) == len(fb_dates) * 2 * 6
+        assert list(serial) == list(pooled)
+        for pid, p in serial.items():
+            assert {k: v for k, v in p.items() if k != 'time_now'} == \
+                   {k: v for k, v in pooled[pid].items() if k != 'time_now'}
+
+    def test_serial_by_default(self, fb_repo, fb_dates, monkeypatch):
+        monkeypatch.setattr(forecastbench, '_iter_pooled', lambda *a, **k: pytest.fail('pool started'))
+        assert len(ProblemLoader().load('forecastbench')) == len(fb_dates) * 2 * 6
+
+    def test_load_does_not_preprocess(self, fb_repo, monkeypatch):
+        # The real ensure_forecastbench_data, with the data already in place
+        monkeypatch.setattr(forecastbench, 'ensure_forecastbench_data', setup_datasets.ensure_forecastbench_data)
+        monkeypatch.setattr(setup_datasets, 'get_target_dir', lambda: str(fb_repo))
+        opened = []
+        iter_json_array = forecastbench._iter_json_array
+        monkeypatch.setattr(forecastbench, '_iter_json_array',
+                            lambda path, *a, **k: opened.append(path) or iter_json_array(path, *a, **k))
+        monkeypatch.setattr(forecastbench, 'build_forecastbench_snapshot',
+                            lambda *a, **k: pytest.fail('snapshot built during a load'))
+        assert len(ProblemLoader().load('forecastbench', limit=2)) == 2
+        assert forecastbench._open_snapshot(str(fb_repo)) is None
+        assert not (fb_repo / forecastbench.SNAPSHOT_DIRNAME).exists()
+        assert len(opened) <= 2
+
+    def test_resolutions_joined(self, fb_repo):
+        problems = ProblemLoader().load('forecastbench', dataset_name='2024-08-04-human', workers=1)
+        p = problems['fb_2024-08-04-human_2024-08-04-human-1']
+        assert p['resolved_flag'] is True
+        assert p['resolution_status'] == 1.0
+        assert p['time_testing'] == '2024-08-04T00:00:00+00:00'
+
+    def test_resolution_set_parsed_once_per_date(self, fb_repo, fb_dates, monkeypatch):
+        calls = []
+        original = forecastbench._load_resolutions
+        monkeypatch.setattr(forecastbench, '_load_resolutions',
+                            lambda path, wanted=None: calls.append(path) or original(path, wanted))
+        ProblemLoader().load('forecastbench', workers=1)
+        assert len(calls) == len(fb_dates)
+
+    def test_limit_reads_incrementally(self, fb_repo):
+        qfile = fb_repo / 'datasets' / 'question_sets' / '2024-07-21-human.json'
+        text = qfile.read_text()
+        # Corrupt the tail: a limited load must stop before reaching it
+        qfile.write_text(text[: text.index('"Question 3?"')] + 'GARBAGE')
+        problems = ProblemLoader().load('forecastbench', dataset_name='2024-07-21-human', limit=2)
+        assert len(problems) == 2
+        assert all(p['resolved_flag'] for p in problems.values())
+
+    def test_limit_across_datasets(self, fb_repo):
+        problems = ProblemLoader().load('forecastbench', limit=8)
+        assert len(problems) == 8
+
+
+class TestSharding:
+    """Sharded legacy loads skip other shards' questions."""
+
+    @pytest.mark.parametrize('kwargs', [{'workers': 1}, {'workers': 2}, {'limit': 15}])
+    def test_shards_partition_load(self, fb_repo, kwargs):
+        loader = ProblemLoader()
+        full = loader.load('forecastbench', **kwargs)
+        shards = [loader.load('forecastbench', shard_index=k, num_shards=3, **kwargs) for k in range(3)]
+        assert sum(len(s) for s in shards) == len(full)
+        assert {pid for s in shards for pid in s} == set(full)
+
+
+class TestTimeNow:
+    """Problems of one load share a single time_now, also across worker processes."""
+
+    @pytest.mark.parametrize('kwargs', [{'workers': 1}, {'workers': 2}, {'limit': 15}])
+    def test_shared_time_now(self, fb_repo, kwargs):
+        problems = ProblemLoader().load('forecastbench', **kwargs)
+        assert len({p['time_now'] for p in problems.values()}) == 1
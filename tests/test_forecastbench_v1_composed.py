@@ -0,0 +1,127 @@
+"""Tests for the ForecastBench_v1 composed-question loader."""
+
+import json
+
+import numpy as np
+
+from fortest.loader.loader import ProblemLoader
+from fortest.loader.custom_loaders.forecastbench_v1 import _load_and_prepare_all
+from fortest.loader.custom_loaders import forecastbench_v1_composed
+from fortest.loader.custom_loaders.forecastbench_v1_composed import (
+    _load_composed_dataset,
+    _match_components,
+)
+
+
+class TestMatchComponents:
+    """Tests for splitting compound ids whose parts may contain '_'."""
+
+    @staticmethod
+    def _match(singles, composed):
+        single_sets, single_ids = (np.array(c, dtype=str) for c in zip(*singles))
+        composed_sets, composed_ids = (np.array(c, dtype=str) for c in zip(*composed))
+        left, right = _match_components(single_sets, single_ids, composed_sets, composed_ids)
+        return list(zip(left.tolist(), right.tolist()))
+
+    def test_split_with_underscored_components(self):
+        singles = [('s', 'a_b'), ('s', 'c'), ('s', 'a'), ('s', 'b_c_d')]
+        assert self._match(singles, [('s', 'a_b_c'), ('s', 'a_b_c_d')]) == [(0, 1), (2, 3)]
+
+    def test_unknown_components(self):
+        singles = [('s', 'a'), ('t', 'b')]
+        assert self._match(singles, [('s', 'a_b'), ('other', 'a_a'), ('s', 'ab')]) == [(-1, -1)] * 3
+
+
+class TestComposedLoader:
+    """Tests for the forecastbench_v1_composed strategy."""
+
+    def test_joins_components(self, v1_data_dir):
+        singles = {p['problem_id']: p for p in _load_and_prepare_all()}
+        problems = _load_composed_dataset().problems
+        assert problems
+        assert all('missing' not in p['metadata']['original_id'] for p in problems)
+        assert any('_' in cid for p in problems for cid in p['metadata']['component_ids'])
+        for p in problems:
+            meta = p['metadata']
+            a, b = (singles[pid] for pid in meta['component_problem_ids'])
+            assert meta['original_id'] == f"{a['metadata']['original_id']}_{b['metadata']['original_id']}"
+            assert p['time_testing'] == min(a['time_testing'], b['time_testing'])
+            assert meta['horizon_days'] > 0
+            assert p['resolution_status'] in (0.0, 1.0)
+
+    def test_unparseable_resolution_date_skipped(self, v1_data_dir):
+        y_path = v1_data_dir / 'y_compose_resolved.json'
+        data = json.loads(y_path.read_text())
+        ids = {p['metadata']['original_id'] for p in _load_composed_dataset().problems}
+        resolutions = [r for r in data['resolutions'] if r['id'] in ids]
+        resolutions[0]['resolution_date'] = 'N/A'
+        del resolutions[1]['resolution_date']
+        y_path.write_text(json.dumps(data))
+        problems = _load_composed_dataset().problems
+        assert {p['metadata']['original_id'] for p in problems} == ids - {r['id'] for r in resolutions[:2]}
+        assert all(0 < p['metadata']['horizon_days'] < 10000 for p in problems)
+
+    def test_mixed_source_pairs_skipped(self, v1_data_dir):
+        singles = _load_and_prepare_all()
+        a, b = (next(p for p in singles if p['metadata']['source'] == source and
+                     p['metadata']['question_set'] == '2024-07-21-llm.json') for source in ('fred', 'acled'))
+        y_path = v1_data_dir / 'y_compose_resolved.json'
+        data = json.loads(y_path.read_text())
+        mixed = f"{a['metadata']['original_id']}_{b['metadata']['original_id']}"
+        data['resolutions'].append({'id': mixed, 'question_set': '2024-07-21-llm.json', 'resolved_to': 1.0,
+                                    'resolution_date': '2025-06-01', 'direction': [1, 1]})
+        y_path.write_text(json.dumps(data))
+        problems = _load_composed_dataset().problems
+        assert problems
+        assert mixed not in {p['metadata']['original_id'] for p in problems}
+        for p in problems:
+            assert p['problem_id'].startswith(f"fbv1c_{p['metadata']['source']}_")
+            assert all(pid.startswith(f"fbv1_{p['metadata']['source']}_")
+                       for pid in p['metadata']['component_problem_ids'])
+
+    def test_earliest_freeze_compared_by_time(self, v1_data_dir):
+        first = _load_composed_dataset().problems[0]['metadata']
+        a_id, b_id = first['component_ids']
+        x_path = v1_data_dir / 'X_single_resolved.json'
+        data = json.loads(x_path.read_text())
+        # b sorts first as text but is four hours later than a
+        freezes = {a_id: '2024-07-21T00:00:00+00:00', b_id: '2024-07-20T23:00:00-05:00'}
+        for q in data['questions']:
+            if q['id'] in freezes and q['question_set'] == first['question_set']:
+                q['freeze_datetime'] = freezes[q['id']]
+        x_path.write_text(json.dumps(data))
+        problem = next(p for p in _load_composed_dataset().problems if p['metadata']['original_id'] == first['original_id'])
+        assert problem['time_testing'] == freezes[a_id]
+
+    def test_loaded_problems_do_not_share_cached_metadata(self, v1_data_dir):
+        loaded = ProblemLoader().load('forecastbench_v1_composed', max_quest=5)
+        for p in loaded.values():
+            assert not any(isinstance(v, (list, dict)) for v in p['metadata'].values())
+        cached = {p['problem_id']: p for p in _load_composed_dataset().problems}
+        for pid, p in loaded.items():
+            assert p['metadata'] is not cached[pid]['metadata']
+
+    def test_question_reflects_direction(self, v1_data_dir):
+        for p in _load_composed_dataset().problems:
+            first, second = p['question'].splitlines()[1:]
+            assert first.endswith("Yes.") == (p['metadata']['direction'][0] == 1)
+            assert second.endswith("Yes.") == (p['metadata']['direction'][1] == 1)
+
+    def test_strategy_sampling_and_filters(self, v1_data_dir):
+        loader = ProblemLoader()
+        problems = loader.load('forecastbench_v1_composed', max_quest=12, seed=3)
+        assert len(problems) == 12
+        assert list(problems) == list(loader.load('forecastbench_v1_composed', max_quest=12, seed=3))
+        assert all(pid.startswith('fbv1c_') for pid in problems)
+
+        filtered = loader.load('forecastbench_v1_composed', max_quest=100, horizons=['near_term'])
+        assert filtered
+        assert all(p['metadata']['horizon'] == 'near_term' for p in filtered.values())
+
+    def test_per_cluster_cap(self, v1_data_dir, monkeypatch):
+        # Group the composed rows into 4 clusters
+        monkeypatch.setattr(forecastbench_v1_composed, 'near_duplicate_clusters',
+                            lambda texts: np.arange(len(texts)) % 4)
+        sample = ProblemLoader().load('forecastbench_v1_composed', max_quest=1000, per_cluster=1)
+        row_of = {p['problem_id']: i for i, p in enumerate(_load_composed_dataset().problems)}
+        assert sorted(row_of[pid] % 4 for pid in sample) == [0, 1, 2, 3]
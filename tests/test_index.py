@@ -0,0 +1,154 @@
+"""Tests for posting-list indexes and index-backed ForecastBench_v1 filters."""
+
+import numpy as np
+import pytest
+
+from fortest.loader.index import PostingIndex, SortedTimeIndex
+from fortest.loader.loader import ProblemLoader
+from fortest.loader.custom_loaders.forecastbench_v1 import (
+    _load_and_prepare_all,
+    _select_rows,
+    _stratified_sample,
+)
+
+
+class TestPostingIndex:
+    """Tests for PostingIndex."""
+
+    def setup_method(self):
+        self.index = PostingIndex.build({
+            'source': ['a', 'b', 'a', 'c', 'a', 'b'],
+            'date': ['2024-01-01', '2024-01-03', '2024-01-02', None, '2024-01-03', '2024-01-01'],
+        })
+
+    def test_rows_sorted_union(self):
+        assert self.index.rows('source', ['a']).tolist() == [0, 2, 4]
+        assert self.index.rows('source', ['b', 'a']).tolist() == [0, 1, 2, 4, 5]
+        assert self.index.rows('source', ['zzz']).tolist() == []
+
+    def test_select_intersects(self):
+        rows = self.index.select(source=['a', 'b'], date=['2024-01-01'])
+        assert rows.tolist() == [0, 5]
+
+    def test_select_without_filters_returns_all(self):
+        assert self.index.select(source=None).tolist() == list(range(6))
+
+    def test_mask(self):
+        rows = np.array([5, 0, 3, 1])
+        assert self.index.mask(rows, 'source', ['a', 'b']).tolist() == [True, True, False, True]
+        assert self.index.mask(rows, 'date', [None, 'zzz']).tolist() == [False, False, True, False]
+
+    def test_counts(self):
+        assert self.index.count('source', 'a') == 3
+        assert self.index.count('source', 'nope') == 0
+
+
+class TestSortedTimeIndex:
+    """Tests for SortedTimeIndex."""
+
+    def setup_method(self):
+        self.index = SortedTimeIndex.from_strings([
+            '2024-01-03', '2024-01-01T12:00:00Z', None, '2024-01-02', '2024-01-01', 'N/A', '2024-01-02',
+        ])
+
+    def test_window_in_time_order(self):
+        assert self.index.window('2024-01-01T06:00:00', '2024-01-03').tolist() == [1, 3, 6]
+        assert self.index.rows('2024-01-01T06:00:00', '2024-01-03').tolist() == [1, 3, 6]
+
+    def test_open_bounds_skip_missing(self):
+        assert len(self.index) == 5
+        assert self.index.window().tolist() == [4, 1, 3, 6, 0]
+        assert self.index.window(high='2024-01-02').tolist() == [4, 1]
+        assert self.index.count(low='2024-01-02') == 3
+
+    def test_empty_and_inverted_windows(self):
+        assert self.index.window('2025-01-01').tolist() == []
+        assert self.index.count('2024-01-03', '2024-01-01') == 0
+
+    def test_mask(self):
+        rows = np.array([6, 2, 0, 1, 5])
+        assert self.index.mask(rows, '2024-01-01T06:00:00', '2024-01-03').tolist() == [True, False, False, True, False]
+        assert self.index.mask(rows, low='2024-01-02').tolist() == [True, False, True, False, False]
+
+    def test_bad_bound(self):
+        with pytest.raises(ValueError):
+            self.index.window('not a date')
+
+
+class TestIndexedLoads:
+    """Index-backed filters must agree with a linear scan."""
+
+    def test_select_rows_matches_scan(self, v1_data_dir):
+        problems = _load_and_prepare_all()
+        rows = _select_rows(sources=['fred', 'manifold'], horizons=['near_term', 'extended'])
+        expected = [i for i, p in enumerate(problems)
+                    if p['metadata']['source'] in ('fred', 'manifold')
+                    and p['metadata']['horizon'] in ('near_term', 'extended')]
+        assert rows.tolist() == expected
+
+    def test_sample_on_rows_matches_filtered_sample(self, v1_data_dir):
+        problems = _load_and_prepare_all()
+        rows = _select_rows(sources=['fred', 'acled'], horizons=['long_term'])
+        by_rows = _stratified_sample(problems, 10, 7, rows=rows)
+        by_filter = _stratified_sample(problems, 10, 7, sources=['fred', 'acled'], horizons=['long_term'])
+        assert list(by_rows) == list(by_filter)
+
+    def test_question_set_and_freeze_window(self, v1_data_dir):
+        loader = ProblemLoader()
+        result = loader.load('forecastbench_v1', max_quest=1000, question_sets=['2024-08-04-llm.json'])
+        assert result
+        assert all(p['metadata']['question_set'] == '2024-08-04-llm.json' for p in result.values())
+
+        window = loader.load('forecastbench_v1', max_quest=1000,
+                             freeze_start='2024-07-01', freeze_end='2024-08-01')
+        assert window
+        assert all('2024-07-01' <= p['time_testing'][:10] < '2024-08-01' for p in window.values())
+        assert len(window) + len(result) == len(_load_and_prepare_all())
+
+    def test_index_rows_are_sorted_int_arrays(self, v1_data_dir):
+        rows = _select_rows(sources=['yfinance'])
+        assert rows.dtype == np.int64
+        assert np.all(np.diff(rows) > 0)
+
+
+class TestTimeWindowLoads:
+    """The forecastbench_v1_window strategy agrees with a linear scan."""
+
+    @staticmethod
+    def _scan(testing=(None, None), end=(None, None)):
+        def inside(value, low, high):
+            return (low is None or value >= low) and (high is None or value < high)
+        return [p for p in _load_and_prepare_all()
+                if inside(p['time_testing'][:10], *testing) and inside(p['time_end'][:10], *end)]
+
+    def test_frozen_before(self, v1_data_dir):
+        result = ProblemLoader().load('forecastbench_v1_window', testing_end='2024-08-01')
+        assert list(result) == [p['problem_id'] for p in self._scan(testing=(None, '2024-08-01'))]
+
+    def test_end_window_in_time_order(self, v1_data_dir):
+        result = list(ProblemLoader().iter_load('forecastbench_v1_window',
+                                                end_start='2024-08-01', end_end='2024-10-01'))
+        expected = self._scan(end=('2024-08-01', '2024-10-01'))
+        assert result and sorted(p['problem_id'] for p in result) == sorted(p['problem_id'] for p in expected)
+        testing = [p['time_testing'] for p in result]
+        assert testing == sorted(testing)
+
+    def test_filters_sampling_and_shards(self, v1_data_dir):
+        loader = ProblemLoader()
+        kwargs = dict(testing_start='2024-08-01', sources=['fred', 'manifold'], max_quest=6, seed=3)
+        sample = loader.load('forecastbench_v1_window', **kwargs)
+        assert len(sample) == 6
+        assert all(p['metadata']['source'] in ('fred', 'manifold') for p in sample.values())
+        assert all(p['time_testing'] >= '2024-08-01' for p in sample.values())
+        assert list(sample) == list(loader.load('forecastbench_v1_window', **kwargs))
+        shards = [loader.load('forecastbench_v1_window', shard_index=i, num_shards=3, **kwargs) for i in range(3)]
+        assert sorted(pid for shard in shards for pid in shard) == sorted(sample)
+
+    def test_windows_share_one_index_build(self, v1_data_dir, monkeypatch):
+        from fortest.loader.custom_loaders import forecastbench_v1
+        loader = ProblemLoader()
+        loader.load('forecastbench_v1_window', testing_end='2024-08-01')
+        monkeypatch.setattr(forecastbench_v1, '_time_indexes',
+                            lambda problems: pytest.fail("time indexes were rebuilt"))
+        for start in ('2024-07-01', '2024-07-15', '2024-08-01'):
+            loader.load('forecastbench_v1_window', testing_start=start)
@@ -0,0 +1,203 @@
+"""Tests for the process-wide ForecastBench_v1 dataset cache."""
+
+import os
+import json
+from datetime import datetime
+
+import pytest
+
+from fortest.loader.loader import ProblemLoader, base_process_problem, process_problems
+from fortest.loader.cache import FileCache, file_fingerprint
+from fortest.loader.custom_loaders import forecastbench_v1
+from fortest.loader.custom_loaders.forecastbench_v1 import (
+    _load_and_prepare_all,
+    invalidate_cache,
+)
+
+
+class TestFileCache:
+    """Tests for the generic FileCache."""
+
+    def test_reuses_value_until_file_changes(self, tmp_path):
+        path = tmp_path / 'data.json'
+        path.write_text('[1]')
+        cache = FileCache()
+        calls = []
+
+        def build():
+            calls.append(1)
+            return json.loads(path.read_text())
+
+        assert cache.get('k', [path], build) == [1]
+        assert cache.get('k', [path], build) == [1]
+        assert len(calls) == 1
+
+        path.write_text('[1, 2]')
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert cache.get('k', [path], build) == [1, 2]
+        assert len(calls) == 2
+
+    def test_invalidate_forces_rebuild(self, tmp_path):
+        path = tmp_path / 'data.json'
+        path.write_text('{}')
+        cache = FileCache()
+        calls = []
+        cache.get('k', [path], lambda: calls.append(1))
+        cache.invalidate()
+        cache.get('k', [path], lambda: calls.append(1))
+        assert len(calls) == 2
+
+    def test_missing_file_fingerprint(self, tmp_path):
+        assert file_fingerprint(tmp_path / 'missing')[1:] == (-1, -1)
+
+
+class TestDatasetCache:
+    """Tests for the memoized ForecastBench_v1 dataset."""
+
+    def test_prepared_dataset_is_shared(self, v1_data_dir):
+        first = _load_and_prepare_all()
+        second = _load_and_prepare_all()
+        assert first is second
+        assert isinstance(first, tuple)
+
+    def test_loads_do_not_reparse(self, v1_data_dir, monkeypatch):
+        _load_and_prepare_all()
+        calls = []
+        original = forecastbench_v1._load_raw_data
+        monkeypatch.setattr(forecastbench_v1, '_load_raw_data',
+                            lambda: calls.append(1) or original())
+        loader = ProblemLoader()
+        loader.load('forecastbench_v1', max_quest=20, seed=1)
+        loader.load('forecastbench_v1_source', source='fred', max_quest=5, seed=2)
+        loader.load('forecastbench_v1_extensive', max_quest=20, seed=3)
+        assert calls == []
+
+    def test_mutating_result_does_not_touch_cache(self, v1_data_dir):
+        loader = ProblemLoader()
+        result = loader.load('forecastbench_v1', max_quest=10, seed=1)
+        for p in result.values():
+            p['question'] = 'changed'
+            p['metadata']['source'] = 'changed'
+        cached = {p['problem_id']: p for p in _load_and_prepare_all()}
+        for pid in result:
+            assert cached[pid]['question'] != 'changed'
+            assert cached[pid]['metadata']['source'] != 'changed'
+
+    def test_invalidate_rereads_files(self, v1_data_dir):
+        before = _load_and_prepare_all()
+        invalidate_cache()
+        after = _load_and_prepare_all()
+        assert before is not after
+        assert [p['problem_id'] for p in before] == [p['problem_id'] for p in after]
+
+
+class TestRawProblems:
+    """Tests for lazily parsed problems.json."""
+
+    def test_unused_raw_db_is_not_read(self, v1_data_dir, tmp_path):
+        loader = ProblemLoader(db_path=str(tmp_path / 'missing.json'))
+        result = loader.load('forecastbench_v1', max_quest=5, seed=1)
+        assert len(result) == 5
+
+    def test_raw_db_parsed_once(self, tmp_path, monkeypatch):
+        db = tmp_path / 'problems.json'
+        db.write_text(json.dumps([{
+            'problem_id': 'P1', 'question': 'Q?', 'metadata': {'source': 'x'},
+            'time_start': '2024-01-01', 'time_end': '2024-02-01',
+            'resolved_flag': True, 'resolution_status': 1.0,
+        }]))
+        opened = []
+        real_open = open
+        monkeypatch.setattr('builtins.open', lambda p, *a, **k: opened.append(str(p)) or real_open(p, *a, **k))
+        loader = ProblemLoader(db_path=str(db))
+        assert list(loader.load('load_all')) == ['P1']
+        assert list(loader.load('load_by_source', source='x')) == ['P1']
+        assert opened.count(str(db)) == 1
+
+    def test_mutating_result_does_not_touch_cache(self, tmp_path):
+        db = tmp_path / 'problems.json'
+        db.write_text(json.dumps([{
+            'problem_id': 'P1', 'question': 'Q?', 'metadata': {'source': 'x'},
+            'time_start': '2024-01-01', 'time_end': '2024-02-01',
+            'resolved_flag': True, 'resolution_status': 1.0,
+        }]))
+        first = ProblemLoader(db_path=str(db)).load('load_all')
+        first['P1']['metadata']['source'] = 'HACKED'
+        first['P1']['question'] = 'edited'
+        again = ProblemLoader(db_path=str(db)).load('load_all')
+        assert again['P1']['metadata']['source'] == 'x' and again['P1']['question'] == 'Q?'
+        assert list(ProblemLoader(db_path=str(db)).load('load_by_source', source='x')) == ['P1']
+
+
+class TestStreaming:
+    """Tests for streaming v1 loads."""
+
+    def test_iter_load_matches_load(self, v1_data_dir):
+        loader = ProblemLoader()
+        streamed = [p['problem_id'] for p in loader.iter_load('forecastbench_v1', max_quest=30, seed=5)]
+        assert streamed == list(loader.load('forecastbench_v1', max_quest=30, seed=5))
+
+    def test_iter_load_batches(self, v1_data_dir):
+        loader = ProblemLoader()
+        batches = list(loader.iter_load('forecastbench_v1_extensive', batch_size=8, max_quest=30, seed=5))
+        assert [len(b) for b in batches] == [8, 8, 8, 6]
+
+    def test_invalid_source_raises_eagerly(self, v1_data_dir):
+        with pytest.raises(ValueError):
+            ProblemLoader().iter_load('forecastbench_v1_source', source='nope')
+
+
+class TestProcessProblems:
+    """Tests for batch problem processing."""
+
+    def test_shared_time_now_and_defaults(self, monkeypatch):
+        calls = []
+        real_datetime = datetime
+
+        class CountingDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                calls.append(1)
+                return real_datetime.now(tz)
+
+        monkeypatch.setattr('fortest.loader.loader.datetime', CountingDatetime)
+        problems = [{'problem_id': f"P{i}", 'time_start': f"2024-01-{i + 1:02d}"} for i in range(50)]
+        processed = list(process_problems(problems))
+        assert len(calls) == 1
+        assert len({p['time_now'] for p in processed}) == 1
+        assert [p['time_testing'] for p in processed] == [p['time_start'] for p in problems]
+        assert all('time_now' not in p for p in problems)
+
+        fixed = list(process_problems(problems, time_testing='2025-01-01', time_now='NOW'))
+        assert {(p['time_testing'], p['time_now']) for p in fixed} == {('2025-01-01', 'NOW')}
+
+    def test_clock_read_when_called(self, monkeypatch):
+        ticks = []
+        real_datetime = datetime
+
+        class TickingDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                ticks.append(1)
+                return real_datetime(2024, 1, len(ticks))
+
+        monkeypatch.setattr('fortest.loader.loader.datetime', TickingDatetime)
+        problems = process_problems([{'problem_id': 'P', 'time_start': '2024-01-01'}])
+        assert len(ticks) == 1
+        assert next(problems)['time_now'] == '2024-01-01T00:00:00'
+        assert base_process_problem({'problem_id': 'Q', 'time_start': '2024-01-01'})['time_now'] == '2024-01-02T00:00:00'
+
+    def test_copy_false_updates_in_place(self):
+        problem = {'problem_id': 'P', 'time_start': '2024-01-01'}
+        assert base_process_problem(problem, copy=False) is problem
+        assert next(process_problems([problem], copy=False)) is problem
+        assert problem['time_testing'] == '2024-01-01'
+
+    def test_loads_share_time_now(self, v1_data_dir, tmp_path):
+        db = tmp_path / 'problems.json'
+        db.write_text(json.dumps([{'problem_id': f"P{i}", 'time_start': '2024-01-01', 'metadata': {}}
+                                  for i in range(20)]))
+        assert len({p['time_now'] for p in ProblemLoader(str(db)).load('load_all').values()}) == 1
+        v1 = ProblemLoader().load('forecastbench_v1', max_quest=30)
+        assert len({p['time_now'] for p in v1.values()}) == 1
@@ -0,0 +1,107 @@
+"""Tests for the column-wise ProblemTable."""
+
+import json
+
+import numpy as np
+import pytest
+
+from fortest.environment.manager import EnvironmentManager
+from fortest.loader.loader import ProblemLoader
+from fortest.loader.table import ProblemTable, ProblemView
+from fortest.loader.timecols import to_epoch_seconds
+from fortest.scripts.benchmark_problem_table import measure
+
+
+def _problems():
+    return [
+        {'problem_id': 'A', 'question': 'Alpha?', 'time_start': '2024-01-01', 'resolved_flag': True,
+         'resolution_status': 1.0, 'metadata': {'source': 'fred', 'days': 3, 'choices': [1, 2]}},
+        {'problem_id': 'B', 'question': 'Beta?', 'time_start': '2024-01-01', 'resolved_flag': False,
+         'resolution_status': None, 'metadata': {'source': 'fred', 'extra': {'nested': True}}},
+        {'problem_id': 'C', 'question': None, 'time_start': '2024-02-01', 'resolved_flag': True,
+         'resolution_status': 1, 'metadata': {'source': 'acled', 'days': 3}, 'only_here': 'x'},
+    ]
+
+
+class TestProblemTable:
+    """Round trips and Mapping behaviour."""
+
+    def test_round_trip(self):
+        problems = _problems()
+        table = ProblemTable.from_problems(problems)
+        assert list(table) == ['A', 'B', 'C']
+        assert table.to_dict() == {p['problem_id']: p for p in problems}
+        for p in problems:
+            view = table[p['problem_id']]
+            assert list(view) == list(p)
+            assert list(view['metadata']) == list(p['metadata'])
+
+    def test_types_preserved(self):
+        table = ProblemTable.from_problems(_problems())
+        assert type(table['A']['resolution_status']) is float
+        assert type(table['C']['resolution_status']) is int
+        assert table['A']['resolved_flag'] is True
+        assert table['A']['metadata']['choices'] == [1, 2]
+
+    def test_missing_keys(self):
+        table = ProblemTable.from_problems(_problems())
+        assert 'only_here' not in table['A']
+        assert table['A'].get('only_here') is None
+        assert table['C']['only_here'] == 'x'
+        assert 'days' not in table['B']['metadata']
+        with pytest.raises(KeyError):
+            table['B']['metadata']['days']
+        with pytest.raises(KeyError):
+            table['Z']
+
+    def test_views_are_slotted_and_copies_are_dicts(self):
+        table = ProblemTable.from_problems(_problems())
+        view = table['A']
+        assert isinstance(view, ProblemView)
+        assert not hasattr(view, '__dict__')
+        copy = view.copy()
+        copy['metadata']['choices'].append(3)
+        assert type(copy) is dict and type(copy['metadata']) is dict
+        assert table['A']['metadata']['choices'] == [1, 2]
+        json.dumps(copy)
+
+    def test_duplicate_ids_match_dict_semantics(self):
+        problems = _problems() + [dict(_problems()[0], question='Alpha again?')]
+        table = ProblemTable.from_problems(problems)
+        assert list(table) == ['A', 'B', 'C']
+        assert table['A']['question'] == 'Alpha again?'
+
+    def test_epoch_seconds(self):
+        table = ProblemTable.from_problems(_problems())
+        expected = to_epoch_seconds(['2024-01-01', '2024-01-01', '2024-02-01'])
+        assert np.array_equal(table.epoch_seconds('time_start'), expected)
+
+
+class TestLoadTable:
+    """Table loads agree with dict loads."""
+
+    @pytest.mark.parametrize('strategy', ['forecastbench_v1', 'forecastbench_v1_composed'])
+    def test_matches_dict_load(self, v1_data_dir, strategy):
+        loader = ProblemLoader()
+        table = loader.load_table(strategy, max_quest=1000)
+        problems = loader.load(strategy, max_quest=1000)
+        assert list(table) == list(problems)
+        for pid, p in problems.items():
+            view = table[pid].to_dict()
+            view.pop('time_now')
+            assert view == {k: v for k, v in p.items() if k != 'time_now'}
+
+    def test_environment_manager_compact(self, v1_data_dir):
+        env = EnvironmentManager(loader_strategy='forecastbench_v1', compact=True, max_quest=20)
+        assert isinstance(env.problems, ProblemTable)
+        pid = next(iter(env.problems))
+        assert env.problems[pid]['metadata']['source']
+        anonymized = env.get_problems()[pid]
+        assert 'resolution_status' not in anonymized
+        env.submit_prediction(pid, 0.5)
+        assert env.compute_metrics()['count'] == 1
+
+    def test_memory_benchmark(self, v1_data_dir):
+        result = measure('forecastbench_v1', max_quest=1000)
+        assert result['problems'] == 120
+        assert result['table_bytes'] < result['dict_bytes']
@@ -0,0 +1,86 @@
+"""Tests for lazy loader/search registries and import-time footprint."""
+
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from fortest.loader.loader import ProblemLoader
+from fortest.environment.search_core.base import SearchCore
+from fortest.registry import _registered_names
+
+SRC_DIR = str(Path(__file__).parent.parent / "src")
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    return subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+
+
+class TestManifestScan:
+    """Tests for the import-free registration scan."""
+
+    def test_finds_decorated_functions(self):
+        source = (
+            "@ProblemLoader.register('a')\n"
+            "def a(p): pass\n"
+            "@SearchCore.register('b')\n"
+            "async def b(q, t): pass\n"
+        )
+        assert list(_registered_names(source, "ProblemLoader")) == ["a"]
+        assert list(_registered_names(source, "SearchCore")) == ["b"]
+
+    def test_loader_names_listed_without_import(self):
+        loader = ProblemLoader()
+        assert "forecastbench_v1" in loader.list_available_loaders()
+        assert "load_all" in loader.list_available_loaders()
+
+    def test_search_names_listed(self):
+        functions = SearchCore().list_available_functions()
+        assert "mock_google" in functions
+        assert "perplexity_search" in functions
+
+    def test_unknown_strategy_raises(self):
+        with pytest.raises(ValueError):
+            ProblemLoader().load("does_not_exist")
+
+    @pytest.mark.asyncio
+    async def test_unknown_search_function_raises(self):
+        with pytest.raises(ValueError):
+            await SearchCore().execute("does_not_exist", "q", "2024-01-01")
+
+    def test_manifest_built_once(self):
+        ProblemLoader()
+        manifest = ProblemLoader._manifest
+        ProblemLoader()
+        assert ProblemLoader._manifest is manifest
+
+
+class TestImportFootprint:
+    """Constructing the environment must not import plotting/analysis modules."""
+
+    def test_manager_import_skips_matplotlib(self):
+        result = _run(
+            "import sys\n"
+            "import fortest.environment.manager\n"
+            "assert 'matplotlib' not in sys.modules, 'matplotlib imported'\n"
+            "assert 'fortest.environment.search_core.search_plots' not in sys.modules\n"
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_environment_construction_is_lazy(self):
+        result = _run(
+            "import sys\n"
+            "from fortest.environment.manager import EnvironmentManager\n"
+            "env = EnvironmentManager(loader_strategy='load_all')\n"
+            "env.get_available_search_functions()\n"
+            "for mod in ('matplotlib', 'pandas',\n"
+            "            'fortest.environment.search_core.search_plots',\n"
+            "            'fortest.environment.search_core.search_analyzer',\n"
+            "            'fortest.environment.search_core.real_search',\n"
+            "            'fortest.loader.custom_loaders.forecastbench_v1'):\n"
+            "    assert mod not in sys.modules, mod\n"
+        )
+        assert result.returncode == 0, result.stderr
@@ -0,0 +1,134 @@
+"""Tests for the quota-exact stratified sampler."""
+
+import time
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from fortest.loader.sampling import allocate_quota, cap_per_group, quota_sample
+
+
+class TestAllocateQuota:
+    """Tests for largest-remainder allocation with capacity redistribution."""
+
+    def test_equal_split(self):
+        assert allocate_quota(9, np.array([10, 10, 10])).tolist() == [3, 3, 3]
+
+    def test_surplus_redistributed(self):
+        alloc = allocate_quota(500, np.array([60, 1000, 1000, 20, 5]))
+        assert alloc.sum() == 500
+        assert alloc[3] == 20 and alloc[4] == 5
+        assert alloc[0] == 60
+
+    def test_remainder_goes_to_largest_capacity(self):
+        assert allocate_quota(4, np.array([5, 50, 5])).tolist() == [1, 2, 1]
+
+    def test_capped_by_total_capacity(self):
+        assert allocate_quota(100, np.array([3, 0, 4])).tolist() == [3, 0, 4]
+
+    @pytest.mark.parametrize('total', [0, 1, 7, 55, 999])
+    def test_never_exceeds_capacity(self, total):
+        capacity = np.array([0, 1, 2, 30, 400, 17])
+        alloc = allocate_quota(total, capacity)
+        assert alloc.sum() == min(total, capacity.sum())
+        assert np.all(alloc <= capacity)
+
+
+class TestQuotaSample:
+    """Tests for quota_sample."""
+
+    def setup_method(self):
+        rng = np.random.default_rng(0)
+        self.source = rng.integers(0, 4, 5000)
+        self.horizon = rng.integers(0, 5, 5000)
+        # Sources 0 and 1 are horizon-stratified
+        self.stratify = np.array([True, True, False, False])
+
+    def test_exact_size_without_duplicates(self):
+        rows = quota_sample(self.source, self.horizon, self.stratify, 321, seed=1)
+        assert len(rows) == 321
+        assert len(np.unique(rows)) == 321
+
+    def test_sources_balanced(self):
+        rows = quota_sample(self.source, self.horizon, self.stratify, 400, seed=1)
+        assert Counter(self.source[rows].tolist()) == {0: 100, 1: 100, 2: 100, 3: 100}
+
+    def test_market_sources_stratified_by_horizon(self):
+        rows = quota_sample(self.source, self.horizon, self.stratify, 400, seed=3)
+        for src in (0, 1):
+            counts = Counter(self.horizon[rows][self.source[rows] == src].tolist())
+            assert counts == {h: 20 for h in range(5)}
+
+    def test_reproducible_and_seed_dependent(self):
+        a = quota_sample(self.source, self.horizon, self.stratify, 100, seed=5)
+        b = quota_sample(self.source, self.horizon, self.stratify, 100, seed=5)
+        c = quota_sample(self.source, self.horizon, self.stratify, 100, seed=6)
+        assert a.tolist() == b.tolist()
+        assert set(a.tolist()) != set(c.tolist())
+
+    def test_does_not_touch_global_random_state(self):
+        random.seed(123)
+        expected = random.random()
+        random.seed(123)
+        quota_sample(self.source, self.horizon, self.stratify, 100, seed=5)
+        assert random.random() == expected
+
+    def test_more_than_available_returns_all(self):
+        rows = quota_sample(self.source[:50], self.horizon[:50], self.stratify, 1000, seed=1)
+        assert sorted(rows.tolist()) == list(range(50))
+
+    def test_million_rows_is_fast(self):
+        rng = np.random.default_rng(1)
+        source = rng.integers(0, 9, 1_000_000).astype(np.int16)
+        horizon = rng.integers(0, 6, 1_000_000).astype(np.int8)
+        stratify = np.arange(9) % 2 == 0
+        start = time.perf_counter()
+        rows = quota_sample(source, horizon, stratify, 500_000, seed=1)
+        assert len(rows) == 500_000
+        assert time.perf_counter() - start < 1.0
+        start = time.perf_counter()
+        assert len(quota_sample(source, horizon, stratify, 1_000_000, seed=1)) == 1_000_000
+        assert time.perf_counter() - start < 1.0
+
+    @pytest.mark.parametrize('n_sources', [4, 60, 7000])
+    def test_code_dtypes_give_same_sample(self, n_sources):
+        rng = np.random.default_rng(2)
+        source = rng.integers(0, n_sources, 20_000)
+        horizon = rng.integers(0, 6, 20_000)
+        stratify = np.arange(n_sources) % 3 == 0
+        wide = quota_sample(source, horizon, stratify, 3000, seed=4)
+        narrow = quota_sample(source.astype(np.int16), horizon.astype(np.uint8), stratify, 3000, seed=4)
+        assert wide.tolist() == narrow.tolist() and len(np.unique(wide)) == 3000
+
+
+class TestClusterCap:
+    """Tests for capping the sample per near-duplicate cluster."""
+
+    def setup_method(self):
+        rng = np.random.default_rng(0)
+        self.source = rng.integers(0, 4, 2000)
+        self.horizon = rng.integers(0, 5, 2000)
+        self.stratify = np.array([True, True, False, False])
+        self.cluster = rng.integers(0, 150, 2000)
+
+    def test_cap_per_group(self):
+        groups = np.array([3, 3, 3, 1, 1, 2, 3])
+        kept = cap_per_group(groups, 2, np.random.default_rng(0))
+        assert Counter(groups[kept].tolist()) == {3: 2, 1: 2, 2: 1}
+        assert np.all(np.diff(kept) > 0)
+
+    def test_sample_respects_cap(self):
+        rows = quota_sample(self.source, self.horizon, self.stratify, 1000, seed=1,
+                            cluster=self.cluster, per_cluster=2)
+        assert len(rows) == 300
+        assert max(Counter(self.cluster[rows].tolist()).values()) <= 2
+
+    def test_cap_reproducible_and_optional(self):
+        kwargs = dict(cluster=self.cluster, per_cluster=3)
+        a = quota_sample(self.source, self.horizon, self.stratify, 100, seed=4, **kwargs)
+        assert a.tolist() == quota_sample(self.source, self.horizon, self.stratify, 100, seed=4, **kwargs).tolist()
+        uncapped = quota_sample(self.source, self.horizon, self.stratify, 100, seed=4)
+        assert uncapped.tolist() == quota_sample(self.source, self.horizon, self.stratify, 100, seed=4,
+                                                 cluster=self.cluster).tolist()
@@ -0,0 +1,95 @@
+"""Tests for the local time-series store and StoreBackedResolver."""
+
+import json
+
+import numpy as np
+import pytest
+
+from fortest.problems.ForecastBenchTemplatized.resolver import (
+    StoreBackedResolver,
+    TemplatedQuestion,
+    date_grid,
+)
+from fortest.problems.ForecastBenchTemplatized.store import (
+    SeriesStore,
+    build_series_store,
+    write_series_store,
+)
+
+
+def _template(tid):
+    return TemplatedQuestion(tid, 'fred', f"Will {tid} rise from {{forecast_due_date}} to {{resolution_date}}?",
+                             '', '', '', '')
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = write_series_store(tmp_path / 'series', {
+        'UNRATE': (['2025-03-01', '2025-01-01', '2025-02-01', '2025-02-01', 'N/A'], [4.2, 4.0, 3.9, 4.1, 1]),
+        'SP500': (['2025-01-02T16:00:00Z', '2025-01-03'], ['5800.5', 'nan']),
+    })
+    return SeriesStore(path)
+
+
+class TestSeriesStore:
+    """Tests for SeriesStore."""
+
+    def test_sorted_and_deduplicated(self, store):
+        days, values = store.series('UNRATE')
+        assert np.all(np.diff(days) > 0)
+        assert values.tolist() == [4.0, 4.1, 4.2]
+        assert store.series('SP500')[1].tolist() == [5800.5]
+        assert len(store) == 2 and 'UNRATE' in store and 'GDP' not in store
+
+    def test_as_of(self, store):
+        assert store.as_of('UNRATE', '2025-02-15') == 4.1
+        assert store.as_of('UNRATE', '2025-02-01') == 4.1
+        assert store.as_of('UNRATE', '2024-12-31') is None
+        assert store.as_of('GDP', '2025-02-01') is None
+
+    def test_as_of_many(self, store):
+        values = store.as_of_many('UNRATE', ['2024-01-01', '2025-01-15', '2025-03-01', '2030-01-01', 'bad'])
+        assert np.isnan(values[0]) and np.isnan(values[4])
+        assert values[1:3].tolist() == [4.0, 4.2]
+
+    def test_not_carried_past_last_observation(self, store):
+        assert store.as_of('UNRATE', '2025-03-01') == 4.2
+        assert store.as_of('UNRATE', '2025-03-02') is None
+        assert store.as_of('SP500', '2025-01-02') == 5800.5
+        assert store.as_of('SP500', '2025-01-03') is None
+
+    def test_max_staleness(self, store):
+        assert store.as_of('UNRATE', '2025-02-15', max_staleness_days=14) == 4.1
+        assert store.as_of('UNRATE', '2025-02-16', max_staleness_days=14) is None
+
+    def test_memory_mapped(self, store):
+        assert isinstance(store._dates, np.memmap)
+
+    def test_build_from_csv_and_json(self, tmp_path):
+        (tmp_path / 'long.csv').write_text("series_id,date,value\nA,2025-01-01,1\nA,2025-01-05,2\nB,2025-01-01,7\n")
+        (tmp_path / 'C.csv').write_text("date,value\n2025-01-01,3\n")
+        (tmp_path / 'more.json').write_text(json.dumps({'A': {'2025-01-05': 5}, 'D': [['2025-01-02', 9]]}))
+        store = SeriesStore(build_series_store(
+            [tmp_path / 'long.csv', tmp_path / 'C.csv', tmp_path / 'more.json'], tmp_path / 'store'))
+        assert store.series_ids == ['A', 'B', 'C', 'D']
+        assert store.as_of('A', '2025-01-05') == 5.0
+        assert store.as_of('C', '2025-01-01') == 3.0
+
+
+class TestStoreBackedResolver:
+    """StoreBackedResolver resolves offline from the store."""
+
+    def test_fetch(self, store):
+        resolver = StoreBackedResolver(store.path)
+        assert resolver.fetch_value('UNRATE', '2025-01-20') == 4.0
+        assert resolver.fetch_many('UNRATE', ['2025-01-20', '2024-01-01', '2025-04-01']) == [4.0, None, None]
+        assert StoreBackedResolver(store, max_staleness_days=7).fetch_value('UNRATE', '2025-01-20') is None
+
+    def test_resolve_grid_matches_single(self, store):
+        resolver = StoreBackedResolver(store)
+        templates = [_template('UNRATE'), _template('SP500'), _template('MISSING')]
+        grid = date_grid(['2025-01-01', '2025-02-01'], resolution_dates=['2025-02-01', '2025-03-01'])
+        results = resolver.resolve_many(templates, grid)
+        assert [r.resolved_to for r in results] == [1.0, 1.0, 1.0, None, None, None, None, None, None]
+        single = [resolver.resolve(t, d, r) for t in templates for d, r in grid]
+        assert results == single
@@ -0,0 +1,143 @@
+"""Tests for offline ForecastBench provisioning and the consolidated snapshot (no network)."""
+
+import os
+import shutil
+import tarfile
+
+import pytest
+
+from fortest.loader.loader import ProblemLoader
+from fortest.loader.custom_loaders import forecastbench
+from fortest.loader.custom_loaders.forecastbench import (
+    SNAPSHOT_DIRNAME,
+    _iter_raw,
+    _open_snapshot,
+    build_forecastbench_snapshot,
+)
+from fortest.scripts import setup_datasets
+from fortest.scripts.setup_datasets import install_forecastbench_data, sha256_file
+
+
+def _write_manifest(root):
+    lines = []
+    for dirpath, _, files in os.walk(root):
+        for name in sorted(files):
+            path = os.path.join(dirpath, name)
+            lines.append(f"{sha256_file(path)}  {os.path.relpath(path, root)}")
+    (root / 'SHA256SUMS').write_text("\n".join(lines) + "\n")
+
+
+def _source_copy(fb_repo, tmp_path):
+    """A standalone copy of the fixture tree, outside the install targets' parent."""
+    source = tmp_path / 'source'
+    shutil.copytree(fb_repo / 'datasets', source / 'datasets')
+    return source
+
+
+def _strip_time_now(problems):
+    return {pid: {k: v for k, v in p.items() if k != 'time_now'} for pid, p in problems.items()}
+
+
+class TestInstall:
+    """Installing from local tarballs and directories."""
+
+    def test_install_from_tarball(self, fb_repo, tmp_path):
+        _write_manifest(fb_repo)
+        archive = tmp_path / 'fb.tar.gz'
+        with tarfile.open(archive, 'w:gz') as tar:
+            tar.add(fb_repo / 'datasets', arcname='forecastbench-datasets-main/datasets')
+            tar.add(fb_repo / 'SHA256SUMS', arcname='forecastbench-datasets-main/SHA256SUMS')
+        target = tmp_path / 'cache' / 'forecastbench'
+        install_forecastbench_data(archive, str(target), sha256=sha256_file(archive))
+        assert (target / 'datasets' / 'question_sets').is_dir()
+        assert (target / SNAPSHOT_DIRNAME / 'meta.json').exists()
+
+    def test_install_from_directory(self, fb_repo, tmp_path):
+        source = _source_copy(fb_repo, tmp_path)
+        _write_manifest(source)
+        target = tmp_path / 'cache' / 'forecastbench'
+        install_forecastbench_data(source, str(target), preprocess=False)
+        assert sorted(os.listdir(target / 'datasets' / 'question_sets')) == \
+            sorted(os.listdir(fb_repo / 'datasets' / 'question_sets'))
+        assert not (target / SNAPSHOT_DIRNAME).exists()
+
+    def test_archive_hash_mismatch(self, fb_repo, tmp_path):
+        archive = tmp_path / 'fb.tar'
+        with tarfile.open(archive, 'w') as tar:
+            tar.add(fb_repo / 'datasets', arcname='datasets')
+        target = tmp_path / 'cache' / 'forecastbench'
+        with pytest.raises(ValueError):
+            install_forecastbench_data(archive, str(target), sha256='0' * 64)
+        assert not target.exists()
+
+    def test_manifest_mismatch_leaves_no_partial_tree(self, fb_repo, tmp_path):
+        source = _source_copy(fb_repo, tmp_path)
+        _write_manifest(source)
+        victim = next((source / 'datasets' / 'question_sets').iterdir())
+        victim.write_text(victim.read_text() + ' ')
+        target = tmp_path / 'cache' / 'forecastbench'
+        with pytest.raises(ValueError):
+            install_forecastbench_data(source, str(target))
+        assert not target.exists()
+        assert [p for p in os.listdir(target.parent) if p.startswith('.forecastbench')] == []
+
+    def test_missing_manifest_rejected(self, fb_repo, tmp_path):
+        source = _source_copy(fb_repo, tmp_path)
+        target = tmp_path / 'cache' / 'forecastbench'
+        with pytest.raises(ValueError, match='SHA256SUMS'):
+            install_forecastbench_data(source, str(target), preprocess=False)
+        assert not target.exists()
+        install_forecastbench_data(source, str(target), preprocess=False, verify=False)
+        assert (target / 'datasets' / 'question_sets').is_dir()
+
+    def test_ensure_installs_from_source_env(self, fb_repo, tmp_path, monkeypatch):
+        target = tmp_path / 'shared' / 'forecastbench'
+        source = _source_copy(fb_repo, tmp_path)
+        _write_manifest(source)
+        # Resolved from the environment at call time, not at import
+        monkeypatch.setenv(setup_datasets.DATA_DIR_ENV, str(tmp_path / 'shared'))
+        monkeypatch.setenv(setup_datasets.SOURCE_ENV, str(source))
+        setup_datasets.ensure_forecastbench_data()
+        assert _open_snapshot(str(target)) is not None
+
+    def test_data_dir_ignores_working_directory(self, tmp_path, monkeypatch):
+        (tmp_path / 'data' / 'forecastbench').mkdir(parents=True)
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv(setup_datasets.DATA_DIR_ENV, raising=False)
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'xdg'))
+        assert setup_datasets.get_target_dir() == str(tmp_path / 'xdg' / 'fortest' / 'forecastbench')
+        monkeypatch.setenv(setup_datasets.DATA_DIR_ENV, './data')
+        assert setup_datasets.get_target_dir() == str(tmp_path / 'data' / 'forecastbench')
+
+    def test_target_inside_source_rejected(self, fb_repo, tmp_path):
+        with pytest.raises(ValueError):
+            install_forecastbench_data(fb_repo, str(fb_repo / 'cache' / 'forecastbench'))
+
+
+class TestSnapshotLoads:
+    """Loads served from the consolidated snapshot match the JSON path."""
+
+    @pytest.mark.parametrize('kwargs', [
+        {}, {'dataset_name': '2024-08-04-human'}, {'limit': 8},
+        {'shard_index': 1, 'num_shards': 3}, {'limit': 20, 'shard_index': 0, 'num_shards': 2},
+    ])
+    def test_matches_raw(self, fb_repo, kwargs):
+        loader = ProblemLoader()
+        raw = loader.load('forecastbench', workers=1, **kwargs)
+        build_forecastbench_snapshot(str(fb_repo), workers=1)
+        from_snapshot = loader.load('forecastbench', **kwargs)
+        assert list(from_snapshot) == list(raw)
+        assert _strip_time_now(from_snapshot) == _strip_time_now(raw)
+
+    def test_snapshot_skips_json(self, fb_repo, monkeypatch):
+        build_forecastbench_snapshot(str(fb_repo), workers=1)
+        monkeypatch.setattr(forecastbench, '_iter_raw', lambda *a, **k: pytest.fail("JSON tree was read"))
+        assert len(ProblemLoader().load('forecastbench')) == 36
+
+    def test_stale_snapshot_ignored(self, fb_repo):
+        build_forecastbench_snapshot(str(fb_repo), workers=1)
+        qfile = fb_repo / 'datasets' / 'question_sets' / '2024-07-21-llm.json'
+        qfile.write_text(qfile.read_text() + '\n')
+        assert _open_snapshot(str(fb_repo)) is None
+        base = str(fb_repo / 'datasets')
+        assert len(ProblemLoader().load('forecastbench')) == len(list(_iter_raw(base, None, None, 1)))
@@ -0,0 +1,88 @@
+"""Tests for deterministic problem-set sharding."""
+
+import subprocess
+import sys
+
+import pytest
+
+from fortest.loader.loader import ProblemLoader
+from fortest.loader.custom_loaders import forecastbench_v1
+from fortest.loader.custom_loaders.default import iter_random
+from fortest.loader.sharding import check_shard, shard_filter, shard_of
+
+
+class TestShardOf:
+    """Tests for the problem_id -> shard hash."""
+
+    def test_stable_across_processes(self):
+        ids = [f"fbv1_fred_q{i}" for i in range(20)]
+        local = [shard_of(pid, 7) for pid in ids]
+        code = f"from fortest.loader.sharding import shard_of; print([shard_of(p, 7) for p in {ids!r}])"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                             env={"PYTHONHASHSEED": "123", "PYTHONPATH": ":".join(sys.path)})
+        assert out.stdout.strip() == str(local)
+
+    def test_filter_partitions(self):
+        items = [{'problem_id': f"p{i}"} for i in range(200)]
+        shards = [list(shard_filter(items, k, 4)) for k in range(4)]
+        assert sorted(p['problem_id'] for s in shards for p in s) == sorted(p['problem_id'] for p in items)
+        assert all(shards)
+
+    @pytest.mark.parametrize('shard_index,num_shards', [(0, 0), (-1, 2), (2, 2)])
+    def test_invalid(self, shard_index, num_shards):
+        with pytest.raises(ValueError):
+            check_shard(shard_index, num_shards)
+
+
+class TestShardedLoads:
+    """Sharded loads split the same global sample."""
+
+    @pytest.mark.parametrize('strategy,kwargs', [
+        ('forecastbench_v1', {'max_quest': 40, 'seed': 5}),
+        ('forecastbench_v1_extensive', {'max_quest': 30}),
+        ('forecastbench_v1_source', {'source': 'manifold', 'max_quest': 15}),
+        ('forecastbench_v1_composed', {'max_quest': 25}),
+    ])
+    def test_v1_shards_cover_sample(self, v1_data_dir, strategy, kwargs):
+        loader = ProblemLoader()
+        full = loader.load(strategy, **kwargs)
+        shards = [loader.load(strategy, shard_index=k, num_shards=3, **kwargs) for k in range(3)]
+        assert sum(len(s) for s in shards) == len(full)
+        merged = {pid: p for s in shards for pid, p in s.items()}
+        assert set(merged) == set(full)
+        assert all(shard_of(pid, 3) == k for k, s in enumerate(shards) for pid in s)
+
+    def test_v1_shard_builds_only_its_rows(self, v1_data_dir, monkeypatch):
+        forecastbench_v1.build_snapshot()
+        forecastbench_v1.invalidate_cache()
+        built = []
+        getitem = forecastbench_v1._SnapshotRows.__getitem__
+        monkeypatch.setattr(forecastbench_v1._SnapshotRows, '__getitem__',
+                            lambda self, i: built.append(i) or getitem(self, i))
+        shard = ProblemLoader().load('forecastbench_v1', max_quest=40, seed=5, shard_index=1, num_shards=4)
+        assert shard and len(built) == len(shard)
+        assert all(shard_of(pid, 4) == 1 for pid in shard)
+
+    def test_unshardable_loader_filtered_after_load(self):
+        @ProblemLoader.register("_test_plain_loader", uses_raw_problems=False)
+        def plain(raw_problems):
+            return {f"x{i}": {'problem_id': f"x{i}"} for i in range(50)}
+
+        try:
+            loader = ProblemLoader()
+            shards = [loader.load("_test_plain_loader", shard_index=k, num_shards=2) for k in range(2)]
+            assert sorted(shards[0].keys() | shards[1].keys()) == sorted(f"x{i}" for i in range(50))
+            assert not shards[0].keys() & shards[1].keys()
+        finally:
+            ProblemLoader._registry.pop("_test_plain_loader")
+
+    def test_invalid_shard_raises_eagerly(self):
+        with pytest.raises(ValueError):
+            ProblemLoader().iter_load("load_all", shard_index=3, num_shards=3)
+
+    def test_random_shards_need_seed(self):
+        problems = [{'problem_id': f"p{i}", 'time_start': '2024-01-01'} for i in range(10)]
+        with pytest.raises(ValueError):
+            iter_random(problems, count=5, shard_index=0, num_shards=2)
+        shards = [list(iter_random(problems, count=5, seed=1, shard_index=k, num_shards=2)) for k in range(2)]
+        assert sum(len(s) for s in shards) == 5
@@ -0,0 +1,125 @@
+"""Tests for columnar snapshots and the ForecastBench_v1 snapshot load path."""
+
+import numpy as np
+import pytest
+
+from fortest.loader.loader import ProblemLoader
+from fortest.loader.snapshot import Snapshot, write_snapshot
+from fortest.loader.custom_loaders import forecastbench_v1
+from fortest.loader.custom_loaders.forecastbench_v1 import (
+    build_snapshot,
+    invalidate_cache,
+    _load_and_prepare_all,
+    _prepare_from_json,
+)
+
+
+def _strip_time_now(problems):
+    return [{k: v for k, v in p.items() if k != 'time_now'} for p in problems]
+
+
+class TestSnapshotFormat:
+    """Tests for the generic snapshot writer/reader."""
+
+    def test_round_trip(self, tmp_path):
+        path = write_snapshot(
+            tmp_path / 'snap',
+            arrays={'x': np.arange(3, dtype=np.int32)},
+            texts={'t': ['a', None, 'héllo']},
+            meta={'k': 'v'},
+        )
+        snap = Snapshot(path)
+        assert len(snap) == 3
+        assert snap.meta == {'k': 'v'}
+        assert isinstance(snap.array('x'), np.memmap)
+        assert snap.array('x').tolist() == [0, 1, 2]
+        assert list(snap.text('t')) == ['a', None, 'héllo']
+
+    def test_mismatched_lengths_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            write_snapshot(tmp_path / 'snap', arrays={'x': np.arange(3)}, texts={'t': ['a']})
+
+    def test_overwrite_replaces_whole_snapshot(self, tmp_path):
+        write_snapshot(tmp_path / 'snap', arrays={'x': np.arange(3)}, texts={'old': ['a', 'b', 'c']})
+        old = Snapshot(tmp_path / 'snap')
+        old_x = old.array('x')
+        write_snapshot(tmp_path / 'snap', arrays={'x': np.arange(2) + 10}, texts={})
+        snap = Snapshot(tmp_path / 'snap')
+        assert snap.array('x').tolist() == [10, 11]
+        assert not (tmp_path / 'snap' / 'old.blob.npy').exists()
+        assert [p.name for p in tmp_path.iterdir()] == ['snap']
+        # Mappings of the replaced snapshot stay readable
+        assert old_x.tolist() == [0, 1, 2]
+
+    def test_unknown_column_raises(self, tmp_path):
+        snap = Snapshot(write_snapshot(tmp_path / 'snap', arrays={'x': np.arange(2)}, texts={}))
+        with pytest.raises(KeyError):
+            snap.array('y')
+
+
+class TestForecastBenchV1Snapshot:
+    """Tests for loading ForecastBench_v1 from its snapshot."""
+
+    def test_snapshot_matches_json(self, v1_data_dir):
+        build_snapshot()
+        invalidate_cache()
+        from_snapshot = _load_and_prepare_all()
+        assert _strip_time_now(from_snapshot) == _strip_time_now(_prepare_from_json())
+
+    def test_snapshot_skips_json_parse(self, v1_data_dir, monkeypatch):
+        build_snapshot()
+        invalidate_cache()
+        monkeypatch.setattr(forecastbench_v1, '_load_raw_data',
+                            lambda: pytest.fail('JSON should not be parsed'))
+        assert len(_load_and_prepare_all()) > 0
+
+    def test_dataset_columns_read_from_snapshot(self, v1_data_dir, monkeypatch):
+        expected = forecastbench_v1._make_dataset(_prepare_from_json())
+        build_snapshot()
+        invalidate_cache()
+        for name in ('to_epoch_days', 'to_epoch_seconds'):
+            monkeypatch.setattr(forecastbench_v1, name, lambda values: pytest.fail('dates were re-parsed'))
+        dataset = forecastbench_v1._load_dataset()
+        assert dataset.sources == expected.sources
+        for column in ('source_code', 'horizon_code', 'start_day', 'end_day', 'freeze_day'):
+            assert getattr(dataset, column).dtype == getattr(expected, column).dtype
+            assert np.array_equal(getattr(dataset, column), getattr(expected, column))
+        for column in ('testing_index', 'end_index'):
+            assert np.array_equal(getattr(dataset, column).order, getattr(expected, column).order)
+            assert np.array_equal(getattr(dataset, column).keys, getattr(expected, column).keys)
+
+    def test_old_layout_ignored(self, v1_data_dir):
+        path = build_snapshot()
+        snapshot = Snapshot(path)
+        meta = {**snapshot.meta, 'layout': 1}
+        arrays = {name: np.array(snapshot.array(name)) for name in ('source_code', 'horizon_code')}
+        write_snapshot(path, arrays, {}, meta)
+        invalidate_cache()
+        assert forecastbench_v1._open_snapshot() is None
+        assert len(_load_and_prepare_all()) == len(_prepare_from_json())
+
+    def test_rows_built_on_demand(self, v1_data_dir, monkeypatch):
+        build_snapshot()
+        invalidate_cache()
+        built = []
+        getitem = forecastbench_v1._SnapshotRows.__getitem__
+        monkeypatch.setattr(forecastbench_v1._SnapshotRows, '__getitem__',
+                            lambda self, i: built.append(i) or getitem(self, i))
+        problems = ProblemLoader().load('forecastbench_v1', max_quest=3, seed=0)
+        assert len(problems) == 3 and len(built) == 3
+
+    def test_stale_snapshot_ignored(self, v1_data_dir):
+        build_snapshot()
+        x_path = v1_data_dir / 'X_single_resolved.json'
+        x_path.write_text(x_path.read_text().replace('Background', 'Context'))
+        invalidate_cache()
+        problems = _load_and_prepare_all()
+        assert problems[0]['metadata']['background'].startswith('Context')
+
+    def test_snapshot_used_without_json(self, v1_data_dir):
+        expected = _strip_time_now(_prepare_from_json())
+        build_snapshot()
+        (v1_data_dir / 'X_single_resolved.json').unlink()
+        (v1_data_dir / 'y_single_resolved.json').unlink()
+        invalidate_cache()
+        assert _strip_time_now(_load_and_prepare_all()) == expected
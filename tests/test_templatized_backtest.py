@@ -0,0 +1,168 @@
+"""Tests for the rolling-origin templatized backtest loader."""
+
+import json
+
+import pytest
+
+from fortest.environment.manager import EnvironmentManager
+from fortest.loader.loader import ProblemLoader
+from fortest.problems.ForecastBenchTemplatized.resolver import StoreBackedResolver, rolling_origins
+from fortest.problems.ForecastBenchTemplatized.store import write_series_store
+from fortest.loader.custom_loaders.templatized_backtest import iter_templatized_backtest
+
+
+class CountingStoreResolver(StoreBackedResolver):
+    """Counts series reads."""
+
+    def __init__(self, store):
+        super().__init__(store)
+        self.reads = []
+
+    def fetch_many(self, question_id, dates):
+        self.reads.append((question_id, len(dates)))
+        return super().fetch_many(question_id, dates)
+
+
+@pytest.fixture
+def templates_path(tmp_path):
+    path = tmp_path / 'templates.json'
+    path.write_text(json.dumps({'templates': [
+        {'id': 'UNRATE', 'source': 'fred', 'url': 'https://fred.example/UNRATE',
+         'question_template': 'Will UNRATE be higher on {resolution_date} than on {forecast_due_date}?',
+         'background': 'Data as of {forecast_due_date}.', 'resolution_criteria': 'Compare on {resolution_date}.'},
+        {'id': 'SPY', 'source': 'yfinance', 'question_template': 'SPY {forecast_due_date} -> {resolution_date}?'},
+        {'id': 'NODATA', 'source': 'fred', 'question_template': 'Nothing {resolution_date}?'},
+    ]}))
+    return str(path)
+
+
+@pytest.fixture
+def store(tmp_path):
+    days = [f'2025-{m:02d}-{d:02d}' for m in range(1, 7) for d in (1, 15)]
+    return str(write_series_store(tmp_path / 'store', {
+        'UNRATE': (days, [4.0 + (i % 3) * 0.1 for i in range(len(days))]),
+        'SPY': (days[:6], [500 + i for i in range(6)]),
+    }))
+
+
+class TestRollingOrigins:
+    """Tests for rolling_origins."""
+
+    def test_inclusive_steps(self):
+        assert rolling_origins('2025-01-01', '2025-01-15', 7) == ['2025-01-01', '2025-01-08', '2025-01-15']
+        assert rolling_origins('2025-01-01', '2025-01-14', 7) == ['2025-01-01', '2025-01-08']
+        assert rolling_origins('2025-02-01', '2025-01-01') == []
+
+    def test_step_positive(self):
+        with pytest.raises(ValueError):
+            rolling_origins('2025-01-01', '2025-02-01', 0)
+
+
+class TestTemplatizedBacktest:
+    """Problems per (template, origin, horizon) with shared fetches."""
+
+    def test_problem_schema(self, templates_path, store):
+        problems = ProblemLoader().load('templatized_backtest', start='2025-01-01', end='2025-02-01',
+                                        step_days=14, horizons=[14, 45], store=store,
+                                        templates_path=templates_path, time_now='2025-06-30T00:00:00')
+        problem = problems['fbt_fred_UNRATE_t0_2025-01-15_45d']
+        assert problem['question'] == 'Will UNRATE be higher on 2025-03-01 than on 2025-01-15?'
+        assert (problem['time_start'], problem['time_end'], problem['time_testing']) == \
+            ('2025-01-15', '2025-03-01', '2025-01-15')
+        assert problem['resolved_flag'] is True and problem['resolution_status'] in (0.0, 1.0)
+        assert problem['metadata'] == {
+            'source': 'fred', 'horizon': 'medium_term', 'horizon_days': 45, 'original_id': 'UNRATE',
+            'template_index': 0, 'origin': '2025-01-15', 'background': 'Data as of 2025-01-15.',
+            'resolution_criteria': 'Compare on 2025-03-01.', 'url': 'https://fred.example/UNRATE',
+            'resolution_value': problem['metadata']['resolution_value'],
+        }
+        assert problem['time_now'] == '2025-06-30T00:00:00'
+        # 3 origins x 2 horizons for UNRATE; SPY's series ends on 2025-03-15; NODATA never resolves
+        assert sum(p['metadata']['original_id'] == 'UNRATE' for p in problems.values()) == 6
+        assert {p['metadata']['original_id'] for p in problems.values()} == {'UNRATE', 'SPY'}
+
+    def test_one_series_read_per_template(self, templates_path, store):
+        resolver = CountingStoreResolver(store)
+        problems = list(iter_templatized_backtest(
+            None, start='2025-01-01', end='2025-03-01', step_days=7, horizons=[7, 14, 30],
+            resolver=resolver, templates_path=templates_path, include_unresolved=True, chunk_size=2))
+        assert len(problems) == 3 * 9 * 3
+        # Each template reads the distinct dates of its whole grid once
+        origins = rolling_origins('2025-01-01', '2025-03-01', 7)
+        assert [tid for tid, _ in resolver.reads] == ['UNRATE', 'SPY', 'NODATA']
+        assert resolver.reads[0][1] < len(origins) * 3 * 2
+        assert [p['problem_id'] for p in problems[:3]] == [
+            'fbt_fred_UNRATE_t0_2025-01-01_7d', 'fbt_fred_UNRATE_t0_2025-01-01_14d', 'fbt_fred_UNRATE_t0_2025-01-01_30d']
+
+    def test_duplicate_ids_keep_their_template(self, tmp_path, store):
+        path = tmp_path / 'dup_templates.json'
+        path.write_text(json.dumps({'templates': [
+            {'id': 'UNRATE', 'source': 'fred', 'url': f'https://fred.example/{k}',
+             'question_template': f'Variant {k}: UNRATE on {{resolution_date}}?',
+             'background': f'Variant {k} background.'} for k in range(3)]}))
+        problems = list(iter_templatized_backtest(
+            None, start='2025-01-01', end='2025-02-01', step_days=14, horizons=[14], store=store,
+            templates_path=str(path), include_unresolved=True, chunk_size=2))
+        assert len(problems) == 3 * 3
+        for p in problems:
+            variant = p['question'].split(':')[0][-1]
+            assert p['metadata']['url'] == f'https://fred.example/{variant}'
+            assert p['metadata']['background'] == f'Variant {variant} background.'
+            assert p['metadata']['template_index'] == int(variant)
+        loaded = ProblemLoader().load('templatized_backtest', start='2025-01-01', end='2025-02-01', step_days=14,
+                                      horizons=[14], store=store, templates_path=str(path), include_unresolved=True)
+        assert sorted(loaded) == sorted(p['problem_id'] for p in problems)
+
+    def test_lazy(self, templates_path, store):
+        resolver = CountingStoreResolver(store)
+        problems = iter_templatized_backtest(None, start='2025-01-01', end='2025-03-01', resolver=resolver,
+                                             templates_path=templates_path, chunk_size=1)
+        next(problems)
+        assert len(resolver.reads) == 1
+
+    def test_sources_and_workers(self, templates_path, store):
+        kwargs = dict(start='2025-01-01', end='2025-02-15', horizons=[7, 30], store=store,
+                      templates_path=templates_path, sources=['fred'], include_unresolved=True)
+        serial = list(iter_templatized_backtest(None, **kwargs))
+        pooled = list(iter_templatized_backtest(None, workers=2, chunk_size=1, **kwargs))
+        strip = lambda ps: [{k: v for k, v in p.items() if k != 'time_now'} for p in ps]
+        assert strip(serial) == strip(pooled)
+        assert {p['metadata']['source'] for p in serial} == {'fred'}
+
+    def test_no_labels_past_end_of_data(self, templates_path, store):
+        # UNRATE ends on 2025-06-15, SPY on 2025-03-15
+        kwargs = dict(start='2025-03-01', end='2025-06-15', step_days=14, horizons=[7, 365],
+                      store=store, templates_path=templates_path)
+        problems = list(iter_templatized_backtest(None, **kwargs))
+        assert problems and all(p['metadata']['horizon_days'] == 7 for p in problems)
+        assert all(p['time_end'] <= '2025-06-15' for p in problems)
+        assert {p['time_end'] for p in problems if p['metadata']['original_id'] == 'SPY'} == {'2025-03-08'}
+
+        unresolved = [p for p in iter_templatized_backtest(None, include_unresolved=True, **kwargs)
+                      if p['time_end'] > '2025-06-15']
+        assert unresolved and all(p['resolved_flag'] is False and p['resolution_status'] is None and
+                                  p['metadata']['resolution_value'] is None for p in unresolved)
+
+    def test_max_staleness(self, templates_path, store):
+        kwargs = dict(start='2025-01-01', end='2025-01-01', horizons=[7, 14], store=store,
+                      templates_path=templates_path, sources=['fred'])
+        assert len(list(iter_templatized_backtest(None, **kwargs))) == 2
+        # Semi-monthly observations: 2025-01-08 is 7 days stale, 2025-01-15 is fresh
+        fresh = list(iter_templatized_backtest(None, max_staleness_days=3, **kwargs))
+        assert [p['time_end'] for p in fresh] == ['2025-01-15']
+
+    def test_arguments_validated(self, templates_path, store):
+        with pytest.raises(ValueError):
+            iter_templatized_backtest(None, start='2025-01-01', end='2025-02-01', templates_path=templates_path)
+        with pytest.raises(ValueError):
+            iter_templatized_backtest(None, start='2025-01-01', end='2025-02-01', store=store, horizons=[0])
+        with pytest.raises(ValueError):
+            iter_templatized_backtest(None, start='2025-01-01', end='2025-02-01', store=store, horizons=[7, 30, 7])
+
+    def test_environment_manager(self, templates_path, store):
+        env = EnvironmentManager(loader_strategy='templatized_backtest', start='2025-01-01', end='2025-01-29',
+                                 horizons=[30], store=store, templates_path=templates_path)
+        assert 'templatized_backtest' in env.get_available_loader_strategies()
+        assert len(env.problems) == 5 + 5
+        pid = next(iter(env.problems))
+        assert 'resolution_status' not in env.get_problems()[pid]
@@ -0,0 +1,102 @@
+"""Tests for streaming, parallel generation of the templatized dataset."""
+
+import json
+
+import pytest
+
+from fortest.problems.ForecastBenchTemplatized.pipeline import (
+    ColumnarSink,
+    JsonlSink,
+    iter_dataset,
+    iter_dataset_chunks,
+    open_sink,
+    read_dataset,
+    write_dataset,
+)
+from fortest.problems.ForecastBenchTemplatized.resolver import (
+    StoreBackedResolver,
+    TemplateLoader,
+    date_grid,
+    generate_dataset,
+)
+from fortest.problems.ForecastBenchTemplatized.store import write_series_store
+
+N_TEMPLATES = 23
+GRID = date_grid(['2025-01-05', '2025-02-05'], horizons=[10, 40])
+
+
+@pytest.fixture
+def loader(tmp_path):
+    path = tmp_path / 'templates.json'
+    path.write_text(json.dumps({'templates': [
+        {'id': f's{i}', 'source': 'fred' if i % 3 else 'yfinance',
+         'question_template': f'Will s{i} rise from {{forecast_due_date}} to {{resolution_date}}?'}
+        for i in range(N_TEMPLATES)
+    ]}))
+    return TemplateLoader(str(path))
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    dates = [f'2025-{m:02d}-{d:02d}' for m in (1, 2, 3) for d in (1, 10, 20)]
+    series = {f's{i}': (dates, [(i * 7 + k * 5) % 11 for k in range(len(dates))]) for i in range(N_TEMPLATES - 1)}
+    return StoreBackedResolver(write_series_store(tmp_path / 'store', series))
+
+
+class TestIterDataset:
+    """Chunked generation matches generate_dataset for any worker count."""
+
+    def test_serial_matches_generate(self, loader, resolver):
+        expected = generate_dataset(loader, resolver, date_pairs=GRID)
+        assert list(iter_dataset(loader, resolver, date_pairs=GRID, chunk_size=5)) == expected
+        assert any(r.resolved_to is None for r in expected) and any(r.resolved_to == 1.0 for r in expected)
+
+    @pytest.mark.parametrize('workers,max_in_flight', [(2, None), (3, 1)])
+    def test_pool_is_ordered(self, loader, resolver, workers, max_in_flight):
+        expected = generate_dataset(loader, resolver, date_pairs=GRID, sources=['fred'])
+        results = iter_dataset(loader, resolver, date_pairs=GRID, sources=['fred'],
+                               workers=workers, chunk_size=4, max_in_flight=max_in_flight)
+        assert list(results) == expected
+
+    def test_chunk_sizes(self, loader, resolver):
+        chunks = list(iter_dataset_chunks(loader, resolver, forecast_due_date='2025-01-05',
+                                          resolution_date='2025-02-05', chunk_size=10))
+        assert [len(c) for c in chunks] == [10, 10, 3]
+
+    def test_arguments_validated(self, loader, resolver):
+        with pytest.raises(ValueError):
+            list(iter_dataset(loader, resolver))
+        with pytest.raises(ValueError):
+            list(iter_dataset(loader, resolver, date_pairs=GRID, chunk_size=0))
+
+
+class TestSinks:
+    """Round trips through the JSONL and columnar sinks."""
+
+    def test_jsonl_appends(self, tmp_path, loader, resolver):
+        path = tmp_path / 'out' / 'dataset.jsonl'
+        assert write_dataset(path, loader, resolver, date_pairs=GRID[:1], chunk_size=8) == N_TEMPLATES
+        with JsonlSink(path, append=True) as sink:
+            written = write_dataset(sink, loader, resolver, date_pairs=GRID[1:2], sources=['yfinance'])
+        expected = generate_dataset(loader, resolver, date_pairs=GRID[:1]) + \
+            generate_dataset(loader, resolver, date_pairs=GRID[1:2], sources=['yfinance'])
+        assert list(read_dataset(path)) == expected and written == 8
+
+    def test_columnar_parts(self, tmp_path, loader, resolver):
+        path = tmp_path / 'dataset'
+        write_dataset(path, loader, resolver, date_pairs=GRID, chunk_size=10, workers=2)
+        write_dataset(ColumnarSink(path, append=True), loader, resolver, date_pairs=GRID[:1], sources=['yfinance'])
+        assert sorted(p.name for p in path.iterdir()) == [f'part-0000{i}' for i in range(4)]
+        expected = generate_dataset(loader, resolver, date_pairs=GRID) + \
+            generate_dataset(loader, resolver, date_pairs=GRID[:1], sources=['yfinance'])
+        assert list(read_dataset(path)) == expected
+
+    @pytest.mark.parametrize('name', ['dataset.jsonl', 'dataset'])
+    def test_rewrite_replaces(self, tmp_path, loader, resolver, name):
+        path = tmp_path / name
+        write_dataset(path, loader, resolver, date_pairs=GRID, chunk_size=10)
+        write_dataset(path, loader, resolver, date_pairs=GRID[:1], chunk_size=10)
+        assert list(read_dataset(path)) == generate_dataset(loader, resolver, date_pairs=GRID[:1])
+        with open_sink(path) as sink:
+            pass
+        assert list(read_dataset(path)) == []
@@ -0,0 +1,225 @@
+"""Tests for batch resolution of templatized questions over date grids."""
+
+import json
+
+import pytest
+
+from fortest.problems.ForecastBenchTemplatized.resolver import (
+    BaseResolver,
+    DummyResolver,
+    ResolvedQuestion,
+    TemplatedQuestion,
+    TemplateLoader,
+    date_grid,
+    generate_dataset,
+    resolve_increase_grid,
+)
+
+
+SERIES = {
+    'fred_a': {'2025-01-01': 1.0, '2025-02-01': 2.0, '2025-03-01': 0.5},
+    'yf_b': {'2025-01-01': 10.0, '2025-02-01': 10.0, '2025-03-01': 'N/A'},
+}
+
+
+@pytest.fixture
+def loader(tmp_path):
+    path = tmp_path / 'templates.json'
+    path.write_text(json.dumps({'templates': [
+        {'id': 'fred_a', 'source': 'fred',
+         'question_template': 'Will A increase by {resolution_date} from {forecast_due_date}?'},
+        {'id': 'yf_b', 'source': 'yfinance',
+         'question_template': 'Will B increase by {resolution_date} from {forecast_due_date}?'},
+    ]}))
+    return TemplateLoader(str(path))
+
+
+class PerDateResolver(BaseResolver):
+    """Resolves one pair at a time, counting fetches."""
+
+    def __init__(self):
+        self.fetches = 0
+
+    def fetch_value(self, question_id, date):
+        self.fetches += 1
+        return SERIES[question_id].get(date)
+
+    def resolve(self, template, forecast_due_date, resolution_date):
+        values = {d: self.fetch_value(template.id, d) for d in (forecast_due_date, resolution_date)}
+        return resolve_increase_grid(template, [(forecast_due_date, resolution_date)], values)[0]
+
+
+class SeriesResolver(PerDateResolver):
+    """Fetches each series once per grid."""
+
+    def __init__(self):
+        super().__init__()
+        self.series_reads = 0
+
+    def resolve_many(self, templates, date_pairs):
+        dates = sorted({d for pair in date_pairs for d in pair})
+        results = []
+        for template in templates:
+            self.series_reads += 1
+            values = dict(zip(dates, [SERIES[template.id].get(d) for d in dates]))
+            results.extend(resolve_increase_grid(template, date_pairs, values))
+        return results
+
+
+GRID = [('2025-01-01', '2025-02-01'), ('2025-01-01', '2025-03-01'), ('2025-02-01', '2025-03-01')]
+
+
+class TestDateGrid:
+    """Tests for date_grid."""
+
+    def test_resolution_dates_after_due(self):
+        grid = date_grid(['2025-01-01', '2025-02-01'], resolution_dates=['2025-02-01', '2025-03-01'])
+        assert grid == GRID
+
+    def test_horizons(self):
+        assert date_grid(['2025-01-30'], horizons=[0, 2, 30]) == [('2025-01-30', '2025-02-01'),
+                                                                   ('2025-01-30', '2025-03-01')]
+
+    def test_exactly_one_of(self):
+        with pytest.raises(ValueError):
+            date_grid(['2025-01-01'])
+        with pytest.raises(ValueError):
+            date_grid(['2025-01-01'], resolution_dates=['2025-02-01'], horizons=[7])
+
+
+class TestResolveMany:
+    """The default resolve_many and an array-based override agree."""
+
+    def test_default_falls_back_to_resolve(self, loader):
+        resolver = PerDateResolver()
+        results = resolver.resolve_many(loader.templates, GRID)
+        assert [(r.id, r.forecast_due_date, r.resolution_date) for r in results] == \
+            [(t.id, d, r) for t in loader.templates for d, r in GRID]
+        assert [r.resolved_to for r in results] == [1.0, 0.0, 0.0, 0.0, None, None]
+        assert resolver.fetches == 12
+
+    def test_override_matches_default(self, loader):
+        resolver = SeriesResolver()
+        assert resolver.resolve_many(loader.templates, GRID) == PerDateResolver().resolve_many(loader.templates, GRID)
+        assert resolver.series_reads == 2 and resolver.fetches == 0
+
+    def test_fetch_many_dedupes_dates(self):
+        resolver = PerDateResolver()
+        assert resolver.fetch_many('fred_a', ['2025-01-01', '2025-02-01', '2025-01-01']) == [1.0, 2.0, 1.0]
+        assert resolver.fetches == 2
+
+    def test_rendered_question(self, loader):
+        result = resolve_increase_grid(loader.templates[0], GRID[:1], SERIES['fred_a'])[0]
+        assert isinstance(result, ResolvedQuestion)
+        assert result.question == 'Will A increase by 2025-02-01 from 2025-01-01?'
+        assert result.resolution_value == 2.0
+
+
+class TestGenerateDataset:
+    """generate_dataset in single-pair and grid mode."""
+
+    def test_single_pair(self, loader):
+        results = generate_dataset(loader, DummyResolver(), '2025-01-01', '2025-02-01', sources=['fred'])
+        assert [(r.id, r.resolution_date, r.resolved_to) for r in results] == [('fred_a', '2025-02-01', None)]
+
+    def test_grid_mode_uses_resolve_many(self, loader):
+        resolver = SeriesResolver()
+        results = generate_dataset(loader, resolver, date_pairs=GRID)
+        assert len(results) == 6 and resolver.series_reads == 2
+        assert [r.resolved_to for r in results[:3]] == [1.0, 0.0, 0.0]
+
+    def test_dates_required(self, loader):
+        with pytest.raises(ValueError):
+            generate_dataset(loader, DummyResolver())
+        with pytest.raises(ValueError):
+            generate_dataset(loader, DummyResolver(), '2025-01-01', '2025-02-01', date_pairs=GRID)
+
+
+class TestTemplateLoader:
+    """Indexed lookups and lazily read text fields."""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = tmp_path / 'templates.json'
+        path.write_text(json.dumps({'version': 1, 'templates': [
+            {'id': 'fred_a', 'source': 'fred', 'question_template': 'A {resolution_date}?',
+             'background': 'Température « moyenne » ' * 20, 'resolution_criteria': 'Resolves on FRED.'},
+            {'id': 'yf_b', 'source': 'yfinance', 'question_template': 'B?', 'source_intro': 'Yahoo'},
+            {'id': 'fred_c', 'source': 'fred', 'question_template': 'C?', 'background': '日本 GDP'},
+            {'id': 'fred_a', 'source': 'fred', 'question_template': 'duplicate'},
+        ], 'notes': ['trailing key']}, ensure_ascii=False, indent=1), encoding='utf-8')
+        return path
+
+    def test_indexes(self, path):
+        loader = TemplateLoader(str(path))
+        assert [t.id for t in loader.templates] == ['fred_a', 'yf_b', 'fred_c', 'fred_a']
+        assert loader.get_by_id('fred_a').question_template == 'A {resolution_date}?'
+        assert loader.get_by_id('missing') is None
+        assert [t.id for t in loader.get_by_source('fred')] == ['fred_a', 'fred_c', 'fred_a']
+        assert loader.get_by_source('acled') == []
+        assert loader.sources == ['fred', 'yfinance']
+
+    def test_lazy_text_matches_eager(self, path):
+        lazy, eager = TemplateLoader(str(path)), TemplateLoader(str(path), lazy_text=False)
+        assert lazy.templates == eager.templates
+        assert lazy.get_by_id('fred_a').background.startswith('Température « moyenne »')
+        assert lazy.get_by_id('fred_c').background == '日本 GDP'
+        assert lazy.get_by_id('yf_b').resolution_criteria == ''
+        assert all(isinstance(t._background, str) for t in eager.templates)
+
+    def test_lazy_fields_not_held(self, path):
+        template = TemplateLoader(str(path)).get_by_id('fred_a')
+        assert not isinstance(template._background, str)
+        assert not hasattr(template, '__dict__')
+        template.background = 'overridden'
+        assert template.background == 'overridden'
+
+    def test_lazy_fields_decoded_once(self, path):
+        template = TemplateLoader(str(path)).get_by_id('fred_a')
+        assert template.background.startswith('Température')
+        path.unlink()
+        # Every lazy field came from the one decode
+        assert template.resolution_criteria == 'Resolves on FRED.' and template.source_intro == ''
+
+    def test_changed_file_rejected(self, path):
+        template = TemplateLoader(str(path)).get_by_id('fred_c')
+        path.write_text(json.dumps({'templates': []}))
+        with pytest.raises(ValueError, match='changed'):
+            template.background
+
+
+def _replace(text, due, res):
+    return text.replace('{forecast_due_date}', due).replace('{resolution_date}', res)
+
+
+class TestRender:
+    """Compiled rendering is byte-identical to chained str.replace."""
+
+    TEXTS = [
+        'Will X be higher on {resolution_date} than on {forecast_due_date}?',
+        '{forecast_due_date}{forecast_due_date} {resolution_date}',
+        'Literal {braces} {0} {{resolution_date}} %s {resolution_date',
+        'No placeholders at all — «ünïcode»',
+        '',
+    ]
+    PAIRS = [('2025-01-01', '2025-02-01'), ('2024-12-31', '{forecast_due_date}'),
+             ('{resolution', '_date}'), ('{resolution_date}', 'x'), ('{0}', '{1}')]
+
+    @pytest.mark.parametrize('text', TEXTS)
+    def test_matches_replace(self, text):
+        template = TemplatedQuestion('t', 'fred', text, text + ' criteria', 'bg ' + text, '', '')
+        assert template.render_many(self.PAIRS) == [_replace(text, d, r) for d, r in self.PAIRS]
+        assert [template.render(d, r) for d, r in self.PAIRS] == [_replace(text, d, r) for d, r in self.PAIRS]
+        assert template.render_many(self.PAIRS, field='resolution_criteria') == \
+            [_replace(text + ' criteria', d, r) for d, r in self.PAIRS]
+        assert template.render(*self.PAIRS[0], field='background') == _replace('bg ' + text, *self.PAIRS[0])
+
+    def test_recompiles_after_change(self):
+        template = TemplatedQuestion('t', 'fred', 'A {resolution_date}', '', '', '', '')
+        assert template.render('d', 'r') == 'A r'
+        template.question_template = 'B {forecast_due_date}'
+        assert template.render('d', 'r') == 'B d'
+
+    def test_unknown_field(self):
+        with pytest.raises(ValueError):
+            TemplatedQuestion('t', 'fred', '', '', '', '', '').render_many([('a', 'b')], field='url')
@@ -0,0 +1,155 @@
+"""Tests for the inverted keyword index and the load_by_keywords strategy."""
+
+import json
+
+import pytest
+
+from fortest.loader.loader import ProblemLoader
+from fortest.loader.textindex import KeywordIndex, tokenize
+from fortest.loader import textindex
+from fortest.loader.custom_loaders import forecastbench
+from fortest.loader.custom_loaders.forecastbench_v1 import _load_and_prepare_all
+from fortest.problems.ForecastBenchTemplatized.store import write_series_store
+
+
+TEXTS = {
+    'question': ['Will the Fed cut rates?', 'Will the S&P 500 close higher?', 'Will Ukraine and Russia agree?',
+                 None, 'Will inflation exceed 3%?'],
+    'background': ['Federal funds rate.', None, 'Talks in 2024.', 'Nasdaq and S&P 500 futures.', 'Fed targets 2%.'],
+}
+
+
+@pytest.fixture
+def index():
+    return KeywordIndex.build(TEXTS)
+
+
+class TestKeywordIndex:
+    """Tests for KeywordIndex."""
+
+    def test_tokenize(self):
+        assert tokenize("The S&P 500, U.S. and Russia's") == ['the', 's&p', '500', 'u.s', 'and', "russia's"]
+        assert tokenize(None) == []
+
+    def test_postings_across_fields(self, index):
+        assert index.postings('fed').tolist() == [0, 4]
+        assert index.postings('500').tolist() == [1, 3]
+        assert index.postings('absent').tolist() == []
+
+    def test_boolean_queries(self, index):
+        assert index.query('fed AND rates').tolist() == [0]
+        assert index.query('fed rates').tolist() == [0]
+        assert index.query('"S&P 500" OR ukraine').tolist() == [1, 2, 3]
+        assert index.query('will AND (fed OR nasdaq)').tolist() == [0, 4]
+        assert index.query(['ukraine', 'Inflation']).tolist() == [2, 4]
+
+    @pytest.mark.parametrize('bad', ['', 'fed AND', '(fed', 'fed)', 'OR fed', '"&&"'])
+    def test_bad_queries(self, index, bad):
+        with pytest.raises(ValueError):
+            index.query(bad)
+
+    def test_wide_gaps_round_trip(self):
+        rows = [0, 3, 300, 70000, 70001]
+        texts = ['needle' if i in rows else 'hay' for i in range(70002)]
+        index = KeywordIndex.build({'question': texts})
+        assert index.postings('needle').tolist() == rows
+
+    def test_save_and_load(self, index, tmp_path):
+        path = index.save(tmp_path / 'x.keywords.npz', [['x.json', 1, 2]])
+        loaded = KeywordIndex.load(path, [['x.json', 1, 2]])
+        assert loaded.terms == index.terms
+        assert loaded.query('"S&P 500" OR fed').tolist() == [0, 1, 3, 4]
+        assert KeywordIndex.load(path, [['x.json', 1, 3]]) is None
+        assert KeywordIndex.load(tmp_path / 'missing.npz') is None
+
+
+class TestLoadByKeywords:
+    """load_by_keywords agrees with a regex-style scan and composes with filters."""
+
+    @staticmethod
+    def _scan(predicate):
+        def text(p):
+            m = p['metadata']
+            return ' '.join(t for t in (p['question'], m['background'], m['resolution_criteria']) if t)
+        return [p['problem_id'] for p in _load_and_prepare_all() if predicate(tokenize(text(p)))]
+
+    def test_v1_query_matches_scan(self, v1_data_dir):
+        result = ProblemLoader().load('load_by_keywords', query='fred OR (manifold AND q0011)')
+        expected = self._scan(lambda t: 'fred' in t or ('manifold' in t and 'q0011' in t))
+        assert result and list(result) == expected
+
+    def test_v1_filters_and_sampling(self, v1_data_dir):
+        loader = ProblemLoader()
+        result = loader.load('load_by_keywords', query='rise', sources=['acled'], horizons=['short_term'])
+        assert result
+        assert all(p['metadata']['source'] == 'acled' and p['metadata']['horizon'] == 'short_term'
+                   for p in result.values())
+        sample = loader.load('load_by_keywords', query='rise', max_quest=5, seed=1)
+        assert len(sample) == 5
+        shards = [loader.load('load_by_keywords', query='rise', max_quest=5, seed=1, shard_index=i, num_shards=2)
+                  for i in range(2)]
+        assert sorted(k for s in shards for k in s) == sorted(sample)
+
+    def test_index_persisted_and_reused(self, v1_data_dir, monkeypatch):
+        loader = ProblemLoader()
+        first = loader.load('load_by_keywords', query='yfinance')
+        assert list(v1_data_dir.glob('*.keywords.npz'))
+        textindex.invalidate_cache()
+        monkeypatch.setattr(KeywordIndex, 'build', classmethod(lambda cls, columns: pytest.fail("index rebuilt")))
+        assert list(loader.load('load_by_keywords', query='yfinance')) == list(first)
+
+    def test_legacy_dataset(self, fb_repo):
+        result = ProblemLoader().load('load_by_keywords', query='"question 3"', dataset='forecastbench')
+        assert len(result) == 6
+        assert all(p['question'] == 'Question 3?' for p in result.values())
+
+    def test_legacy_snapshot_builds_matches_only(self, fb_repo, monkeypatch):
+        loader = ProblemLoader()
+        strip = lambda ps: {k: {f: v for f, v in p.items() if f != 'time_now'} for k, p in ps.items()}
+        from_json = loader.load('load_by_keywords', query='"question 3"', dataset='forecastbench')
+        forecastbench.build_forecastbench_snapshot(str(fb_repo))
+        monkeypatch.setattr(forecastbench, '_iter_raw', lambda *a, **k: pytest.fail("JSON parsed"))
+        from_snapshot = loader.load('load_by_keywords', query='"question 3"', dataset='forecastbench')
+        assert strip(from_snapshot) == strip(from_json)
+        shards = [loader.load('load_by_keywords', query='"question 3"', dataset='forecastbench',
+                              shard_index=k, num_shards=2) for k in range(2)]
+        assert sorted(k for s in shards for k in s) == sorted(from_json)
+
+    def test_templatized_catalogue(self, tmp_path):
+        templates = tmp_path / 'templates.json'
+        templates.write_text(json.dumps({'templates': [
+            {'id': 'UNRATE', 'source': 'fred', 'question_template': 'Will unemployment rise by {resolution_date}?',
+             'background': 'Civilian unemployment rate.'},
+            {'id': 'SPY', 'source': 'yfinance', 'question_template': 'Will SPY close higher on {resolution_date}?',
+             'resolution_criteria': 'Uses the S&P 500 ETF close.'},
+            {'id': 'UNRATE', 'source': 'fred', 'question_template': 'Unemployment variant {resolution_date}?'},
+        ]}))
+        days = [f'2025-{m:02d}-{d:02d}' for m in range(1, 7) for d in (1, 15)]
+        store = str(write_series_store(tmp_path / 'store', {
+            'UNRATE': (days, [4.0 + (i % 3) * 0.1 for i in range(len(days))]),
+            'SPY': (days, [500 + i for i in range(len(days))]),
+        }))
+        kwargs = dict(dataset='templatized', templates_path=str(templates), start='2025-01-01', end='2025-02-01',
+                      step_days=14, store=store, horizon_days=[7, 30])
+        loader = ProblemLoader()
+        result = loader.load('load_by_keywords', query='unemployment', **kwargs)
+        assert {p['metadata']['template_index'] for p in result.values()} == {0, 2}
+        assert len(result) == 2 * 3 * 2
+        medium = loader.load('load_by_keywords', query='"S&P 500"', horizons=['medium_term'], **kwargs)
+        assert medium and all(p['metadata']['original_id'] == 'SPY' and p['metadata']['horizon_days'] == 30
+                            for p in medium.values())
+        assert list(tmp_path.glob('templates.keywords.npz'))
+
+    def test_problems_db(self, tmp_path):
+        db = tmp_path / 'problems.json'
+        db.write_text(json.dumps([
+            {'problem_id': 'A', 'question': 'Fed hike?', 'metadata': {'source': 'x'}, 'time_start': '2024-01-01'},
+            {'problem_id': 'B', 'question': 'Mars landing?', 'metadata': {'source': 'y'}, 'time_start': '2024-01-01'},
+        ]))
+        loader = ProblemLoader(str(db))
+        assert list(loader.load('load_by_keywords', query='fed OR mars', dataset='problems')) == ['A', 'B']
+        assert list(loader.load('load_by_keywords', query='fed OR mars', dataset='problems', sources=['y'])) == ['B']
+
+    def test_unknown_dataset(self, v1_data_dir):
+        with pytest.raises(ValueError):
+            ProblemLoader().load('load_by_keywords', query='fed', dataset='nope')
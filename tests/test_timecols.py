@@ -0,0 +1,93 @@
+"""Tests for bulk ISO time parsing and vectorized horizon bucketing."""
+
+import json
+
+import numpy as np
+import pytest
+
+from fortest.loader.timecols import NAT, bucketize, to_epoch_days, to_epoch_seconds
+from fortest.loader.custom_loaders.forecastbench_v1 import (
+    HorizonGroup,
+    _HORIZON_EDGES,
+    _compute_horizon,
+    _load_dataset,
+    _prepare_from_json,
+    _select_rows,
+)
+
+
+class TestParsing:
+    """Tests for to_epoch_seconds / to_epoch_days."""
+
+    def test_offsets_applied(self):
+        secs = to_epoch_seconds([
+            '2024-07-21', '2024-07-21T00:00:00+00:00', '2024-07-21T02:00:00+02:00',
+            '2024-07-20T19:00:00-05:00', '2024-07-21T00:00:00Z',
+        ])
+        assert len(set(secs.tolist())) == 1
+        assert secs[0] == 1721520000
+
+    def test_missing_and_invalid_are_nat(self):
+        assert to_epoch_seconds([None, '', 'N/A', 'not a date']).tolist() == [NAT] * 4
+        assert to_epoch_days(['1970-01-02T23:00:00-05:00', None, 'bad']).tolist() == [1, NAT, NAT]
+
+    @pytest.mark.parametrize('value', [
+        '2024', '2024-01', '20240101', '2024-01-01 12:00:00', '2024-1-01', '2024-01-01x', '2024-02-30', '２０２４-01-01',
+    ])
+    def test_malformed_dates_are_nat(self, value):
+        assert to_epoch_days([value]).tolist() == [NAT]
+        assert _compute_horizon({'start_date': value}, {'resolution_date': '2025-01-01'}) is None
+
+    def test_date_and_datetime_prefixes_parse(self):
+        values = ['2024-01-01', '2024-01-01T12:00:00', '2024-01-01T23:59:59+05:00']
+        assert to_epoch_days(values).tolist() == [19723] * 3
+
+    def test_malformed_offset_is_nat(self):
+        values = ['2024-07-21T00:00:00+ab:cd', '2024-07-21T00:00:00-0x:00', '2024-07-21T00:00:00+00:00']
+        assert to_epoch_seconds(values).tolist() == [NAT, NAT, 1721520000]
+
+
+class TestHorizonBuckets:
+    """Vectorized horizon groups must match HorizonGroup.from_days."""
+
+    def test_bucketize_matches_from_days(self):
+        days = np.arange(1, 800)
+        groups = list(HorizonGroup)
+        codes = bucketize(days, _HORIZON_EDGES)
+        assert [groups[c] for c in codes] == [HorizonGroup.from_days(int(d)) for d in days]
+
+    def test_bulk_prepare_matches_scalar_horizon(self, v1_data_dir):
+        for p in _prepare_from_json():
+            days = _compute_horizon({'start_date': p['time_start']}, {'resolution_date': p['time_end']})
+            assert p['metadata']['horizon_days'] == days
+            assert p['metadata']['horizon'] == HorizonGroup.from_days(days).label
+
+    def test_bulk_prepare_skips_malformed_dates(self, v1_data_dir):
+        x_path = v1_data_dir / 'X_single_resolved.json'
+        with open(x_path) as f:
+            questions = json.load(f)['questions']
+        bad = ['2024', '2024-07', '20240721', '2024-07-21 00:00:00']
+        for q, value in zip(questions, bad):
+            q['forecast_due_date'] = value
+        with open(x_path, 'w') as f:
+            json.dump({'questions': questions}, f)
+        ids = {p['metadata']['original_id'] for p in _prepare_from_json()}
+        assert len(ids) == len(questions) - len(bad)
+        assert not ids & {q['id'] for q in questions[:len(bad)]}
+
+
+class TestTimeColumns:
+    """Tests for the dataset's integer day columns and window filters."""
+
+    def test_columns_match_strings(self, v1_data_dir):
+        dataset = _load_dataset()
+        for i, p in enumerate(dataset.problems):
+            assert dataset.end_day[i] - dataset.start_day[i] == p['metadata']['horizon_days']
+            assert dataset.freeze_day[i] == to_epoch_days([p['time_testing']])[0]
+
+    def test_freeze_window_matches_string_scan(self, v1_data_dir):
+        problems = _load_dataset().problems
+        rows = _select_rows(freeze_start='2024-07-22', freeze_end='2024-09-01')
+        expected = [i for i, p in enumerate(problems) if '2024-07-22' <= p['time_testing'][:10] < '2024-09-01']
+        assert rows.tolist() == expected
+        assert len(_select_rows(freeze_end='2024-07-22')) == len(problems) - len(expected)